@@ -17,6 +17,8 @@ import grpc
 from xtquant import xtdata
 from pb import xtquant_pb2_grpc
 from server import MarketDataServicer, TradingServicer
+from server.compression import COMPRESSION_ALGORITHMS
+from server.stream_buffer import OVERFLOW_POLICIES
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,8 +47,11 @@ def wait_for_xtdata(timeout: int = 300, interval: int = 3):
     raise RuntimeError(f"xtdata failed to connect within {timeout}s — is MiniQMT running?")
 
 
-def serve(port: int, mini_qmt_path: str, session_id: int):
-    """Create and start the gRPC server."""
+def serve(port: int, mini_qmt_path: str, session_id: int, **market_options):
+    """Create and start the gRPC server.
+
+    `market_options` are passed through to MarketDataServicer.
+    """
     # Ensure xtdata is ready before accepting any gRPC requests
     wait_for_xtdata()
 
@@ -60,8 +65,9 @@ def serve(port: int, mini_qmt_path: str, session_id: int):
     )
 
     # Register market data service (always available)
-    xtquant_pb2_grpc.add_MarketDataServiceServicer_to_server(MarketDataServicer(), server)
-    logger.info("Market data service registered")
+    market = MarketDataServicer(**market_options)
+    xtquant_pb2_grpc.add_MarketDataServiceServicer_to_server(market, server)
+    logger.info("Market data service registered (%s)", market_options)
 
     # Register trading service (requires MiniQMT path)
     if mini_qmt_path:
@@ -76,6 +82,7 @@ def serve(port: int, mini_qmt_path: str, session_id: int):
     server.start()
     logger.info("gRPC server started, listening on port %d", port)
     server.wait_for_termination()
+    market.close()
 
 
 def main():
@@ -85,9 +92,42 @@ def main():
                         help="MiniQMT userdata_mini path; market-data only if omitted")
     parser.add_argument("--session-id", type=int, default=0,
                         help="Trading session ID (default: current timestamp)")
+    parser.add_argument("--kline-cache-mb", type=int, default=0,
+                        help="Memory budget of the server-side kline cache in MB (default: 0, disabled)")
+    parser.add_argument("--fetch-workers", type=int, default=0,
+                        help="Threads for parallel kline fetch of large requests (default: 0, serial)")
+    parser.add_argument("--fetch-shard-size", type=int, default=200,
+                        help="Instruments per parallel kline fetch shard (default: 200)")
+    parser.add_argument("--compression", choices=sorted(COMPRESSION_ALGORITHMS), default="none",
+                        help="Compression for large market-data responses (default: none)")
+    parser.add_argument("--compression-min-kb", type=int, default=64,
+                        help="Only compress responses of at least this many KB (default: 64)")
+    parser.add_argument("--mirror-dir", type=str, default="",
+                        help="Directory of the memory-mapped kline mirror updated by downloads (default: disabled)")
+    parser.add_argument("--no-coalesce", action="store_true",
+                        help="Disable sharing of identical concurrent market-data requests")
+    parser.add_argument("--tick-table-markets", type=str, default="",
+                        help="Comma-separated markets kept in a live tick table for GetFullTick, e.g. SH,SZ "
+                             "(default: disabled)")
+    parser.add_argument("--stream-buffer", type=int, default=10_000,
+                        help="Pending updates held per quote stream for a slow client, 0 = unbounded (default: 10000)")
+    parser.add_argument("--stream-overflow", choices=OVERFLOW_POLICIES, default="conflate",
+                        help="What a full quote stream buffer does (default: conflate)")
     args = parser.parse_args()
 
-    serve(args.port, args.mini_qmt_path, args.session_id)
+    serve(
+        args.port, args.mini_qmt_path, args.session_id,
+        kline_cache_bytes=args.kline_cache_mb * 1024 * 1024,
+        fetch_workers=args.fetch_workers,
+        shard_size=args.fetch_shard_size,
+        compression=args.compression,
+        compression_min_bytes=args.compression_min_kb * 1024,
+        mirror_dir=args.mirror_dir,
+        coalesce=not args.no_coalesce,
+        tick_table_markets=[m.strip() for m in args.tick_table_markets.split(",") if m.strip()],
+        stream_buffer=args.stream_buffer,
+        stream_overflow=args.stream_overflow,
+    )
 
 
 if __name__ == "__main__":
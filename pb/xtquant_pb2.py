@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rxtquant.proto\x12\x07xtquant\"\x07\n\x05\x45mpty\"\xde\x01\n\x08KlineBar\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04time\x18\x02 \x01(\x03\x12\x0c\n\x04open\x18\x03 \x01(\x01\x12\x0c\n\x04high\x18\x04 \x01(\x01\x12\x0b\n\x03low\x18\x05 \x01(\x01\x12\r\n\x05\x63lose\x18\x06 \x01(\x01\x12\x0e\n\x06volume\x18\x07 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x08 \x01(\x01\x12\x11\n\tpre_close\x18\t \x01(\x01\x12\x14\n\x0csuspend_flag\x18\n \x01(\x05\x12\x18\n\x10settlement_price\x18\x0b \x01(\x01\x12\x15\n\ropen_interest\x18\x0c \x01(\x01\"\xef\x01\n\x0cTickSnapshot\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04time\x18\x02 \x01(\x03\x12\x12\n\nlast_price\x18\x03 \x01(\x01\x12\x0c\n\x04open\x18\x04 \x01(\x01\x12\x0c\n\x04high\x18\x05 \x01(\x01\x12\x0b\n\x03low\x18\x06 \x01(\x01\x12\x12\n\nlast_close\x18\x07 \x01(\x01\x12\x0e\n\x06volume\x18\x08 \x01(\x01\x12\x0e\n\x06\x61mount\x18\t \x01(\x01\x12\x11\n\tbid_price\x18\n \x03(\x01\x12\x12\n\nbid_volume\x18\x0b \x03(\x01\x12\x11\n\task_price\x18\x0c \x03(\x01\x12\x12\n\nask_volume\x18\r \x03(\x01\"\xae\x02\n\x10InstrumentDetail\x12\x13\n\x0b\x65xchange_id\x18\x01 \x01(\t\x12\x15\n\rinstrument_id\x18\x02 \x01(\t\x12\x17\n\x0finstrument_name\x18\x03 \x01(\t\x12\x12\n\nproduct_id\x18\x04 \x01(\t\x12\x15\n\rup_stop_price\x18\x05 \x01(\x01\x12\x17\n\x0f\x64own_stop_price\x18\x06 \x01(\x01\x12\x11\n\tpre_close\x18\x07 \x01(\x01\x12\x11\n\topen_date\x18\x08 \x01(\t\x12\x12\n\nprice_tick\x18\t \x01(\x01\x12\x17\n\x0fvolume_multiple\x18\n \x01(\x05\x12\x14\n\x0ctotal_volume\x18\x0b \x01(\x03\x12\x14\n\x0c\x66loat_volume\x18\x0c \x01(\x03\x12\x12\n\nextra_json\x18\r \x01(\t\"\x9a\x01\n\x14GetMarketDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\r\n\x05\x63ount\x18\x05 \x01(\x05\x12\x15\n\rdividend_type\x18\x06 \x01(\t\x12\x11\n\tfill_data\x18\x07 \x01(\x08\"\xeb\x01\n\x15GetMarketDataResponse\x12\x12\n\nstock_code\x18\x01 \x03(\t\x12\x0c\n\x04time\x18\x02 \x03(\x03\x12\x0c\n\x04open\x18\x03 \x03(\x01\x12\x0c\n\x04high\x18\x04 \x03(\x01\x12\x0b\n\x03low\x18\x05 \x03(\x01\x12\r\n\x05\x63lose\x18\x06 \x03(\x01\x12\x0e\n\x06volume\x18\x07 \x03(\x01\x12\x0e\n\x06\x61mount\x18\x08 \x03(\x01\x12\x11\n\tpre_close\x18\t \x03(\x01\x12\x14\n\x0csuspend_flag\x18\n \x03(\x05\x12\x18\n\x10settlement_price\x18\x0b \x03(\x01\x12\x15\n\ropen_interest\x18\x0c \x03(\x01\")\n\x12GetFullTickRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\"\x92\x01\n\x13GetFullTickResponse\x12\x36\n\x05ticks\x18\x01 \x03(\x0b\x32\'.xtquant.GetFullTickResponse.TicksEntry\x1a\x43\n\nTicksEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12$\n\x05value\x18\x02 \x01(\x0b\x32\x15.xtquant.TickSnapshot:\x02\x38\x01\"E\n\x1aGetInstrumentDetailRequest\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x13\n\x0bis_complete\x18\x02 \x01(\x08\"*\n\x13GetStockListRequest\x12\x13\n\x0bsector_name\x18\x01 \x01(\t\"(\n\x11StockListResponse\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\"(\n\x15GetSectorListResponse\x12\x0f\n\x07sectors\x18\x01 \x03(\t\"~\n\x1a\x44ownloadHistoryDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\x15\n\rincrementally\x18\x05 \x01(\x08\"X\n\x10\x44ownloadProgress\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x10\n\x08\x66inished\x18\x02 \x01(\x05\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"]\n\x16GetTradingDatesRequest\x12\x0e\n\x06market\x18\x01 \x01(\t\x12\x12\n\nstart_time\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\"(\n\x17GetTradingDatesResponse\x12\r\n\x05\x64\x61tes\x18\x01 \x03(\x03\"}\n\x17GetFinancialDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x12\n\ntable_list\x18\x02 \x03(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\x13\n\x0breport_type\x18\x05 \x01(\t\"-\n\x18GetFinancialDataResponse\x12\x11\n\tdata_json\x18\x01 \x01(\t\"m\n\x1c\x44ownloadFinancialDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x12\n\ntable_list\x18\x02 \x03(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\"1\n\x1aGetValuationMetricsRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\"\xc4\x01\n\x0eStockValuation\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06pe_ttm\x18\x02 \x01(\x01\x12\n\n\x02pb\x18\x03 \x01(\x01\x12\x15\n\rturnover_rate\x18\x04 \x01(\x01\x12\x0b\n\x03\x65ps\x18\x05 \x01(\x01\x12\x14\n\x0ctotal_shares\x18\x06 \x01(\x03\x12\x14\n\x0c\x66loat_shares\x18\x07 \x01(\x03\x12\x18\n\x10total_market_cap\x18\x08 \x01(\x01\x12\x18\n\x10\x66loat_market_cap\x18\t \x01(\x01\"J\n\x1bGetValuationMetricsResponse\x12+\n\nvaluations\x18\x01 \x03(\x0b\x32\x17.xtquant.StockValuation\"J\n\x15SubscribeQuoteRequest\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"R\n\x0bQuoteUpdate\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x1f\n\x04\x62\x61rs\x18\x03 \x03(\x0b\x32\x11.xtquant.KlineBar\"/\n\x1aSubscribeWholeQuoteRequest\x12\x11\n\tcode_list\x18\x01 \x03(\t\":\n\x0e\x41\x63\x63ountRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\"m\n\tAssetInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x0c\n\x04\x63\x61sh\x18\x02 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x03 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x04 \x01(\x01\x12\x13\n\x0btotal_asset\x18\x05 \x01(\x01\"\xab\x02\n\tOrderInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\x03\x12\x13\n\x0border_sysid\x18\x04 \x01(\t\x12\x12\n\norder_time\x18\x05 \x01(\x03\x12\x12\n\norder_type\x18\x06 \x01(\x05\x12\x14\n\x0corder_volume\x18\x07 \x01(\x05\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x15\n\rtraded_volume\x18\t \x01(\x05\x12\x14\n\x0ctraded_price\x18\n \x01(\x01\x12\x14\n\x0corder_status\x18\x0b \x01(\x05\x12\x12\n\nstatus_msg\x18\x0c \x01(\t\x12\x15\n\rstrategy_name\x18\r \x01(\t\x12\x14\n\x0corder_remark\x18\x0e \x01(\t\"\xf3\x01\n\tTradeInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x11\n\ttraded_id\x18\x03 \x01(\t\x12\x13\n\x0btraded_time\x18\x04 \x01(\x03\x12\x14\n\x0ctraded_price\x18\x05 \x01(\x01\x12\x15\n\rtraded_volume\x18\x06 \x01(\x05\x12\x15\n\rtraded_amount\x18\x07 \x01(\x01\x12\x10\n\x08order_id\x18\x08 \x01(\x03\x12\x13\n\x0border_sysid\x18\t \x01(\t\x12\x15\n\rstrategy_name\x18\n \x01(\t\x12\x14\n\x0corder_remark\x18\x0b \x01(\t\"\xb2\x01\n\x0cPositionInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x05\x12\x16\n\x0e\x63\x61n_use_volume\x18\x04 \x01(\x05\x12\x12\n\nopen_price\x18\x05 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x06 \x01(\x01\x12\x15\n\rfrozen_volume\x18\x07 \x01(\x05\x12\x11\n\tavg_price\x18\x08 \x01(\x01\"\xc5\x01\n\x11OrderStockRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x12\n\norder_type\x18\x04 \x01(\x05\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x12\n\nprice_type\x18\x06 \x01(\x05\x12\r\n\x05price\x18\x07 \x01(\x01\x12\x15\n\rstrategy_name\x18\x08 \x01(\t\x12\x14\n\x0corder_remark\x18\t \x01(\t\"H\n\x12OrderStockResponse\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\"P\n\x12\x43\x61ncelOrderRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\x03\"7\n\x13\x43\x61ncelOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"W\n\x12QueryOrdersRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x17\n\x0f\x63\x61ncelable_only\x18\x03 \x01(\x08\"9\n\x13QueryOrdersResponse\x12\"\n\x06orders\x18\x01 \x03(\x0b\x32\x12.xtquant.OrderInfo\"9\n\x13QueryTradesResponse\x12\"\n\x06trades\x18\x01 \x03(\x0b\x32\x12.xtquant.TradeInfo\"B\n\x16QueryPositionsResponse\x12(\n\tpositions\x18\x01 \x03(\x0b\x32\x15.xtquant.PositionInfo\"\xe9\x01\n\x0cTradingEvent\x12*\n\x0corder_update\x18\x01 \x01(\x0b\x32\x12.xtquant.OrderInfoH\x00\x12*\n\x0ctrade_update\x18\x02 \x01(\x0b\x32\x12.xtquant.TradeInfoH\x00\x12.\n\x0border_error\x18\x03 \x01(\x0b\x32\x17.xtquant.OrderErrorInfoH\x00\x12\x30\n\x0c\x63\x61ncel_error\x18\x04 \x01(\x0b\x32\x18.xtquant.CancelErrorInfoH\x00\x12\x16\n\x0c\x64isconnected\x18\x05 \x01(\tH\x00\x42\x07\n\x05\x65vent\"G\n\x0eOrderErrorInfo\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x10\n\x08\x65rror_id\x18\x02 \x01(\x05\x12\x11\n\terror_msg\x18\x03 \x01(\t\"H\n\x0f\x43\x61ncelErrorInfo\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x10\n\x08\x65rror_id\x18\x02 \x01(\x05\x12\x11\n\terror_msg\x18\x03 \x01(\t2\xf5\x07\n\x11MarketDataService\x12N\n\rGetMarketData\x12\x1d.xtquant.GetMarketDataRequest\x1a\x1e.xtquant.GetMarketDataResponse\x12H\n\x0bGetFullTick\x12\x1b.xtquant.GetFullTickRequest\x1a\x1c.xtquant.GetFullTickResponse\x12U\n\x13GetInstrumentDetail\x12#.xtquant.GetInstrumentDetailRequest\x1a\x19.xtquant.InstrumentDetail\x12H\n\x0cGetStockList\x12\x1c.xtquant.GetStockListRequest\x1a\x1a.xtquant.StockListResponse\x12?\n\rGetSectorList\x12\x0e.xtquant.Empty\x1a\x1e.xtquant.GetSectorListResponse\x12W\n\x13\x44ownloadHistoryData\x12#.xtquant.DownloadHistoryDataRequest\x1a\x19.xtquant.DownloadProgress0\x01\x12T\n\x0fGetTradingDates\x12\x1f.xtquant.GetTradingDatesRequest\x1a .xtquant.GetTradingDatesResponse\x12W\n\x10GetFinancialData\x12 .xtquant.GetFinancialDataRequest\x1a!.xtquant.GetFinancialDataResponse\x12[\n\x15\x44ownloadFinancialData\x12%.xtquant.DownloadFinancialDataRequest\x1a\x19.xtquant.DownloadProgress0\x01\x12`\n\x13GetValuationMetrics\x12#.xtquant.GetValuationMetricsRequest\x1a$.xtquant.GetValuationMetricsResponse\x12H\n\x0eSubscribeQuote\x12\x1e.xtquant.SubscribeQuoteRequest\x1a\x14.xtquant.QuoteUpdate0\x01\x12S\n\x13SubscribeWholeQuote\x12#.xtquant.SubscribeWholeQuoteRequest\x1a\x15.xtquant.TickSnapshot0\x01\x32\xfe\x03\n\x0eTradingService\x12\x45\n\nOrderStock\x12\x1a.xtquant.OrderStockRequest\x1a\x1b.xtquant.OrderStockResponse\x12H\n\x0b\x43\x61ncelOrder\x12\x1b.xtquant.CancelOrderRequest\x1a\x1c.xtquant.CancelOrderResponse\x12\x39\n\nQueryAsset\x12\x17.xtquant.AccountRequest\x1a\x12.xtquant.AssetInfo\x12H\n\x0bQueryOrders\x12\x1b.xtquant.QueryOrdersRequest\x1a\x1c.xtquant.QueryOrdersResponse\x12\x44\n\x0bQueryTrades\x12\x17.xtquant.AccountRequest\x1a\x1c.xtquant.QueryTradesResponse\x12J\n\x0eQueryPositions\x12\x17.xtquant.AccountRequest\x1a\x1f.xtquant.QueryPositionsResponse\x12\x44\n\x10SubscribeTrading\x12\x17.xtquant.AccountRequest\x1a\x15.xtquant.TradingEvent0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rxtquant.proto\x12\x07xtquant\"\x07\n\x05\x45mpty\"\xde\x01\n\x08KlineBar\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04time\x18\x02 \x01(\x03\x12\x0c\n\x04open\x18\x03 \x01(\x01\x12\x0c\n\x04high\x18\x04 \x01(\x01\x12\x0b\n\x03low\x18\x05 \x01(\x01\x12\r\n\x05\x63lose\x18\x06 \x01(\x01\x12\x0e\n\x06volume\x18\x07 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x08 \x01(\x01\x12\x11\n\tpre_close\x18\t \x01(\x01\x12\x14\n\x0csuspend_flag\x18\n \x01(\x05\x12\x18\n\x10settlement_price\x18\x0b \x01(\x01\x12\x15\n\ropen_interest\x18\x0c \x01(\x01\"\xb0\x02\n\x0cTickSnapshot\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04time\x18\x02 \x01(\x03\x12\x12\n\nlast_price\x18\x03 \x01(\x01\x12\x0c\n\x04open\x18\x04 \x01(\x01\x12\x0c\n\x04high\x18\x05 \x01(\x01\x12\x0b\n\x03low\x18\x06 \x01(\x01\x12\x12\n\nlast_close\x18\x07 \x01(\x01\x12\x0e\n\x06volume\x18\x08 \x01(\x01\x12\x0e\n\x06\x61mount\x18\t \x01(\x01\x12\x11\n\tbid_price\x18\n \x03(\x01\x12\x12\n\nbid_volume\x18\x0b \x03(\x01\x12\x11\n\task_price\x18\x0c \x03(\x01\x12\x12\n\nask_volume\x18\r \x03(\x01\x12\x13\n\x0breceived_at\x18\x0e \x01(\x03\x12*\n\x0cstream_stats\x18\x0f \x01(\x0b\x32\x14.xtquant.StreamStats\"1\n\x0bStreamStats\x12\x11\n\tconflated\x18\x01 \x01(\x03\x12\x0f\n\x07\x64ropped\x18\x02 \x01(\x03\"\xae\x02\n\x10InstrumentDetail\x12\x13\n\x0b\x65xchange_id\x18\x01 \x01(\t\x12\x15\n\rinstrument_id\x18\x02 \x01(\t\x12\x17\n\x0finstrument_name\x18\x03 \x01(\t\x12\x12\n\nproduct_id\x18\x04 \x01(\t\x12\x15\n\rup_stop_price\x18\x05 \x01(\x01\x12\x17\n\x0f\x64own_stop_price\x18\x06 \x01(\x01\x12\x11\n\tpre_close\x18\x07 \x01(\x01\x12\x11\n\topen_date\x18\x08 \x01(\t\x12\x12\n\nprice_tick\x18\t \x01(\x01\x12\x17\n\x0fvolume_multiple\x18\n \x01(\x05\x12\x14\n\x0ctotal_volume\x18\x0b \x01(\x03\x12\x14\n\x0c\x66loat_volume\x18\x0c \x01(\x03\x12\x12\n\nextra_json\x18\r \x01(\t\"\xff\x01\n\x14GetMarketDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\r\n\x05\x63ount\x18\x05 \x01(\x05\x12\x15\n\rdividend_type\x18\x06 \x01(\t\x12\x11\n\tfill_data\x18\x07 \x01(\x08\x12\x12\n\nchunk_rows\x18\x08 \x01(\x05\x12\x14\n\x0c\x63hunk_stocks\x18\t \x01(\x05\x12\x10\n\x08\x65ncoding\x18\n \x01(\t\x12\x17\n\x0f\x64ict_stock_code\x18\x0b \x01(\x08\x12\x0e\n\x06\x66ields\x18\x0c \x03(\t\"\xcf\x01\n\rPackedColumns\x12\x0c\n\x04time\x18\x01 \x01(\x0c\x12\x0c\n\x04open\x18\x02 \x01(\x0c\x12\x0c\n\x04high\x18\x03 \x01(\x0c\x12\x0b\n\x03low\x18\x04 \x01(\x0c\x12\r\n\x05\x63lose\x18\x05 \x01(\x0c\x12\x0e\n\x06volume\x18\x06 \x01(\x0c\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x0c\x12\x11\n\tpre_close\x18\x08 \x01(\x0c\x12\x14\n\x0csuspend_flag\x18\t \x01(\x0c\x12\x18\n\x10settlement_price\x18\n \x01(\x0c\x12\x15\n\ropen_interest\x18\x0b \x01(\x0c\"\xbe\x02\n\rCompactKlines\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04rows\x18\x02 \x01(\x05\x12\x12\n\nprice_tick\x18\x03 \x01(\x01\x12\x12\n\nprice_base\x18\x04 \x01(\x03\x12\x0c\n\x04time\x18\x05 \x03(\x12\x12\x0c\n\x04open\x18\x06 \x03(\x12\x12\x0c\n\x04high\x18\x07 \x03(\x12\x12\x0b\n\x03low\x18\x08 \x03(\x12\x12\r\n\x05\x63lose\x18\t \x03(\x12\x12\x11\n\tpre_close\x18\n \x03(\x12\x12\x18\n\x10settlement_price\x18\x0b \x03(\x12\x12\x0e\n\x06volume\x18\x0c \x03(\x12\x12\x0e\n\x06\x61mount\x18\r \x03(\x01\x12\x14\n\x0csuspend_flag\x18\x0e \x03(\x05\x12\x15\n\ropen_interest\x18\x0f \x03(\x12\x12#\n\x03raw\x18\x10 \x01(\x0b\x32\x16.xtquant.PackedColumns\"\xf6\x02\n\x15GetMarketDataResponse\x12\x12\n\nstock_code\x18\x01 \x03(\t\x12\x0c\n\x04time\x18\x02 \x03(\x03\x12\x0c\n\x04open\x18\x03 \x03(\x01\x12\x0c\n\x04high\x18\x04 \x03(\x01\x12\x0b\n\x03low\x18\x05 \x03(\x01\x12\r\n\x05\x63lose\x18\x06 \x03(\x01\x12\x0e\n\x06volume\x18\x07 \x03(\x01\x12\x0e\n\x06\x61mount\x18\x08 \x03(\x01\x12\x11\n\tpre_close\x18\t \x03(\x01\x12\x14\n\x0csuspend_flag\x18\n \x03(\x05\x12\x18\n\x10settlement_price\x18\x0b \x03(\x01\x12\x15\n\ropen_interest\x18\x0c \x03(\x01\x12&\n\x06packed\x18\r \x01(\x0b\x32\x16.xtquant.PackedColumns\x12\x12\n\ncode_table\x18\x0e \x03(\t\x12\x11\n\tcode_rows\x18\x0f \x03(\x05\x12\x11\n\tarrow_ipc\x18\x10 \x01(\x0c\x12\'\n\x07\x63ompact\x18\x11 \x03(\x0b\x32\x16.xtquant.CompactKlines\"P\n\tKlineSpec\x12\x0e\n\x06period\x18\x01 \x01(\t\x12\x12\n\nstart_time\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\"k\n\x19GetMarketDataBatchRequest\x12+\n\x04\x62\x61se\x18\x01 \x01(\x0b\x32\x1d.xtquant.GetMarketDataRequest\x12!\n\x05specs\x18\x02 \x03(\x0b\x32\x12.xtquant.KlineSpec\"^\n\x0cKlineSection\x12 \n\x04spec\x18\x01 \x01(\x0b\x32\x12.xtquant.KlineSpec\x12,\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x1e.xtquant.GetMarketDataResponse\"E\n\x1aGetMarketDataBatchResponse\x12\'\n\x08sections\x18\x01 \x03(\x0b\x32\x15.xtquant.KlineSection\"\xb3\x01\n\x16GetCrossSectionRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x13\n\x0bsector_name\x18\x02 \x01(\t\x12\r\n\x05\x61s_of\x18\x03 \x01(\t\x12\x0e\n\x06period\x18\x04 \x01(\t\x12\x15\n\rdividend_type\x18\x05 \x01(\t\x12\x0e\n\x06\x66ields\x18\x06 \x03(\t\x12\x10\n\x08\x65ncoding\x18\x07 \x01(\t\x12\x17\n\x0f\x64ict_stock_code\x18\x08 \x01(\x08\"-\n\rIndicatorSpec\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x03(\x01\"\xb6\x01\n\x18\x43omputeIndicatorsRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\t\x12\x15\n\rdividend_type\x18\x04 \x01(\t\x12*\n\nindicators\x18\x05 \x03(\x0b\x32\x16.xtquant.IndicatorSpec\x12\x0e\n\x06last_n\x18\x06 \x01(\x05\x12\x10\n\x08lookback\x18\x07 \x01(\x05\"/\n\x0fIndicatorSeries\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06values\x18\x02 \x03(\x01\"]\n\x0fStockIndicators\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0c\n\x04time\x18\x02 \x03(\x03\x12(\n\x06series\x18\x03 \x03(\x0b\x32\x18.xtquant.IndicatorSeries\"E\n\x19\x43omputeIndicatorsResponse\x12(\n\x06stocks\x18\x01 \x03(\x0b\x32\x18.xtquant.StockIndicators\"\x8e\x01\n\x18StreamTickHistoryRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x12\n\nstart_time\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\x12\x12\n\nchunk_rows\x18\x05 \x01(\x05\x12\x14\n\x0c\x63hunk_stocks\x18\x06 \x01(\x05\"\xd1\x01\n\tTickChunk\x12\x12\n\ncode_table\x18\x01 \x03(\t\x12\x11\n\tcode_rows\x18\x02 \x03(\x05\x12\r\n\x05\x64\x65pth\x18\x03 \x01(\x05\x12\x0c\n\x04time\x18\x04 \x01(\x0c\x12\x12\n\nlast_price\x18\x05 \x01(\x0c\x12\x0e\n\x06volume\x18\x06 \x01(\x0c\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x0c\x12\x11\n\tbid_price\x18\x08 \x01(\x0c\x12\x12\n\nbid_volume\x18\t \x01(\x0c\x12\x11\n\task_price\x18\n \x01(\x0c\x12\x12\n\nask_volume\x18\x0b \x01(\x0c\"\x9a\x02\n\x13TickSnapshotColumns\x12\x12\n\nstock_code\x18\x01 \x03(\t\x12\r\n\x05\x64\x65pth\x18\x02 \x01(\x05\x12\x0c\n\x04time\x18\x03 \x01(\x0c\x12\x12\n\nlast_price\x18\x04 \x01(\x0c\x12\x0c\n\x04open\x18\x05 \x01(\x0c\x12\x0c\n\x04high\x18\x06 \x01(\x0c\x12\x0b\n\x03low\x18\x07 \x01(\x0c\x12\x12\n\nlast_close\x18\x08 \x01(\x0c\x12\x0e\n\x06volume\x18\t \x01(\x0c\x12\x0e\n\x06\x61mount\x18\n \x01(\x0c\x12\x11\n\tbid_price\x18\x0b \x01(\x0c\x12\x12\n\nbid_volume\x18\x0c \x01(\x0c\x12\x11\n\task_price\x18\r \x01(\x0c\x12\x12\n\nask_volume\x18\x0e \x01(\x0c\x12\x13\n\x0breceived_at\x18\x0f \x01(\x0c\"R\n\x12GetFullTickRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x10\n\x08\x65ncoding\x18\x02 \x01(\t\x12\x15\n\rsince_version\x18\x03 \x01(\x03\"\xe5\x01\n\x13GetFullTickResponse\x12\x36\n\x05ticks\x18\x01 \x03(\x0b\x32\'.xtquant.GetFullTickResponse.TicksEntry\x12-\n\x07\x63olumns\x18\x02 \x01(\x0b\x32\x1c.xtquant.TickSnapshotColumns\x12\x0f\n\x07version\x18\x03 \x01(\x03\x12\x11\n\tunchanged\x18\x04 \x01(\x08\x1a\x43\n\nTicksEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12$\n\x05value\x18\x02 \x01(\x0b\x32\x15.xtquant.TickSnapshot:\x02\x38\x01\"E\n\x1aGetInstrumentDetailRequest\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x13\n\x0bis_complete\x18\x02 \x01(\x08\"*\n\x13GetStockListRequest\x12\x13\n\x0bsector_name\x18\x01 \x01(\t\"(\n\x11StockListResponse\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\"(\n\x15GetSectorListResponse\x12\x0f\n\x07sectors\x18\x01 \x03(\t\"~\n\x1a\x44ownloadHistoryDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\x15\n\rincrementally\x18\x05 \x01(\x08\"X\n\x10\x44ownloadProgress\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x10\n\x08\x66inished\x18\x02 \x01(\x05\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"]\n\x16GetTradingDatesRequest\x12\x0e\n\x06market\x18\x01 \x01(\t\x12\x12\n\nstart_time\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\"(\n\x17GetTradingDatesResponse\x12\r\n\x05\x64\x61tes\x18\x01 \x03(\x03\"\x8d\x01\n\x17GetFinancialDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x12\n\ntable_list\x18\x02 \x03(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\x12\x13\n\x0breport_type\x18\x05 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x06 \x01(\t\"\xab\x01\n\x18GetFinancialDataResponse\x12\x11\n\tdata_json\x18\x01 \x01(\t\x12H\n\x0c\x61rrow_tables\x18\x02 \x03(\x0b\x32\x32.xtquant.GetFinancialDataResponse.ArrowTablesEntry\x1a\x32\n\x10\x41rrowTablesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\"m\n\x1c\x44ownloadFinancialDataRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\x12\x12\n\ntable_list\x18\x02 \x03(\t\x12\x12\n\nstart_time\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_time\x18\x04 \x01(\t\"1\n\x1aGetValuationMetricsRequest\x12\x13\n\x0bstock_codes\x18\x01 \x03(\t\"\xc4\x01\n\x0eStockValuation\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06pe_ttm\x18\x02 \x01(\x01\x12\n\n\x02pb\x18\x03 \x01(\x01\x12\x15\n\rturnover_rate\x18\x04 \x01(\x01\x12\x0b\n\x03\x65ps\x18\x05 \x01(\x01\x12\x14\n\x0ctotal_shares\x18\x06 \x01(\x03\x12\x14\n\x0c\x66loat_shares\x18\x07 \x01(\x03\x12\x18\n\x10total_market_cap\x18\x08 \x01(\x01\x12\x18\n\x10\x66loat_market_cap\x18\t \x01(\x01\"J\n\x1bGetValuationMetricsResponse\x12+\n\nvaluations\x18\x01 \x03(\x0b\x32\x17.xtquant.StockValuation\"r\n\rServerMetrics\x12\x32\n\x06values\x18\x01 \x03(\x0b\x32\".xtquant.ServerMetrics.ValuesEntry\x1a-\n\x0bValuesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"J\n\x15SubscribeQuoteRequest\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"~\n\x0bQuoteUpdate\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x0e\n\x06period\x18\x02 \x01(\t\x12\x1f\n\x04\x62\x61rs\x18\x03 \x03(\x0b\x32\x11.xtquant.KlineBar\x12*\n\x0cstream_stats\x18\x04 \x01(\x0b\x32\x14.xtquant.StreamStats\"/\n\x1aSubscribeWholeQuoteRequest\x12\x11\n\tcode_list\x18\x01 \x03(\t\"q\n\x1fSubscribeWholeQuoteBatchRequest\x12\x11\n\tcode_list\x18\x01 \x03(\t\x12\x10\n\x08\x65ncoding\x18\x02 \x01(\t\x12\x11\n\tmax_batch\x18\x03 \x01(\x05\x12\x16\n\x0emax_latency_ms\x18\x04 \x01(\x05\"\x8c\x01\n\tTickBatch\x12$\n\x05ticks\x18\x01 \x03(\x0b\x32\x15.xtquant.TickSnapshot\x12-\n\x07\x63olumns\x18\x02 \x01(\x0b\x32\x1c.xtquant.TickSnapshotColumns\x12*\n\x0cstream_stats\x18\x03 \x01(\x0b\x32\x14.xtquant.StreamStats\":\n\x0e\x41\x63\x63ountRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\"m\n\tAssetInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x0c\n\x04\x63\x61sh\x18\x02 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x03 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x04 \x01(\x01\x12\x13\n\x0btotal_asset\x18\x05 \x01(\x01\"\xab\x02\n\tOrderInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\x03\x12\x13\n\x0border_sysid\x18\x04 \x01(\t\x12\x12\n\norder_time\x18\x05 \x01(\x03\x12\x12\n\norder_type\x18\x06 \x01(\x05\x12\x14\n\x0corder_volume\x18\x07 \x01(\x05\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x15\n\rtraded_volume\x18\t \x01(\x05\x12\x14\n\x0ctraded_price\x18\n \x01(\x01\x12\x14\n\x0corder_status\x18\x0b \x01(\x05\x12\x12\n\nstatus_msg\x18\x0c \x01(\t\x12\x15\n\rstrategy_name\x18\r \x01(\t\x12\x14\n\x0corder_remark\x18\x0e \x01(\t\"\xf3\x01\n\tTradeInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x11\n\ttraded_id\x18\x03 \x01(\t\x12\x13\n\x0btraded_time\x18\x04 \x01(\x03\x12\x14\n\x0ctraded_price\x18\x05 \x01(\x01\x12\x15\n\rtraded_volume\x18\x06 \x01(\x05\x12\x15\n\rtraded_amount\x18\x07 \x01(\x01\x12\x10\n\x08order_id\x18\x08 \x01(\x03\x12\x13\n\x0border_sysid\x18\t \x01(\t\x12\x15\n\rstrategy_name\x18\n \x01(\t\x12\x14\n\x0corder_remark\x18\x0b \x01(\t\"\xb2\x01\n\x0cPositionInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x05\x12\x16\n\x0e\x63\x61n_use_volume\x18\x04 \x01(\x05\x12\x12\n\nopen_price\x18\x05 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x06 \x01(\x01\x12\x15\n\rfrozen_volume\x18\x07 \x01(\x05\x12\x11\n\tavg_price\x18\x08 \x01(\x01\"\xc5\x01\n\x11OrderStockRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x12\n\norder_type\x18\x04 \x01(\x05\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x12\n\nprice_type\x18\x06 \x01(\x05\x12\r\n\x05price\x18\x07 \x01(\x01\x12\x15\n\rstrategy_name\x18\x08 \x01(\t\x12\x14\n\x0corder_remark\x18\t \x01(\t\"H\n\x12OrderStockResponse\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\"P\n\x12\x43\x61ncelOrderRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\x03\"7\n\x13\x43\x61ncelOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"W\n\x12QueryOrdersRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x14\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\t\x12\x17\n\x0f\x63\x61ncelable_only\x18\x03 \x01(\x08\"9\n\x13QueryOrdersResponse\x12\"\n\x06orders\x18\x01 \x03(\x0b\x32\x12.xtquant.OrderInfo\"9\n\x13QueryTradesResponse\x12\"\n\x06trades\x18\x01 \x03(\x0b\x32\x12.xtquant.TradeInfo\"B\n\x16QueryPositionsResponse\x12(\n\tpositions\x18\x01 \x03(\x0b\x32\x15.xtquant.PositionInfo\"\xe9\x01\n\x0cTradingEvent\x12*\n\x0corder_update\x18\x01 \x01(\x0b\x32\x12.xtquant.OrderInfoH\x00\x12*\n\x0ctrade_update\x18\x02 \x01(\x0b\x32\x12.xtquant.TradeInfoH\x00\x12.\n\x0border_error\x18\x03 \x01(\x0b\x32\x17.xtquant.OrderErrorInfoH\x00\x12\x30\n\x0c\x63\x61ncel_error\x18\x04 \x01(\x0b\x32\x18.xtquant.CancelErrorInfoH\x00\x12\x16\n\x0c\x64isconnected\x18\x05 \x01(\tH\x00\x42\x07\n\x05\x65vent\"G\n\x0eOrderErrorInfo\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x10\n\x08\x65rror_id\x18\x02 \x01(\x05\x12\x11\n\terror_msg\x18\x03 \x01(\t\"H\n\x0f\x43\x61ncelErrorInfo\x12\x10\n\x08order_id\x18\x01 \x01(\x03\x12\x10\n\x08\x65rror_id\x18\x02 \x01(\x05\x12\x11\n\terror_msg\x18\x03 \x01(\t2\xbf\x0c\n\x11MarketDataService\x12N\n\rGetMarketData\x12\x1d.xtquant.GetMarketDataRequest\x1a\x1e.xtquant.GetMarketDataResponse\x12S\n\x10StreamMarketData\x12\x1d.xtquant.GetMarketDataRequest\x1a\x1e.xtquant.GetMarketDataResponse0\x01\x12]\n\x12GetMarketDataBatch\x12\".xtquant.GetMarketDataBatchRequest\x1a#.xtquant.GetMarketDataBatchResponse\x12R\n\x0fGetCrossSection\x12\x1f.xtquant.GetCrossSectionRequest\x1a\x1e.xtquant.GetMarketDataResponse\x12Z\n\x11\x43omputeIndicators\x12!.xtquant.ComputeIndicatorsRequest\x1a\".xtquant.ComputeIndicatorsResponse\x12L\n\x11StreamTickHistory\x12!.xtquant.StreamTickHistoryRequest\x1a\x12.xtquant.TickChunk0\x01\x12H\n\x0bGetFullTick\x12\x1b.xtquant.GetFullTickRequest\x1a\x1c.xtquant.GetFullTickResponse\x12U\n\x13GetInstrumentDetail\x12#.xtquant.GetInstrumentDetailRequest\x1a\x19.xtquant.InstrumentDetail\x12H\n\x0cGetStockList\x12\x1c.xtquant.GetStockListRequest\x1a\x1a.xtquant.StockListResponse\x12?\n\rGetSectorList\x12\x0e.xtquant.Empty\x1a\x1e.xtquant.GetSectorListResponse\x12W\n\x13\x44ownloadHistoryData\x12#.xtquant.DownloadHistoryDataRequest\x1a\x19.xtquant.DownloadProgress0\x01\x12T\n\x0fGetTradingDates\x12\x1f.xtquant.GetTradingDatesRequest\x1a .xtquant.GetTradingDatesResponse\x12W\n\x10GetFinancialData\x12 .xtquant.GetFinancialDataRequest\x1a!.xtquant.GetFinancialDataResponse\x12[\n\x15\x44ownloadFinancialData\x12%.xtquant.DownloadFinancialDataRequest\x1a\x19.xtquant.DownloadProgress0\x01\x12`\n\x13GetValuationMetrics\x12#.xtquant.GetValuationMetricsRequest\x1a$.xtquant.GetValuationMetricsResponse\x12:\n\x10GetServerMetrics\x12\x0e.xtquant.Empty\x1a\x16.xtquant.ServerMetrics\x12H\n\x0eSubscribeQuote\x12\x1e.xtquant.SubscribeQuoteRequest\x1a\x14.xtquant.QuoteUpdate0\x01\x12S\n\x13SubscribeWholeQuote\x12#.xtquant.SubscribeWholeQuoteRequest\x1a\x15.xtquant.TickSnapshot0\x01\x12Z\n\x18SubscribeWholeQuoteBatch\x12(.xtquant.SubscribeWholeQuoteBatchRequest\x1a\x12.xtquant.TickBatch0\x01\x32\xfe\x03\n\x0eTradingService\x12\x45\n\nOrderStock\x12\x1a.xtquant.OrderStockRequest\x1a\x1b.xtquant.OrderStockResponse\x12H\n\x0b\x43\x61ncelOrder\x12\x1b.xtquant.CancelOrderRequest\x1a\x1c.xtquant.CancelOrderResponse\x12\x39\n\nQueryAsset\x12\x17.xtquant.AccountRequest\x1a\x12.xtquant.AssetInfo\x12H\n\x0bQueryOrders\x12\x1b.xtquant.QueryOrdersRequest\x1a\x1c.xtquant.QueryOrdersResponse\x12\x44\n\x0bQueryTrades\x12\x17.xtquant.AccountRequest\x1a\x1c.xtquant.QueryTradesResponse\x12J\n\x0eQueryPositions\x12\x17.xtquant.AccountRequest\x1a\x1f.xtquant.QueryPositionsResponse\x12\x44\n\x10SubscribeTrading\x12\x17.xtquant.AccountRequest\x1a\x15.xtquant.TradingEvent0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,92 +33,138 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._loaded_options = None
   _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._serialized_options = b'8\001'
+  _globals['_GETFINANCIALDATARESPONSE_ARROWTABLESENTRY']._loaded_options = None
+  _globals['_GETFINANCIALDATARESPONSE_ARROWTABLESENTRY']._serialized_options = b'8\001'
+  _globals['_SERVERMETRICS_VALUESENTRY']._loaded_options = None
+  _globals['_SERVERMETRICS_VALUESENTRY']._serialized_options = b'8\001'
   _globals['_EMPTY']._serialized_start=26
   _globals['_EMPTY']._serialized_end=33
   _globals['_KLINEBAR']._serialized_start=36
   _globals['_KLINEBAR']._serialized_end=258
   _globals['_TICKSNAPSHOT']._serialized_start=261
-  _globals['_TICKSNAPSHOT']._serialized_end=500
-  _globals['_INSTRUMENTDETAIL']._serialized_start=503
-  _globals['_INSTRUMENTDETAIL']._serialized_end=805
-  _globals['_GETMARKETDATAREQUEST']._serialized_start=808
-  _globals['_GETMARKETDATAREQUEST']._serialized_end=962
-  _globals['_GETMARKETDATARESPONSE']._serialized_start=965
-  _globals['_GETMARKETDATARESPONSE']._serialized_end=1200
-  _globals['_GETFULLTICKREQUEST']._serialized_start=1202
-  _globals['_GETFULLTICKREQUEST']._serialized_end=1243
-  _globals['_GETFULLTICKRESPONSE']._serialized_start=1246
-  _globals['_GETFULLTICKRESPONSE']._serialized_end=1392
-  _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._serialized_start=1325
-  _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._serialized_end=1392
-  _globals['_GETINSTRUMENTDETAILREQUEST']._serialized_start=1394
-  _globals['_GETINSTRUMENTDETAILREQUEST']._serialized_end=1463
-  _globals['_GETSTOCKLISTREQUEST']._serialized_start=1465
-  _globals['_GETSTOCKLISTREQUEST']._serialized_end=1507
-  _globals['_STOCKLISTRESPONSE']._serialized_start=1509
-  _globals['_STOCKLISTRESPONSE']._serialized_end=1549
-  _globals['_GETSECTORLISTRESPONSE']._serialized_start=1551
-  _globals['_GETSECTORLISTRESPONSE']._serialized_end=1591
-  _globals['_DOWNLOADHISTORYDATAREQUEST']._serialized_start=1593
-  _globals['_DOWNLOADHISTORYDATAREQUEST']._serialized_end=1719
-  _globals['_DOWNLOADPROGRESS']._serialized_start=1721
-  _globals['_DOWNLOADPROGRESS']._serialized_end=1809
-  _globals['_GETTRADINGDATESREQUEST']._serialized_start=1811
-  _globals['_GETTRADINGDATESREQUEST']._serialized_end=1904
-  _globals['_GETTRADINGDATESRESPONSE']._serialized_start=1906
-  _globals['_GETTRADINGDATESRESPONSE']._serialized_end=1946
-  _globals['_GETFINANCIALDATAREQUEST']._serialized_start=1948
-  _globals['_GETFINANCIALDATAREQUEST']._serialized_end=2073
-  _globals['_GETFINANCIALDATARESPONSE']._serialized_start=2075
-  _globals['_GETFINANCIALDATARESPONSE']._serialized_end=2120
-  _globals['_DOWNLOADFINANCIALDATAREQUEST']._serialized_start=2122
-  _globals['_DOWNLOADFINANCIALDATAREQUEST']._serialized_end=2231
-  _globals['_GETVALUATIONMETRICSREQUEST']._serialized_start=2233
-  _globals['_GETVALUATIONMETRICSREQUEST']._serialized_end=2282
-  _globals['_STOCKVALUATION']._serialized_start=2285
-  _globals['_STOCKVALUATION']._serialized_end=2481
-  _globals['_GETVALUATIONMETRICSRESPONSE']._serialized_start=2483
-  _globals['_GETVALUATIONMETRICSRESPONSE']._serialized_end=2557
-  _globals['_SUBSCRIBEQUOTEREQUEST']._serialized_start=2559
-  _globals['_SUBSCRIBEQUOTEREQUEST']._serialized_end=2633
-  _globals['_QUOTEUPDATE']._serialized_start=2635
-  _globals['_QUOTEUPDATE']._serialized_end=2717
-  _globals['_SUBSCRIBEWHOLEQUOTEREQUEST']._serialized_start=2719
-  _globals['_SUBSCRIBEWHOLEQUOTEREQUEST']._serialized_end=2766
-  _globals['_ACCOUNTREQUEST']._serialized_start=2768
-  _globals['_ACCOUNTREQUEST']._serialized_end=2826
-  _globals['_ASSETINFO']._serialized_start=2828
-  _globals['_ASSETINFO']._serialized_end=2937
-  _globals['_ORDERINFO']._serialized_start=2940
-  _globals['_ORDERINFO']._serialized_end=3239
-  _globals['_TRADEINFO']._serialized_start=3242
-  _globals['_TRADEINFO']._serialized_end=3485
-  _globals['_POSITIONINFO']._serialized_start=3488
-  _globals['_POSITIONINFO']._serialized_end=3666
-  _globals['_ORDERSTOCKREQUEST']._serialized_start=3669
-  _globals['_ORDERSTOCKREQUEST']._serialized_end=3866
-  _globals['_ORDERSTOCKRESPONSE']._serialized_start=3868
-  _globals['_ORDERSTOCKRESPONSE']._serialized_end=3940
-  _globals['_CANCELORDERREQUEST']._serialized_start=3942
-  _globals['_CANCELORDERREQUEST']._serialized_end=4022
-  _globals['_CANCELORDERRESPONSE']._serialized_start=4024
-  _globals['_CANCELORDERRESPONSE']._serialized_end=4079
-  _globals['_QUERYORDERSREQUEST']._serialized_start=4081
-  _globals['_QUERYORDERSREQUEST']._serialized_end=4168
-  _globals['_QUERYORDERSRESPONSE']._serialized_start=4170
-  _globals['_QUERYORDERSRESPONSE']._serialized_end=4227
-  _globals['_QUERYTRADESRESPONSE']._serialized_start=4229
-  _globals['_QUERYTRADESRESPONSE']._serialized_end=4286
-  _globals['_QUERYPOSITIONSRESPONSE']._serialized_start=4288
-  _globals['_QUERYPOSITIONSRESPONSE']._serialized_end=4354
-  _globals['_TRADINGEVENT']._serialized_start=4357
-  _globals['_TRADINGEVENT']._serialized_end=4590
-  _globals['_ORDERERRORINFO']._serialized_start=4592
-  _globals['_ORDERERRORINFO']._serialized_end=4663
-  _globals['_CANCELERRORINFO']._serialized_start=4665
-  _globals['_CANCELERRORINFO']._serialized_end=4737
-  _globals['_MARKETDATASERVICE']._serialized_start=4740
-  _globals['_MARKETDATASERVICE']._serialized_end=5753
-  _globals['_TRADINGSERVICE']._serialized_start=5756
-  _globals['_TRADINGSERVICE']._serialized_end=6266
+  _globals['_TICKSNAPSHOT']._serialized_end=565
+  _globals['_STREAMSTATS']._serialized_start=567
+  _globals['_STREAMSTATS']._serialized_end=616
+  _globals['_INSTRUMENTDETAIL']._serialized_start=619
+  _globals['_INSTRUMENTDETAIL']._serialized_end=921
+  _globals['_GETMARKETDATAREQUEST']._serialized_start=924
+  _globals['_GETMARKETDATAREQUEST']._serialized_end=1179
+  _globals['_PACKEDCOLUMNS']._serialized_start=1182
+  _globals['_PACKEDCOLUMNS']._serialized_end=1389
+  _globals['_COMPACTKLINES']._serialized_start=1392
+  _globals['_COMPACTKLINES']._serialized_end=1710
+  _globals['_GETMARKETDATARESPONSE']._serialized_start=1713
+  _globals['_GETMARKETDATARESPONSE']._serialized_end=2087
+  _globals['_KLINESPEC']._serialized_start=2089
+  _globals['_KLINESPEC']._serialized_end=2169
+  _globals['_GETMARKETDATABATCHREQUEST']._serialized_start=2171
+  _globals['_GETMARKETDATABATCHREQUEST']._serialized_end=2278
+  _globals['_KLINESECTION']._serialized_start=2280
+  _globals['_KLINESECTION']._serialized_end=2374
+  _globals['_GETMARKETDATABATCHRESPONSE']._serialized_start=2376
+  _globals['_GETMARKETDATABATCHRESPONSE']._serialized_end=2445
+  _globals['_GETCROSSSECTIONREQUEST']._serialized_start=2448
+  _globals['_GETCROSSSECTIONREQUEST']._serialized_end=2627
+  _globals['_INDICATORSPEC']._serialized_start=2629
+  _globals['_INDICATORSPEC']._serialized_end=2674
+  _globals['_COMPUTEINDICATORSREQUEST']._serialized_start=2677
+  _globals['_COMPUTEINDICATORSREQUEST']._serialized_end=2859
+  _globals['_INDICATORSERIES']._serialized_start=2861
+  _globals['_INDICATORSERIES']._serialized_end=2908
+  _globals['_STOCKINDICATORS']._serialized_start=2910
+  _globals['_STOCKINDICATORS']._serialized_end=3003
+  _globals['_COMPUTEINDICATORSRESPONSE']._serialized_start=3005
+  _globals['_COMPUTEINDICATORSRESPONSE']._serialized_end=3074
+  _globals['_STREAMTICKHISTORYREQUEST']._serialized_start=3077
+  _globals['_STREAMTICKHISTORYREQUEST']._serialized_end=3219
+  _globals['_TICKCHUNK']._serialized_start=3222
+  _globals['_TICKCHUNK']._serialized_end=3431
+  _globals['_TICKSNAPSHOTCOLUMNS']._serialized_start=3434
+  _globals['_TICKSNAPSHOTCOLUMNS']._serialized_end=3716
+  _globals['_GETFULLTICKREQUEST']._serialized_start=3718
+  _globals['_GETFULLTICKREQUEST']._serialized_end=3800
+  _globals['_GETFULLTICKRESPONSE']._serialized_start=3803
+  _globals['_GETFULLTICKRESPONSE']._serialized_end=4032
+  _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._serialized_start=3965
+  _globals['_GETFULLTICKRESPONSE_TICKSENTRY']._serialized_end=4032
+  _globals['_GETINSTRUMENTDETAILREQUEST']._serialized_start=4034
+  _globals['_GETINSTRUMENTDETAILREQUEST']._serialized_end=4103
+  _globals['_GETSTOCKLISTREQUEST']._serialized_start=4105
+  _globals['_GETSTOCKLISTREQUEST']._serialized_end=4147
+  _globals['_STOCKLISTRESPONSE']._serialized_start=4149
+  _globals['_STOCKLISTRESPONSE']._serialized_end=4189
+  _globals['_GETSECTORLISTRESPONSE']._serialized_start=4191
+  _globals['_GETSECTORLISTRESPONSE']._serialized_end=4231
+  _globals['_DOWNLOADHISTORYDATAREQUEST']._serialized_start=4233
+  _globals['_DOWNLOADHISTORYDATAREQUEST']._serialized_end=4359
+  _globals['_DOWNLOADPROGRESS']._serialized_start=4361
+  _globals['_DOWNLOADPROGRESS']._serialized_end=4449
+  _globals['_GETTRADINGDATESREQUEST']._serialized_start=4451
+  _globals['_GETTRADINGDATESREQUEST']._serialized_end=4544
+  _globals['_GETTRADINGDATESRESPONSE']._serialized_start=4546
+  _globals['_GETTRADINGDATESRESPONSE']._serialized_end=4586
+  _globals['_GETFINANCIALDATAREQUEST']._serialized_start=4589
+  _globals['_GETFINANCIALDATAREQUEST']._serialized_end=4730
+  _globals['_GETFINANCIALDATARESPONSE']._serialized_start=4733
+  _globals['_GETFINANCIALDATARESPONSE']._serialized_end=4904
+  _globals['_GETFINANCIALDATARESPONSE_ARROWTABLESENTRY']._serialized_start=4854
+  _globals['_GETFINANCIALDATARESPONSE_ARROWTABLESENTRY']._serialized_end=4904
+  _globals['_DOWNLOADFINANCIALDATAREQUEST']._serialized_start=4906
+  _globals['_DOWNLOADFINANCIALDATAREQUEST']._serialized_end=5015
+  _globals['_GETVALUATIONMETRICSREQUEST']._serialized_start=5017
+  _globals['_GETVALUATIONMETRICSREQUEST']._serialized_end=5066
+  _globals['_STOCKVALUATION']._serialized_start=5069
+  _globals['_STOCKVALUATION']._serialized_end=5265
+  _globals['_GETVALUATIONMETRICSRESPONSE']._serialized_start=5267
+  _globals['_GETVALUATIONMETRICSRESPONSE']._serialized_end=5341
+  _globals['_SERVERMETRICS']._serialized_start=5343
+  _globals['_SERVERMETRICS']._serialized_end=5457
+  _globals['_SERVERMETRICS_VALUESENTRY']._serialized_start=5412
+  _globals['_SERVERMETRICS_VALUESENTRY']._serialized_end=5457
+  _globals['_SUBSCRIBEQUOTEREQUEST']._serialized_start=5459
+  _globals['_SUBSCRIBEQUOTEREQUEST']._serialized_end=5533
+  _globals['_QUOTEUPDATE']._serialized_start=5535
+  _globals['_QUOTEUPDATE']._serialized_end=5661
+  _globals['_SUBSCRIBEWHOLEQUOTEREQUEST']._serialized_start=5663
+  _globals['_SUBSCRIBEWHOLEQUOTEREQUEST']._serialized_end=5710
+  _globals['_SUBSCRIBEWHOLEQUOTEBATCHREQUEST']._serialized_start=5712
+  _globals['_SUBSCRIBEWHOLEQUOTEBATCHREQUEST']._serialized_end=5825
+  _globals['_TICKBATCH']._serialized_start=5828
+  _globals['_TICKBATCH']._serialized_end=5968
+  _globals['_ACCOUNTREQUEST']._serialized_start=5970
+  _globals['_ACCOUNTREQUEST']._serialized_end=6028
+  _globals['_ASSETINFO']._serialized_start=6030
+  _globals['_ASSETINFO']._serialized_end=6139
+  _globals['_ORDERINFO']._serialized_start=6142
+  _globals['_ORDERINFO']._serialized_end=6441
+  _globals['_TRADEINFO']._serialized_start=6444
+  _globals['_TRADEINFO']._serialized_end=6687
+  _globals['_POSITIONINFO']._serialized_start=6690
+  _globals['_POSITIONINFO']._serialized_end=6868
+  _globals['_ORDERSTOCKREQUEST']._serialized_start=6871
+  _globals['_ORDERSTOCKREQUEST']._serialized_end=7068
+  _globals['_ORDERSTOCKRESPONSE']._serialized_start=7070
+  _globals['_ORDERSTOCKRESPONSE']._serialized_end=7142
+  _globals['_CANCELORDERREQUEST']._serialized_start=7144
+  _globals['_CANCELORDERREQUEST']._serialized_end=7224
+  _globals['_CANCELORDERRESPONSE']._serialized_start=7226
+  _globals['_CANCELORDERRESPONSE']._serialized_end=7281
+  _globals['_QUERYORDERSREQUEST']._serialized_start=7283
+  _globals['_QUERYORDERSREQUEST']._serialized_end=7370
+  _globals['_QUERYORDERSRESPONSE']._serialized_start=7372
+  _globals['_QUERYORDERSRESPONSE']._serialized_end=7429
+  _globals['_QUERYTRADESRESPONSE']._serialized_start=7431
+  _globals['_QUERYTRADESRESPONSE']._serialized_end=7488
+  _globals['_QUERYPOSITIONSRESPONSE']._serialized_start=7490
+  _globals['_QUERYPOSITIONSRESPONSE']._serialized_end=7556
+  _globals['_TRADINGEVENT']._serialized_start=7559
+  _globals['_TRADINGEVENT']._serialized_end=7792
+  _globals['_ORDERERRORINFO']._serialized_start=7794
+  _globals['_ORDERERRORINFO']._serialized_end=7865
+  _globals['_CANCELERRORINFO']._serialized_start=7867
+  _globals['_CANCELERRORINFO']._serialized_end=7939
+  _globals['_MARKETDATASERVICE']._serialized_start=7942
+  _globals['_MARKETDATASERVICE']._serialized_end=9541
+  _globals['_TRADINGSERVICE']._serialized_start=9544
+  _globals['_TRADINGSERVICE']._serialized_end=10054
 # @@protoc_insertion_point(module_scope)
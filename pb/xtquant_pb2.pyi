@@ -39,7 +39,7 @@ class KlineBar(_message.Message):
     def __init__(self, stock_code: _Optional[str] = ..., time: _Optional[int] = ..., open: _Optional[float] = ..., high: _Optional[float] = ..., low: _Optional[float] = ..., close: _Optional[float] = ..., volume: _Optional[float] = ..., amount: _Optional[float] = ..., pre_close: _Optional[float] = ..., suspend_flag: _Optional[int] = ..., settlement_price: _Optional[float] = ..., open_interest: _Optional[float] = ...) -> None: ...
 
 class TickSnapshot(_message.Message):
-    __slots__ = ("stock_code", "time", "last_price", "open", "high", "low", "last_close", "volume", "amount", "bid_price", "bid_volume", "ask_price", "ask_volume")
+    __slots__ = ("stock_code", "time", "last_price", "open", "high", "low", "last_close", "volume", "amount", "bid_price", "bid_volume", "ask_price", "ask_volume", "received_at", "stream_stats")
     STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
     TIME_FIELD_NUMBER: _ClassVar[int]
     LAST_PRICE_FIELD_NUMBER: _ClassVar[int]
@@ -53,6 +53,8 @@ class TickSnapshot(_message.Message):
     BID_VOLUME_FIELD_NUMBER: _ClassVar[int]
     ASK_PRICE_FIELD_NUMBER: _ClassVar[int]
     ASK_VOLUME_FIELD_NUMBER: _ClassVar[int]
+    RECEIVED_AT_FIELD_NUMBER: _ClassVar[int]
+    STREAM_STATS_FIELD_NUMBER: _ClassVar[int]
     stock_code: str
     time: int
     last_price: float
@@ -66,7 +68,17 @@ class TickSnapshot(_message.Message):
     bid_volume: _containers.RepeatedScalarFieldContainer[float]
     ask_price: _containers.RepeatedScalarFieldContainer[float]
     ask_volume: _containers.RepeatedScalarFieldContainer[float]
-    def __init__(self, stock_code: _Optional[str] = ..., time: _Optional[int] = ..., last_price: _Optional[float] = ..., open: _Optional[float] = ..., high: _Optional[float] = ..., low: _Optional[float] = ..., last_close: _Optional[float] = ..., volume: _Optional[float] = ..., amount: _Optional[float] = ..., bid_price: _Optional[_Iterable[float]] = ..., bid_volume: _Optional[_Iterable[float]] = ..., ask_price: _Optional[_Iterable[float]] = ..., ask_volume: _Optional[_Iterable[float]] = ...) -> None: ...
+    received_at: int
+    stream_stats: StreamStats
+    def __init__(self, stock_code: _Optional[str] = ..., time: _Optional[int] = ..., last_price: _Optional[float] = ..., open: _Optional[float] = ..., high: _Optional[float] = ..., low: _Optional[float] = ..., last_close: _Optional[float] = ..., volume: _Optional[float] = ..., amount: _Optional[float] = ..., bid_price: _Optional[_Iterable[float]] = ..., bid_volume: _Optional[_Iterable[float]] = ..., ask_price: _Optional[_Iterable[float]] = ..., ask_volume: _Optional[_Iterable[float]] = ..., received_at: _Optional[int] = ..., stream_stats: _Optional[_Union[StreamStats, _Mapping]] = ...) -> None: ...
+
+class StreamStats(_message.Message):
+    __slots__ = ("conflated", "dropped")
+    CONFLATED_FIELD_NUMBER: _ClassVar[int]
+    DROPPED_FIELD_NUMBER: _ClassVar[int]
+    conflated: int
+    dropped: int
+    def __init__(self, conflated: _Optional[int] = ..., dropped: _Optional[int] = ...) -> None: ...
 
 class InstrumentDetail(_message.Message):
     __slots__ = ("exchange_id", "instrument_id", "instrument_name", "product_id", "up_stop_price", "down_stop_price", "pre_close", "open_date", "price_tick", "volume_multiple", "total_volume", "float_volume", "extra_json")
@@ -99,7 +111,7 @@ class InstrumentDetail(_message.Message):
     def __init__(self, exchange_id: _Optional[str] = ..., instrument_id: _Optional[str] = ..., instrument_name: _Optional[str] = ..., product_id: _Optional[str] = ..., up_stop_price: _Optional[float] = ..., down_stop_price: _Optional[float] = ..., pre_close: _Optional[float] = ..., open_date: _Optional[str] = ..., price_tick: _Optional[float] = ..., volume_multiple: _Optional[int] = ..., total_volume: _Optional[int] = ..., float_volume: _Optional[int] = ..., extra_json: _Optional[str] = ...) -> None: ...
 
 class GetMarketDataRequest(_message.Message):
-    __slots__ = ("stock_codes", "period", "start_time", "end_time", "count", "dividend_type", "fill_data")
+    __slots__ = ("stock_codes", "period", "start_time", "end_time", "count", "dividend_type", "fill_data", "chunk_rows", "chunk_stocks", "encoding", "dict_stock_code", "fields")
     STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
     PERIOD_FIELD_NUMBER: _ClassVar[int]
     START_TIME_FIELD_NUMBER: _ClassVar[int]
@@ -107,6 +119,11 @@ class GetMarketDataRequest(_message.Message):
     COUNT_FIELD_NUMBER: _ClassVar[int]
     DIVIDEND_TYPE_FIELD_NUMBER: _ClassVar[int]
     FILL_DATA_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_ROWS_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_STOCKS_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
+    DICT_STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
+    FIELDS_FIELD_NUMBER: _ClassVar[int]
     stock_codes: _containers.RepeatedScalarFieldContainer[str]
     period: str
     start_time: str
@@ -114,10 +131,77 @@ class GetMarketDataRequest(_message.Message):
     count: int
     dividend_type: str
     fill_data: bool
-    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., period: _Optional[str] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., count: _Optional[int] = ..., dividend_type: _Optional[str] = ..., fill_data: bool = ...) -> None: ...
+    chunk_rows: int
+    chunk_stocks: int
+    encoding: str
+    dict_stock_code: bool
+    fields: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., period: _Optional[str] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., count: _Optional[int] = ..., dividend_type: _Optional[str] = ..., fill_data: bool = ..., chunk_rows: _Optional[int] = ..., chunk_stocks: _Optional[int] = ..., encoding: _Optional[str] = ..., dict_stock_code: bool = ..., fields: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class PackedColumns(_message.Message):
+    __slots__ = ("time", "open", "high", "low", "close", "volume", "amount", "pre_close", "suspend_flag", "settlement_price", "open_interest")
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    OPEN_FIELD_NUMBER: _ClassVar[int]
+    HIGH_FIELD_NUMBER: _ClassVar[int]
+    LOW_FIELD_NUMBER: _ClassVar[int]
+    CLOSE_FIELD_NUMBER: _ClassVar[int]
+    VOLUME_FIELD_NUMBER: _ClassVar[int]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    PRE_CLOSE_FIELD_NUMBER: _ClassVar[int]
+    SUSPEND_FLAG_FIELD_NUMBER: _ClassVar[int]
+    SETTLEMENT_PRICE_FIELD_NUMBER: _ClassVar[int]
+    OPEN_INTEREST_FIELD_NUMBER: _ClassVar[int]
+    time: bytes
+    open: bytes
+    high: bytes
+    low: bytes
+    close: bytes
+    volume: bytes
+    amount: bytes
+    pre_close: bytes
+    suspend_flag: bytes
+    settlement_price: bytes
+    open_interest: bytes
+    def __init__(self, time: _Optional[bytes] = ..., open: _Optional[bytes] = ..., high: _Optional[bytes] = ..., low: _Optional[bytes] = ..., close: _Optional[bytes] = ..., volume: _Optional[bytes] = ..., amount: _Optional[bytes] = ..., pre_close: _Optional[bytes] = ..., suspend_flag: _Optional[bytes] = ..., settlement_price: _Optional[bytes] = ..., open_interest: _Optional[bytes] = ...) -> None: ...
+
+class CompactKlines(_message.Message):
+    __slots__ = ("stock_code", "rows", "price_tick", "price_base", "time", "open", "high", "low", "close", "pre_close", "settlement_price", "volume", "amount", "suspend_flag", "open_interest", "raw")
+    STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
+    ROWS_FIELD_NUMBER: _ClassVar[int]
+    PRICE_TICK_FIELD_NUMBER: _ClassVar[int]
+    PRICE_BASE_FIELD_NUMBER: _ClassVar[int]
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    OPEN_FIELD_NUMBER: _ClassVar[int]
+    HIGH_FIELD_NUMBER: _ClassVar[int]
+    LOW_FIELD_NUMBER: _ClassVar[int]
+    CLOSE_FIELD_NUMBER: _ClassVar[int]
+    PRE_CLOSE_FIELD_NUMBER: _ClassVar[int]
+    SETTLEMENT_PRICE_FIELD_NUMBER: _ClassVar[int]
+    VOLUME_FIELD_NUMBER: _ClassVar[int]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    SUSPEND_FLAG_FIELD_NUMBER: _ClassVar[int]
+    OPEN_INTEREST_FIELD_NUMBER: _ClassVar[int]
+    RAW_FIELD_NUMBER: _ClassVar[int]
+    stock_code: str
+    rows: int
+    price_tick: float
+    price_base: int
+    time: _containers.RepeatedScalarFieldContainer[int]
+    open: _containers.RepeatedScalarFieldContainer[int]
+    high: _containers.RepeatedScalarFieldContainer[int]
+    low: _containers.RepeatedScalarFieldContainer[int]
+    close: _containers.RepeatedScalarFieldContainer[int]
+    pre_close: _containers.RepeatedScalarFieldContainer[int]
+    settlement_price: _containers.RepeatedScalarFieldContainer[int]
+    volume: _containers.RepeatedScalarFieldContainer[int]
+    amount: _containers.RepeatedScalarFieldContainer[float]
+    suspend_flag: _containers.RepeatedScalarFieldContainer[int]
+    open_interest: _containers.RepeatedScalarFieldContainer[int]
+    raw: PackedColumns
+    def __init__(self, stock_code: _Optional[str] = ..., rows: _Optional[int] = ..., price_tick: _Optional[float] = ..., price_base: _Optional[int] = ..., time: _Optional[_Iterable[int]] = ..., open: _Optional[_Iterable[int]] = ..., high: _Optional[_Iterable[int]] = ..., low: _Optional[_Iterable[int]] = ..., close: _Optional[_Iterable[int]] = ..., pre_close: _Optional[_Iterable[int]] = ..., settlement_price: _Optional[_Iterable[int]] = ..., volume: _Optional[_Iterable[int]] = ..., amount: _Optional[_Iterable[float]] = ..., suspend_flag: _Optional[_Iterable[int]] = ..., open_interest: _Optional[_Iterable[int]] = ..., raw: _Optional[_Union[PackedColumns, _Mapping]] = ...) -> None: ...
 
 class GetMarketDataResponse(_message.Message):
-    __slots__ = ("stock_code", "time", "open", "high", "low", "close", "volume", "amount", "pre_close", "suspend_flag", "settlement_price", "open_interest")
+    __slots__ = ("stock_code", "time", "open", "high", "low", "close", "volume", "amount", "pre_close", "suspend_flag", "settlement_price", "open_interest", "packed", "code_table", "code_rows", "arrow_ipc", "compact")
     STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
     TIME_FIELD_NUMBER: _ClassVar[int]
     OPEN_FIELD_NUMBER: _ClassVar[int]
@@ -130,6 +214,11 @@ class GetMarketDataResponse(_message.Message):
     SUSPEND_FLAG_FIELD_NUMBER: _ClassVar[int]
     SETTLEMENT_PRICE_FIELD_NUMBER: _ClassVar[int]
     OPEN_INTEREST_FIELD_NUMBER: _ClassVar[int]
+    PACKED_FIELD_NUMBER: _ClassVar[int]
+    CODE_TABLE_FIELD_NUMBER: _ClassVar[int]
+    CODE_ROWS_FIELD_NUMBER: _ClassVar[int]
+    ARROW_IPC_FIELD_NUMBER: _ClassVar[int]
+    COMPACT_FIELD_NUMBER: _ClassVar[int]
     stock_code: _containers.RepeatedScalarFieldContainer[str]
     time: _containers.RepeatedScalarFieldContainer[int]
     open: _containers.RepeatedScalarFieldContainer[float]
@@ -142,16 +231,205 @@ class GetMarketDataResponse(_message.Message):
     suspend_flag: _containers.RepeatedScalarFieldContainer[int]
     settlement_price: _containers.RepeatedScalarFieldContainer[float]
     open_interest: _containers.RepeatedScalarFieldContainer[float]
-    def __init__(self, stock_code: _Optional[_Iterable[str]] = ..., time: _Optional[_Iterable[int]] = ..., open: _Optional[_Iterable[float]] = ..., high: _Optional[_Iterable[float]] = ..., low: _Optional[_Iterable[float]] = ..., close: _Optional[_Iterable[float]] = ..., volume: _Optional[_Iterable[float]] = ..., amount: _Optional[_Iterable[float]] = ..., pre_close: _Optional[_Iterable[float]] = ..., suspend_flag: _Optional[_Iterable[int]] = ..., settlement_price: _Optional[_Iterable[float]] = ..., open_interest: _Optional[_Iterable[float]] = ...) -> None: ...
+    packed: PackedColumns
+    code_table: _containers.RepeatedScalarFieldContainer[str]
+    code_rows: _containers.RepeatedScalarFieldContainer[int]
+    arrow_ipc: bytes
+    compact: _containers.RepeatedCompositeFieldContainer[CompactKlines]
+    def __init__(self, stock_code: _Optional[_Iterable[str]] = ..., time: _Optional[_Iterable[int]] = ..., open: _Optional[_Iterable[float]] = ..., high: _Optional[_Iterable[float]] = ..., low: _Optional[_Iterable[float]] = ..., close: _Optional[_Iterable[float]] = ..., volume: _Optional[_Iterable[float]] = ..., amount: _Optional[_Iterable[float]] = ..., pre_close: _Optional[_Iterable[float]] = ..., suspend_flag: _Optional[_Iterable[int]] = ..., settlement_price: _Optional[_Iterable[float]] = ..., open_interest: _Optional[_Iterable[float]] = ..., packed: _Optional[_Union[PackedColumns, _Mapping]] = ..., code_table: _Optional[_Iterable[str]] = ..., code_rows: _Optional[_Iterable[int]] = ..., arrow_ipc: _Optional[bytes] = ..., compact: _Optional[_Iterable[_Union[CompactKlines, _Mapping]]] = ...) -> None: ...
+
+class KlineSpec(_message.Message):
+    __slots__ = ("period", "start_time", "end_time", "count")
+    PERIOD_FIELD_NUMBER: _ClassVar[int]
+    START_TIME_FIELD_NUMBER: _ClassVar[int]
+    END_TIME_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    period: str
+    start_time: str
+    end_time: str
+    count: int
+    def __init__(self, period: _Optional[str] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., count: _Optional[int] = ...) -> None: ...
+
+class GetMarketDataBatchRequest(_message.Message):
+    __slots__ = ("base", "specs")
+    BASE_FIELD_NUMBER: _ClassVar[int]
+    SPECS_FIELD_NUMBER: _ClassVar[int]
+    base: GetMarketDataRequest
+    specs: _containers.RepeatedCompositeFieldContainer[KlineSpec]
+    def __init__(self, base: _Optional[_Union[GetMarketDataRequest, _Mapping]] = ..., specs: _Optional[_Iterable[_Union[KlineSpec, _Mapping]]] = ...) -> None: ...
+
+class KlineSection(_message.Message):
+    __slots__ = ("spec", "data")
+    SPEC_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    spec: KlineSpec
+    data: GetMarketDataResponse
+    def __init__(self, spec: _Optional[_Union[KlineSpec, _Mapping]] = ..., data: _Optional[_Union[GetMarketDataResponse, _Mapping]] = ...) -> None: ...
+
+class GetMarketDataBatchResponse(_message.Message):
+    __slots__ = ("sections",)
+    SECTIONS_FIELD_NUMBER: _ClassVar[int]
+    sections: _containers.RepeatedCompositeFieldContainer[KlineSection]
+    def __init__(self, sections: _Optional[_Iterable[_Union[KlineSection, _Mapping]]] = ...) -> None: ...
+
+class GetCrossSectionRequest(_message.Message):
+    __slots__ = ("stock_codes", "sector_name", "as_of", "period", "dividend_type", "fields", "encoding", "dict_stock_code")
+    STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
+    SECTOR_NAME_FIELD_NUMBER: _ClassVar[int]
+    AS_OF_FIELD_NUMBER: _ClassVar[int]
+    PERIOD_FIELD_NUMBER: _ClassVar[int]
+    DIVIDEND_TYPE_FIELD_NUMBER: _ClassVar[int]
+    FIELDS_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
+    DICT_STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
+    stock_codes: _containers.RepeatedScalarFieldContainer[str]
+    sector_name: str
+    as_of: str
+    period: str
+    dividend_type: str
+    fields: _containers.RepeatedScalarFieldContainer[str]
+    encoding: str
+    dict_stock_code: bool
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., sector_name: _Optional[str] = ..., as_of: _Optional[str] = ..., period: _Optional[str] = ..., dividend_type: _Optional[str] = ..., fields: _Optional[_Iterable[str]] = ..., encoding: _Optional[str] = ..., dict_stock_code: bool = ...) -> None: ...
+
+class IndicatorSpec(_message.Message):
+    __slots__ = ("name", "params")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    PARAMS_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    params: _containers.RepeatedScalarFieldContainer[float]
+    def __init__(self, name: _Optional[str] = ..., params: _Optional[_Iterable[float]] = ...) -> None: ...
+
+class ComputeIndicatorsRequest(_message.Message):
+    __slots__ = ("stock_codes", "period", "end_time", "dividend_type", "indicators", "last_n", "lookback")
+    STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
+    PERIOD_FIELD_NUMBER: _ClassVar[int]
+    END_TIME_FIELD_NUMBER: _ClassVar[int]
+    DIVIDEND_TYPE_FIELD_NUMBER: _ClassVar[int]
+    INDICATORS_FIELD_NUMBER: _ClassVar[int]
+    LAST_N_FIELD_NUMBER: _ClassVar[int]
+    LOOKBACK_FIELD_NUMBER: _ClassVar[int]
+    stock_codes: _containers.RepeatedScalarFieldContainer[str]
+    period: str
+    end_time: str
+    dividend_type: str
+    indicators: _containers.RepeatedCompositeFieldContainer[IndicatorSpec]
+    last_n: int
+    lookback: int
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., period: _Optional[str] = ..., end_time: _Optional[str] = ..., dividend_type: _Optional[str] = ..., indicators: _Optional[_Iterable[_Union[IndicatorSpec, _Mapping]]] = ..., last_n: _Optional[int] = ..., lookback: _Optional[int] = ...) -> None: ...
+
+class IndicatorSeries(_message.Message):
+    __slots__ = ("name", "values")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    VALUES_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    values: _containers.RepeatedScalarFieldContainer[float]
+    def __init__(self, name: _Optional[str] = ..., values: _Optional[_Iterable[float]] = ...) -> None: ...
+
+class StockIndicators(_message.Message):
+    __slots__ = ("stock_code", "time", "series")
+    STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    SERIES_FIELD_NUMBER: _ClassVar[int]
+    stock_code: str
+    time: _containers.RepeatedScalarFieldContainer[int]
+    series: _containers.RepeatedCompositeFieldContainer[IndicatorSeries]
+    def __init__(self, stock_code: _Optional[str] = ..., time: _Optional[_Iterable[int]] = ..., series: _Optional[_Iterable[_Union[IndicatorSeries, _Mapping]]] = ...) -> None: ...
+
+class ComputeIndicatorsResponse(_message.Message):
+    __slots__ = ("stocks",)
+    STOCKS_FIELD_NUMBER: _ClassVar[int]
+    stocks: _containers.RepeatedCompositeFieldContainer[StockIndicators]
+    def __init__(self, stocks: _Optional[_Iterable[_Union[StockIndicators, _Mapping]]] = ...) -> None: ...
+
+class StreamTickHistoryRequest(_message.Message):
+    __slots__ = ("stock_codes", "start_time", "end_time", "count", "chunk_rows", "chunk_stocks")
+    STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
+    START_TIME_FIELD_NUMBER: _ClassVar[int]
+    END_TIME_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_ROWS_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_STOCKS_FIELD_NUMBER: _ClassVar[int]
+    stock_codes: _containers.RepeatedScalarFieldContainer[str]
+    start_time: str
+    end_time: str
+    count: int
+    chunk_rows: int
+    chunk_stocks: int
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., count: _Optional[int] = ..., chunk_rows: _Optional[int] = ..., chunk_stocks: _Optional[int] = ...) -> None: ...
+
+class TickChunk(_message.Message):
+    __slots__ = ("code_table", "code_rows", "depth", "time", "last_price", "volume", "amount", "bid_price", "bid_volume", "ask_price", "ask_volume")
+    CODE_TABLE_FIELD_NUMBER: _ClassVar[int]
+    CODE_ROWS_FIELD_NUMBER: _ClassVar[int]
+    DEPTH_FIELD_NUMBER: _ClassVar[int]
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    LAST_PRICE_FIELD_NUMBER: _ClassVar[int]
+    VOLUME_FIELD_NUMBER: _ClassVar[int]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    BID_PRICE_FIELD_NUMBER: _ClassVar[int]
+    BID_VOLUME_FIELD_NUMBER: _ClassVar[int]
+    ASK_PRICE_FIELD_NUMBER: _ClassVar[int]
+    ASK_VOLUME_FIELD_NUMBER: _ClassVar[int]
+    code_table: _containers.RepeatedScalarFieldContainer[str]
+    code_rows: _containers.RepeatedScalarFieldContainer[int]
+    depth: int
+    time: bytes
+    last_price: bytes
+    volume: bytes
+    amount: bytes
+    bid_price: bytes
+    bid_volume: bytes
+    ask_price: bytes
+    ask_volume: bytes
+    def __init__(self, code_table: _Optional[_Iterable[str]] = ..., code_rows: _Optional[_Iterable[int]] = ..., depth: _Optional[int] = ..., time: _Optional[bytes] = ..., last_price: _Optional[bytes] = ..., volume: _Optional[bytes] = ..., amount: _Optional[bytes] = ..., bid_price: _Optional[bytes] = ..., bid_volume: _Optional[bytes] = ..., ask_price: _Optional[bytes] = ..., ask_volume: _Optional[bytes] = ...) -> None: ...
+
+class TickSnapshotColumns(_message.Message):
+    __slots__ = ("stock_code", "depth", "time", "last_price", "open", "high", "low", "last_close", "volume", "amount", "bid_price", "bid_volume", "ask_price", "ask_volume", "received_at")
+    STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
+    DEPTH_FIELD_NUMBER: _ClassVar[int]
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    LAST_PRICE_FIELD_NUMBER: _ClassVar[int]
+    OPEN_FIELD_NUMBER: _ClassVar[int]
+    HIGH_FIELD_NUMBER: _ClassVar[int]
+    LOW_FIELD_NUMBER: _ClassVar[int]
+    LAST_CLOSE_FIELD_NUMBER: _ClassVar[int]
+    VOLUME_FIELD_NUMBER: _ClassVar[int]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    BID_PRICE_FIELD_NUMBER: _ClassVar[int]
+    BID_VOLUME_FIELD_NUMBER: _ClassVar[int]
+    ASK_PRICE_FIELD_NUMBER: _ClassVar[int]
+    ASK_VOLUME_FIELD_NUMBER: _ClassVar[int]
+    RECEIVED_AT_FIELD_NUMBER: _ClassVar[int]
+    stock_code: _containers.RepeatedScalarFieldContainer[str]
+    depth: int
+    time: bytes
+    last_price: bytes
+    open: bytes
+    high: bytes
+    low: bytes
+    last_close: bytes
+    volume: bytes
+    amount: bytes
+    bid_price: bytes
+    bid_volume: bytes
+    ask_price: bytes
+    ask_volume: bytes
+    received_at: bytes
+    def __init__(self, stock_code: _Optional[_Iterable[str]] = ..., depth: _Optional[int] = ..., time: _Optional[bytes] = ..., last_price: _Optional[bytes] = ..., open: _Optional[bytes] = ..., high: _Optional[bytes] = ..., low: _Optional[bytes] = ..., last_close: _Optional[bytes] = ..., volume: _Optional[bytes] = ..., amount: _Optional[bytes] = ..., bid_price: _Optional[bytes] = ..., bid_volume: _Optional[bytes] = ..., ask_price: _Optional[bytes] = ..., ask_volume: _Optional[bytes] = ..., received_at: _Optional[bytes] = ...) -> None: ...
 
 class GetFullTickRequest(_message.Message):
-    __slots__ = ("stock_codes",)
+    __slots__ = ("stock_codes", "encoding", "since_version")
     STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
+    SINCE_VERSION_FIELD_NUMBER: _ClassVar[int]
     stock_codes: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ...) -> None: ...
+    encoding: str
+    since_version: int
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., encoding: _Optional[str] = ..., since_version: _Optional[int] = ...) -> None: ...
 
 class GetFullTickResponse(_message.Message):
-    __slots__ = ("ticks",)
+    __slots__ = ("ticks", "columns", "version", "unchanged")
     class TicksEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -160,8 +438,14 @@ class GetFullTickResponse(_message.Message):
         value: TickSnapshot
         def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[TickSnapshot, _Mapping]] = ...) -> None: ...
     TICKS_FIELD_NUMBER: _ClassVar[int]
+    COLUMNS_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    UNCHANGED_FIELD_NUMBER: _ClassVar[int]
     ticks: _containers.MessageMap[str, TickSnapshot]
-    def __init__(self, ticks: _Optional[_Mapping[str, TickSnapshot]] = ...) -> None: ...
+    columns: TickSnapshotColumns
+    version: int
+    unchanged: bool
+    def __init__(self, ticks: _Optional[_Mapping[str, TickSnapshot]] = ..., columns: _Optional[_Union[TickSnapshotColumns, _Mapping]] = ..., version: _Optional[int] = ..., unchanged: bool = ...) -> None: ...
 
 class GetInstrumentDetailRequest(_message.Message):
     __slots__ = ("stock_code", "is_complete")
@@ -234,24 +518,35 @@ class GetTradingDatesResponse(_message.Message):
     def __init__(self, dates: _Optional[_Iterable[int]] = ...) -> None: ...
 
 class GetFinancialDataRequest(_message.Message):
-    __slots__ = ("stock_codes", "table_list", "start_time", "end_time", "report_type")
+    __slots__ = ("stock_codes", "table_list", "start_time", "end_time", "report_type", "format")
     STOCK_CODES_FIELD_NUMBER: _ClassVar[int]
     TABLE_LIST_FIELD_NUMBER: _ClassVar[int]
     START_TIME_FIELD_NUMBER: _ClassVar[int]
     END_TIME_FIELD_NUMBER: _ClassVar[int]
     REPORT_TYPE_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
     stock_codes: _containers.RepeatedScalarFieldContainer[str]
     table_list: _containers.RepeatedScalarFieldContainer[str]
     start_time: str
     end_time: str
     report_type: str
-    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., table_list: _Optional[_Iterable[str]] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., report_type: _Optional[str] = ...) -> None: ...
+    format: str
+    def __init__(self, stock_codes: _Optional[_Iterable[str]] = ..., table_list: _Optional[_Iterable[str]] = ..., start_time: _Optional[str] = ..., end_time: _Optional[str] = ..., report_type: _Optional[str] = ..., format: _Optional[str] = ...) -> None: ...
 
 class GetFinancialDataResponse(_message.Message):
-    __slots__ = ("data_json",)
+    __slots__ = ("data_json", "arrow_tables")
+    class ArrowTablesEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: bytes
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[bytes] = ...) -> None: ...
     DATA_JSON_FIELD_NUMBER: _ClassVar[int]
+    ARROW_TABLES_FIELD_NUMBER: _ClassVar[int]
     data_json: str
-    def __init__(self, data_json: _Optional[str] = ...) -> None: ...
+    arrow_tables: _containers.ScalarMap[str, bytes]
+    def __init__(self, data_json: _Optional[str] = ..., arrow_tables: _Optional[_Mapping[str, bytes]] = ...) -> None: ...
 
 class DownloadFinancialDataRequest(_message.Message):
     __slots__ = ("stock_codes", "table_list", "start_time", "end_time")
@@ -299,6 +594,19 @@ class GetValuationMetricsResponse(_message.Message):
     valuations: _containers.RepeatedCompositeFieldContainer[StockValuation]
     def __init__(self, valuations: _Optional[_Iterable[_Union[StockValuation, _Mapping]]] = ...) -> None: ...
 
+class ServerMetrics(_message.Message):
+    __slots__ = ("values",)
+    class ValuesEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: float
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[float] = ...) -> None: ...
+    VALUES_FIELD_NUMBER: _ClassVar[int]
+    values: _containers.ScalarMap[str, float]
+    def __init__(self, values: _Optional[_Mapping[str, float]] = ...) -> None: ...
+
 class SubscribeQuoteRequest(_message.Message):
     __slots__ = ("stock_code", "period", "count")
     STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
@@ -310,14 +618,16 @@ class SubscribeQuoteRequest(_message.Message):
     def __init__(self, stock_code: _Optional[str] = ..., period: _Optional[str] = ..., count: _Optional[int] = ...) -> None: ...
 
 class QuoteUpdate(_message.Message):
-    __slots__ = ("stock_code", "period", "bars")
+    __slots__ = ("stock_code", "period", "bars", "stream_stats")
     STOCK_CODE_FIELD_NUMBER: _ClassVar[int]
     PERIOD_FIELD_NUMBER: _ClassVar[int]
     BARS_FIELD_NUMBER: _ClassVar[int]
+    STREAM_STATS_FIELD_NUMBER: _ClassVar[int]
     stock_code: str
     period: str
     bars: _containers.RepeatedCompositeFieldContainer[KlineBar]
-    def __init__(self, stock_code: _Optional[str] = ..., period: _Optional[str] = ..., bars: _Optional[_Iterable[_Union[KlineBar, _Mapping]]] = ...) -> None: ...
+    stream_stats: StreamStats
+    def __init__(self, stock_code: _Optional[str] = ..., period: _Optional[str] = ..., bars: _Optional[_Iterable[_Union[KlineBar, _Mapping]]] = ..., stream_stats: _Optional[_Union[StreamStats, _Mapping]] = ...) -> None: ...
 
 class SubscribeWholeQuoteRequest(_message.Message):
     __slots__ = ("code_list",)
@@ -325,6 +635,28 @@ class SubscribeWholeQuoteRequest(_message.Message):
     code_list: _containers.RepeatedScalarFieldContainer[str]
     def __init__(self, code_list: _Optional[_Iterable[str]] = ...) -> None: ...
 
+class SubscribeWholeQuoteBatchRequest(_message.Message):
+    __slots__ = ("code_list", "encoding", "max_batch", "max_latency_ms")
+    CODE_LIST_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
+    MAX_BATCH_FIELD_NUMBER: _ClassVar[int]
+    MAX_LATENCY_MS_FIELD_NUMBER: _ClassVar[int]
+    code_list: _containers.RepeatedScalarFieldContainer[str]
+    encoding: str
+    max_batch: int
+    max_latency_ms: int
+    def __init__(self, code_list: _Optional[_Iterable[str]] = ..., encoding: _Optional[str] = ..., max_batch: _Optional[int] = ..., max_latency_ms: _Optional[int] = ...) -> None: ...
+
+class TickBatch(_message.Message):
+    __slots__ = ("ticks", "columns", "stream_stats")
+    TICKS_FIELD_NUMBER: _ClassVar[int]
+    COLUMNS_FIELD_NUMBER: _ClassVar[int]
+    STREAM_STATS_FIELD_NUMBER: _ClassVar[int]
+    ticks: _containers.RepeatedCompositeFieldContainer[TickSnapshot]
+    columns: TickSnapshotColumns
+    stream_stats: StreamStats
+    def __init__(self, ticks: _Optional[_Iterable[_Union[TickSnapshot, _Mapping]]] = ..., columns: _Optional[_Union[TickSnapshotColumns, _Mapping]] = ..., stream_stats: _Optional[_Union[StreamStats, _Mapping]] = ...) -> None: ...
+
 class AccountRequest(_message.Message):
     __slots__ = ("account_id", "account_type")
     ACCOUNT_ID_FIELD_NUMBER: _ClassVar[int]
@@ -42,6 +42,31 @@ class MarketDataServiceStub(object):
                 request_serializer=xtquant__pb2.GetMarketDataRequest.SerializeToString,
                 response_deserializer=xtquant__pb2.GetMarketDataResponse.FromString,
                 _registered_method=True)
+        self.StreamMarketData = channel.unary_stream(
+                '/xtquant.MarketDataService/StreamMarketData',
+                request_serializer=xtquant__pb2.GetMarketDataRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.GetMarketDataResponse.FromString,
+                _registered_method=True)
+        self.GetMarketDataBatch = channel.unary_unary(
+                '/xtquant.MarketDataService/GetMarketDataBatch',
+                request_serializer=xtquant__pb2.GetMarketDataBatchRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.GetMarketDataBatchResponse.FromString,
+                _registered_method=True)
+        self.GetCrossSection = channel.unary_unary(
+                '/xtquant.MarketDataService/GetCrossSection',
+                request_serializer=xtquant__pb2.GetCrossSectionRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.GetMarketDataResponse.FromString,
+                _registered_method=True)
+        self.ComputeIndicators = channel.unary_unary(
+                '/xtquant.MarketDataService/ComputeIndicators',
+                request_serializer=xtquant__pb2.ComputeIndicatorsRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.ComputeIndicatorsResponse.FromString,
+                _registered_method=True)
+        self.StreamTickHistory = channel.unary_stream(
+                '/xtquant.MarketDataService/StreamTickHistory',
+                request_serializer=xtquant__pb2.StreamTickHistoryRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.TickChunk.FromString,
+                _registered_method=True)
         self.GetFullTick = channel.unary_unary(
                 '/xtquant.MarketDataService/GetFullTick',
                 request_serializer=xtquant__pb2.GetFullTickRequest.SerializeToString,
@@ -87,6 +112,11 @@ class MarketDataServiceStub(object):
                 request_serializer=xtquant__pb2.GetValuationMetricsRequest.SerializeToString,
                 response_deserializer=xtquant__pb2.GetValuationMetricsResponse.FromString,
                 _registered_method=True)
+        self.GetServerMetrics = channel.unary_unary(
+                '/xtquant.MarketDataService/GetServerMetrics',
+                request_serializer=xtquant__pb2.Empty.SerializeToString,
+                response_deserializer=xtquant__pb2.ServerMetrics.FromString,
+                _registered_method=True)
         self.SubscribeQuote = channel.unary_stream(
                 '/xtquant.MarketDataService/SubscribeQuote',
                 request_serializer=xtquant__pb2.SubscribeQuoteRequest.SerializeToString,
@@ -97,6 +127,11 @@ class MarketDataServiceStub(object):
                 request_serializer=xtquant__pb2.SubscribeWholeQuoteRequest.SerializeToString,
                 response_deserializer=xtquant__pb2.TickSnapshot.FromString,
                 _registered_method=True)
+        self.SubscribeWholeQuoteBatch = channel.unary_stream(
+                '/xtquant.MarketDataService/SubscribeWholeQuoteBatch',
+                request_serializer=xtquant__pb2.SubscribeWholeQuoteBatchRequest.SerializeToString,
+                response_deserializer=xtquant__pb2.TickBatch.FromString,
+                _registered_method=True)
 
 
 class MarketDataServiceServicer(object):
@@ -112,6 +147,42 @@ class MarketDataServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamMarketData(self, request, context):
+        """Get kline data in columnar chunks (server stream) -> xtdata.get_market_data_ex
+        Same request/response shape as GetMarketData; concatenate chunks client-side
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMarketDataBatch(self, request, context):
+        """Get kline data for several periods of one code list in a single call
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCrossSection(self, request, context):
+        """One row per instrument as of a date / timestamp (cross-section)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ComputeIndicators(self, request, context):
+        """Compute technical indicators server-side; returns only the last N values per stock
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamTickHistory(self, request, context):
+        """Get tick history in columnar chunks (server stream) -> xtdata.get_market_data_ex(period="tick")
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetFullTick(self, request, context):
         """Get real-time tick snapshot -> xtdata.get_full_tick
         """
@@ -176,6 +247,13 @@ class MarketDataServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetServerMetrics(self, request, context):
+        """Server-side metrics: per-method response size / compression, kline cache stats
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SubscribeQuote(self, request, context):
         """Subscribe to single-stock quotes (server stream) -> xtdata.subscribe_quote
         """
@@ -190,6 +268,13 @@ class MarketDataServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubscribeWholeQuoteBatch(self, request, context):
+        """Full-market tick stream, one TickBatch per push instead of one message per code
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_MarketDataServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -198,6 +283,31 @@ def add_MarketDataServiceServicer_to_server(servicer, server):
                     request_deserializer=xtquant__pb2.GetMarketDataRequest.FromString,
                     response_serializer=xtquant__pb2.GetMarketDataResponse.SerializeToString,
             ),
+            'StreamMarketData': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamMarketData,
+                    request_deserializer=xtquant__pb2.GetMarketDataRequest.FromString,
+                    response_serializer=xtquant__pb2.GetMarketDataResponse.SerializeToString,
+            ),
+            'GetMarketDataBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMarketDataBatch,
+                    request_deserializer=xtquant__pb2.GetMarketDataBatchRequest.FromString,
+                    response_serializer=xtquant__pb2.GetMarketDataBatchResponse.SerializeToString,
+            ),
+            'GetCrossSection': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCrossSection,
+                    request_deserializer=xtquant__pb2.GetCrossSectionRequest.FromString,
+                    response_serializer=xtquant__pb2.GetMarketDataResponse.SerializeToString,
+            ),
+            'ComputeIndicators': grpc.unary_unary_rpc_method_handler(
+                    servicer.ComputeIndicators,
+                    request_deserializer=xtquant__pb2.ComputeIndicatorsRequest.FromString,
+                    response_serializer=xtquant__pb2.ComputeIndicatorsResponse.SerializeToString,
+            ),
+            'StreamTickHistory': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTickHistory,
+                    request_deserializer=xtquant__pb2.StreamTickHistoryRequest.FromString,
+                    response_serializer=xtquant__pb2.TickChunk.SerializeToString,
+            ),
             'GetFullTick': grpc.unary_unary_rpc_method_handler(
                     servicer.GetFullTick,
                     request_deserializer=xtquant__pb2.GetFullTickRequest.FromString,
@@ -243,6 +353,11 @@ def add_MarketDataServiceServicer_to_server(servicer, server):
                     request_deserializer=xtquant__pb2.GetValuationMetricsRequest.FromString,
                     response_serializer=xtquant__pb2.GetValuationMetricsResponse.SerializeToString,
             ),
+            'GetServerMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServerMetrics,
+                    request_deserializer=xtquant__pb2.Empty.FromString,
+                    response_serializer=xtquant__pb2.ServerMetrics.SerializeToString,
+            ),
             'SubscribeQuote': grpc.unary_stream_rpc_method_handler(
                     servicer.SubscribeQuote,
                     request_deserializer=xtquant__pb2.SubscribeQuoteRequest.FromString,
@@ -253,6 +368,11 @@ def add_MarketDataServiceServicer_to_server(servicer, server):
                     request_deserializer=xtquant__pb2.SubscribeWholeQuoteRequest.FromString,
                     response_serializer=xtquant__pb2.TickSnapshot.SerializeToString,
             ),
+            'SubscribeWholeQuoteBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.SubscribeWholeQuoteBatch,
+                    request_deserializer=xtquant__pb2.SubscribeWholeQuoteBatchRequest.FromString,
+                    response_serializer=xtquant__pb2.TickBatch.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'xtquant.MarketDataService', rpc_method_handlers)
@@ -294,6 +414,141 @@ class MarketDataService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamMarketData(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/xtquant.MarketDataService/StreamMarketData',
+            xtquant__pb2.GetMarketDataRequest.SerializeToString,
+            xtquant__pb2.GetMarketDataResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMarketDataBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xtquant.MarketDataService/GetMarketDataBatch',
+            xtquant__pb2.GetMarketDataBatchRequest.SerializeToString,
+            xtquant__pb2.GetMarketDataBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetCrossSection(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xtquant.MarketDataService/GetCrossSection',
+            xtquant__pb2.GetCrossSectionRequest.SerializeToString,
+            xtquant__pb2.GetMarketDataResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ComputeIndicators(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xtquant.MarketDataService/ComputeIndicators',
+            xtquant__pb2.ComputeIndicatorsRequest.SerializeToString,
+            xtquant__pb2.ComputeIndicatorsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamTickHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/xtquant.MarketDataService/StreamTickHistory',
+            xtquant__pb2.StreamTickHistoryRequest.SerializeToString,
+            xtquant__pb2.TickChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetFullTick(request,
             target,
@@ -537,6 +792,33 @@ class MarketDataService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetServerMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xtquant.MarketDataService/GetServerMetrics',
+            xtquant__pb2.Empty.SerializeToString,
+            xtquant__pb2.ServerMetrics.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SubscribeQuote(request,
             target,
@@ -591,6 +873,33 @@ class MarketDataService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SubscribeWholeQuoteBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/xtquant.MarketDataService/SubscribeWholeQuoteBatch',
+            xtquant__pb2.SubscribeWholeQuoteBatchRequest.SerializeToString,
+            xtquant__pb2.TickBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
 
 class TradingServiceStub(object):
     """Trading service — wraps xtquant.xttrader
@@ -0,0 +1,100 @@
+"""Byte-budgeted LRU cache of converted kline arrays
+
+Entries are keyed on (stock_code, period, fill_data) and hold the unadjusted
+local history of one stock as per-column NumPy arrays (see server.columnar);
+adjusted series are derived on read (see server.dividends). Range and count requests are answered by slicing.
+
+Each entry is fresh until the bar that was forming at fetch time closes.
+Expired entries are kept (subject to LRU eviction) so the caller can fetch
+only the bars after the last cached timestamp and append them with
+`merge_tail`, instead of refetching the whole history.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    arrays: dict[str, np.ndarray]
+    expires_at: float
+    nbytes: int
+
+
+class BarCache:
+    """Thread-safe LRU cache bounded by the total bytes of cached arrays."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: tuple, now: float) -> tuple[dict[str, np.ndarray] | None, bool]:
+        """Return (arrays, fresh) for `key`; arrays is None if not cached.
+
+        Stale entries (fresh=False) are returned for incremental refresh.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.expires_at <= now:
+                self.stale_hits += 1
+                return entry.arrays, False
+            self.hits += 1
+            return entry.arrays, True
+
+    def put(self, key: tuple, arrays: dict[str, np.ndarray], expires_at: float):
+        """Insert or replace an entry, evicting least-recently-used ones as needed."""
+        nbytes = sum(arr.nbytes for arr in arrays.values())
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                return
+            while self._bytes + nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = _Entry(arrays, expires_at, nbytes)
+            self._bytes += nbytes
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _drop(self, key: tuple):
+        self._bytes -= self._entries.pop(key).nbytes
+
+
+def merge_tail(cached: dict[str, np.ndarray], tail: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Append freshly fetched bars to cached arrays.
+
+    Cached rows at or after the first tail timestamp are replaced, so a bar
+    that was still forming when it was cached is overwritten by its final
+    version.
+    """
+    if len(tail["time"]) == 0:
+        return cached
+    cut = int(np.searchsorted(cached["time"], tail["time"][0], side="left"))
+    return {name: np.concatenate([arr[:cut], tail[name]]) for name, arr in cached.items()}
@@ -0,0 +1,49 @@
+"""Singleflight coalescing of identical concurrent requests
+
+When many clients send the same request at the same moment (the 09:30 open,
+bar boundaries), only the first caller — the leader — runs the handler; the
+others join its in-flight call and receive the same outcome. Keys are built
+by the caller, e.g. from a deterministic serialization of the request.
+"""
+
+import threading
+
+
+class _Call:
+    """One in-flight call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.status = None  # (grpc.StatusCode, details) set by the leader on abort
+        self.waiters = 0
+
+
+class Singleflight:
+    """Registry of in-flight calls keyed on request identity."""
+
+    def __init__(self):
+        self._calls: dict[object, _Call] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key) -> tuple[_Call, bool]:
+        """Return (call, is_leader). The leader must run the work and call `finish`."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def finish(self, key, call: _Call):
+        """Publish the leader's outcome; later requests with `key` start a new call."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,433 @@
+"""Columnar kline helpers — xtdata DataFrame -> NumPy arrays -> protobuf
+
+xtdata returns one DataFrame per instrument. The market-data RPCs first
+convert each frame into a dict of typed NumPy arrays (one per response
+column), then pack those arrays into GetMarketDataResponse messages.
+Keeping the intermediate form as plain arrays lets the unary and streaming
+paths share the conversion and slice rows without going back to pandas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pb import xtquant_pb2
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: pip install "xtquant-grpc[arrow]"
+    pa = None
+
+# Response column -> (xtdata DataFrame column, dtype)
+# Note: "settelmentPrice" is xtdata's own (misspelled) column name.
+KLINE_COLUMNS = {
+    "time": ("time", np.int64),
+    "open": ("open", np.float64),
+    "high": ("high", np.float64),
+    "low": ("low", np.float64),
+    "close": ("close", np.float64),
+    "volume": ("volume", np.float64),
+    "amount": ("amount", np.float64),
+    "pre_close": ("preClose", np.float64),
+    "suspend_flag": ("suspendFlag", np.int32),
+    "settlement_price": ("settelmentPrice", np.float64),
+    "open_interest": ("openInterest", np.float64),
+}
+
+# Columns where xtdata may return NaN and clients expect 0
+_ZERO_FILLED = {"pre_close", "suspend_flag", "settlement_price", "open_interest"}
+
+# Supported GetMarketDataRequest.encoding values ("" means "repeated")
+#   repeated — one proto repeated field per column
+#   packed   — raw little-endian buffers in GetMarketDataResponse.packed
+#   arrow    — one Arrow IPC stream in GetMarketDataResponse.arrow_ipc (needs pyarrow)
+#   compact  — per-stock CompactKlines blocks: delta-of-delta time, prices in ticks
+KLINE_ENCODINGS = ("repeated", "packed", "arrow", "compact")
+
+# encoding="compact": columns sent as integer tick counts / rounded integers
+_TICK_COLUMNS = ("open", "high", "low", "close", "pre_close", "settlement_price")
+_ROUNDED_COLUMNS = ("volume", "open_interest")
+
+
+def arrow_available() -> bool:
+    """Whether the optional pyarrow dependency is installed."""
+    return pa is not None
+
+
+def kline_fields(names, include_time: bool = False) -> tuple[str, ...]:
+    """Validate a column projection; returns names in KLINE_COLUMNS order.
+
+    An empty projection selects every column. Raises ValueError for unknown names.
+    """
+    unknown = [name for name in names if name not in KLINE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown kline fields {unknown}, expected any of {list(KLINE_COLUMNS)}")
+    if not names:
+        return tuple(KLINE_COLUMNS)
+    wanted = set(names) | ({"time"} if include_time else set())
+    return tuple(name for name in KLINE_COLUMNS if name in wanted)
+
+
+def xtdata_field_list(fields: tuple[str, ...]) -> list[str]:
+    """get_market_data_ex field_list for a projection ([] = all columns)."""
+    if len(fields) == len(KLINE_COLUMNS):
+        return []
+    return [KLINE_COLUMNS[name][0] for name in fields]
+
+
+def frame_to_arrays(df: pd.DataFrame, fields: tuple[str, ...] = tuple(KLINE_COLUMNS)) -> dict[str, np.ndarray]:
+    """Convert one stock's kline DataFrame into per-column NumPy arrays.
+
+    Only `fields` are converted. Uses the raw millisecond timestamps from the
+    'time' column. DO NOT use df.index — it contains UTC dates which are off
+    by 1 day for Chinese stocks. Columns missing from the frame are zero-filled.
+    """
+    n = len(df)
+    arrays = {}
+    for name in fields:
+        src, dtype = KLINE_COLUMNS[name]
+        if src not in df.columns:
+            arrays[name] = np.zeros(n, dtype=dtype)
+            continue
+        col = df[src]
+        if name in _ZERO_FILLED:
+            col = col.fillna(0)
+        arrays[name] = col.to_numpy(dtype=dtype)
+    return arrays
+
+
+def row_count(arrays: dict[str, np.ndarray]) -> int:
+    """Number of rows held in a per-column array dict."""
+    return len(arrays["time"])
+
+
+def slice_rows(arrays: dict[str, np.ndarray], start: int, stop: int) -> dict[str, np.ndarray]:
+    """Slice every column to rows [start, stop) (NumPy views, no copy)."""
+    return {name: arr[start:stop] for name, arr in arrays.items()}
+
+
+def slice_time_range(
+    arrays: dict[str, np.ndarray], start_ms: int | None, end_ms: int | None, count: int,
+) -> dict[str, np.ndarray]:
+    """Rows with start_ms <= time <= end_ms (None = open bound), last `count` if count > 0.
+
+    Mirrors get_market_data_ex range/count semantics on time-sorted arrays.
+    """
+    t = arrays["time"]
+    lo = 0 if start_ms is None else int(np.searchsorted(t, start_ms, side="left"))
+    hi = len(t) if end_ms is None else int(np.searchsorted(t, end_ms, side="right"))
+    if count > 0:
+        lo = max(lo, hi - count)
+    return slice_rows(arrays, lo, max(lo, hi))
+
+
+def delta_of_delta(time: np.ndarray) -> np.ndarray:
+    """[t0, t1 - t0, second differences...] — near-zero for regularly spaced bars."""
+    return np.r_[time[:1], np.diff(time[:2]), np.diff(time, 2)]
+
+
+def undo_delta_of_delta(values) -> np.ndarray:
+    """Inverse of delta_of_delta."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return values
+    return np.r_[values[:1], values[0] + np.cumsum(np.cumsum(values[1:]))]
+
+
+def _tick_counts(columns: dict[str, np.ndarray], tick: float | None) -> tuple[int, dict[str, np.ndarray]] | None:
+    """(base, {name: ticks - base}) for price columns, or None if not all tick-aligned."""
+    if not tick or tick <= 0 or not columns:
+        return None
+    scaled = {name: arr / tick for name, arr in columns.items()}
+    ticks = {name: np.rint(arr) for name, arr in scaled.items()}
+    # NaN fails the comparison as well, so gaps also fall back to raw doubles
+    if not all(np.all(np.abs(scaled[name] - ticks[name]) < 1e-6) for name in columns):
+        return None
+    first = ticks["close"] if "close" in ticks else next(iter(ticks.values()))
+    base = int(first[0])
+    return base, {name: arr.astype(np.int64) - base for name, arr in ticks.items()}
+
+
+def decode_compact(block) -> dict[str, np.ndarray]:
+    """CompactKlines message -> per-column arrays (the inverse of encoding="compact")."""
+    arrays = {}
+    if block.time:
+        arrays["time"] = undo_delta_of_delta(block.time)
+    for name in _TICK_COLUMNS:
+        if block.price_tick:
+            values = getattr(block, name)
+            if values:
+                arrays[name] = (block.price_base + np.asarray(values, dtype=np.int64)) * block.price_tick
+        elif getattr(block.raw, name):
+            arrays[name] = np.frombuffer(getattr(block.raw, name), "<f8")
+    for name in _ROUNDED_COLUMNS + ("amount", "suspend_flag"):
+        values = getattr(block, name)
+        if values:
+            arrays[name] = np.asarray(values, dtype=KLINE_COLUMNS[name][1])
+    return arrays
+
+
+class KlineColumns:
+    """Accumulates per-stock arrays and builds one GetMarketDataResponse.
+
+    Rows for a stock are always contiguous, in the order they were added,
+    so with `dict_codes` the code column collapses to one run per stock.
+    `price_tick(code)` supplies the instrument's price tick for encoding="compact".
+    """
+
+    def __init__(
+        self, encoding: str = "repeated", dict_codes: bool = False, fields: tuple[str, ...] = (),
+        price_tick=None,
+    ):
+        self.encoding = encoding
+        self.dict_codes = dict_codes
+        self.fields = fields or tuple(KLINE_COLUMNS)
+        self.price_tick = price_tick
+        self._codes: list[tuple[str, int]] = []
+        self._parts: dict[str, list[np.ndarray]] = {name: [] for name in self.fields}
+        self.rows = 0
+
+    def add(self, code: str, arrays: dict[str, np.ndarray]):
+        n = row_count(arrays)
+        if n == 0:
+            return
+        self._codes.append((code, n))
+        for name, parts in self._parts.items():
+            parts.append(arrays[name])
+        self.rows += n
+
+    def build(self) -> xtquant_pb2.GetMarketDataResponse:
+        if self.encoding == "arrow":
+            return xtquant_pb2.GetMarketDataResponse(arrow_ipc=self._build_arrow())
+        if self.encoding == "compact":
+            return self._build_compact()
+
+        resp = xtquant_pb2.GetMarketDataResponse()
+        if self.dict_codes:
+            resp.code_table.extend(code for code, _ in self._codes)
+            resp.code_rows.extend(n for _, n in self._codes)
+        else:
+            for code, n in self._codes:
+                resp.stock_code.extend([code] * n)
+        for name, parts in self._parts.items():
+            if not parts:
+                continue
+            column = np.concatenate(parts)
+            if self.encoding == "packed":
+                # One buffer copy per column; no per-cell Python objects
+                dtype = np.dtype(KLINE_COLUMNS[name][1]).newbyteorder("<")
+                setattr(resp.packed, name, column.astype(dtype, copy=False).tobytes())
+            else:
+                getattr(resp, name).extend(column.tolist())
+        return resp
+
+    def _build_compact(self) -> xtquant_pb2.GetMarketDataResponse:
+        """One CompactKlines block per stock; varint-friendly small integers."""
+        resp = xtquant_pb2.GetMarketDataResponse()
+        for i, (code, n) in enumerate(self._codes):
+            columns = {name: self._parts[name][i] for name in self.fields}
+            block = resp.compact.add(stock_code=code, rows=n)
+            if "time" in columns:
+                block.time.extend(delta_of_delta(columns["time"]).tolist())
+
+            prices = {name: columns[name] for name in _TICK_COLUMNS if name in columns}
+            tick = self.price_tick(code) if self.price_tick else None
+            coded = _tick_counts(prices, tick)
+            if coded is not None:
+                block.price_tick = tick
+                block.price_base, ticks = coded
+                for name, values in ticks.items():
+                    getattr(block, name).extend(values.tolist())
+            else:
+                for name, values in prices.items():
+                    setattr(block.raw, name, values.astype("<f8", copy=False).tobytes())
+
+            for name in _ROUNDED_COLUMNS:
+                if name in columns:
+                    getattr(block, name).extend(np.rint(columns[name]).astype(np.int64).tolist())
+            for name in ("amount", "suspend_flag"):
+                if name in columns:
+                    getattr(block, name).extend(columns[name].tolist())
+        return resp
+
+    def _build_arrow(self) -> bytes:
+        """Serialize as an Arrow IPC stream with one record batch per stock.
+
+        stock_code is a dictionary column holding a single entry per batch.
+        """
+        schema = pa.schema(
+            [("stock_code", pa.dictionary(pa.int32(), pa.string()))]
+            + [(name, pa.from_numpy_dtype(KLINE_COLUMNS[name][1])) for name in self.fields]
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for i, (code, n) in enumerate(self._codes):
+                codes = pa.DictionaryArray.from_arrays(
+                    pa.array(np.zeros(n, dtype=np.int32)), pa.array([code]),
+                )
+                columns = [pa.array(self._parts[name][i]) for name in self.fields]
+                writer.write_batch(pa.record_batch([codes] + columns, schema=schema))
+        return sink.getvalue().to_pybytes()
+
+
+# ====================== Tick History ======================
+
+# Order-book levels in xtdata tick frames (bidPrice / askPrice / bidVol / askVol)
+TICK_DEPTH = 5
+
+# TickChunk column -> (xtdata tick column, dtype); depth columns are rows x TICK_DEPTH
+TICK_COLUMNS = {
+    "time": ("time", np.int64),
+    "last_price": ("lastPrice", np.float64),
+    "volume": ("volume", np.float64),
+    "amount": ("amount", np.float64),
+}
+TICK_DEPTH_COLUMNS = {
+    "bid_price": "bidPrice",
+    "bid_volume": "bidVol",
+    "ask_price": "askPrice",
+    "ask_volume": "askVol",
+}
+
+
+def _depth_matrix(values, depth: int = TICK_DEPTH) -> np.ndarray:
+    """Per-row order-book lists -> (rows, depth) float64 matrix.
+
+    Rows with fewer levels are zero-padded and extra levels are dropped.
+    """
+    n = len(values)
+    try:
+        matrix = np.asarray(values, dtype=np.float64)
+        if matrix.shape == (n, depth):
+            return matrix
+    except ValueError:  # ragged rows
+        pass
+    matrix = np.zeros((n, depth))
+    for i, levels in enumerate(values):
+        levels = np.asarray(levels, dtype=np.float64)[:depth]
+        matrix[i, :len(levels)] = levels
+    return matrix
+
+
+def tick_frame_to_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Convert one stock's tick-period DataFrame into per-column NumPy arrays."""
+    n = len(df)
+    arrays = {}
+    for name, (src, dtype) in TICK_COLUMNS.items():
+        arrays[name] = df[src].fillna(0).to_numpy(dtype=dtype) if src in df.columns else np.zeros(n, dtype=dtype)
+    for name, src in TICK_DEPTH_COLUMNS.items():
+        arrays[name] = _depth_matrix(df[src].tolist()) if src in df.columns else np.zeros((n, TICK_DEPTH))
+    return arrays
+
+
+# TickSnapshotColumns column -> (xtdata tick key, dtype), besides the depth columns
+SNAPSHOT_COLUMNS = {
+    "time": ("time", np.int64),
+    "last_price": ("lastPrice", np.float64),
+    "open": ("open", np.float64),
+    "high": ("high", np.float64),
+    "low": ("low", np.float64),
+    "last_close": ("lastClose", np.float64),
+    "volume": ("volume", np.float64),
+    "amount": ("amount", np.float64),
+}
+
+# GetFullTickRequest.encoding values ("" means "map")
+SNAPSHOT_ENCODINGS = ("map", "columnar")
+
+# SubscribeWholeQuoteBatchRequest.encoding values ("" means "rows")
+BATCH_ENCODINGS = ("rows", "columnar")
+
+
+def _le_bytes(values: np.ndarray) -> bytes:
+    return np.ascontiguousarray(values.astype(values.dtype.newbyteorder("<"), copy=False)).tobytes()
+
+
+def snapshot_columns(codes: list[str], ticks: list[dict], received_at) -> xtquant_pb2.TickSnapshotColumns:
+    """xtdata full-tick dicts -> one TickSnapshotColumns message.
+
+    Each field is gathered in a single pass over the ticks and written as one
+    buffer; depth lists become zero-padded rows x TICK_DEPTH matrices.
+    """
+    n = len(ticks)
+    message = xtquant_pb2.TickSnapshotColumns(stock_code=codes, depth=TICK_DEPTH)
+    for name, (src, dtype) in SNAPSHOT_COLUMNS.items():
+        column = np.fromiter((tick.get(src) or 0 for tick in ticks), dtype=dtype, count=n)
+        setattr(message, name, _le_bytes(column))
+    for name, src in TICK_DEPTH_COLUMNS.items():
+        setattr(message, name, _le_bytes(_depth_matrix([tick.get(src) or () for tick in ticks])))
+    message.received_at = _le_bytes(np.asarray(received_at, dtype=np.int64).reshape(n))
+    return message
+
+
+class TickColumns:
+    """Accumulates per-stock tick arrays and builds one TickChunk.
+
+    Stock codes are always dictionary-encoded (code_table + code_rows).
+    """
+
+    def __init__(self):
+        self._codes: list[tuple[str, int]] = []
+        self._parts: dict[str, list[np.ndarray]] = {name: [] for name in (*TICK_COLUMNS, *TICK_DEPTH_COLUMNS)}
+        self.rows = 0
+
+    def add(self, code: str, arrays: dict[str, np.ndarray]):
+        n = row_count(arrays)
+        if n == 0:
+            return
+        self._codes.append((code, n))
+        for name, parts in self._parts.items():
+            parts.append(arrays[name])
+        self.rows += n
+
+    def build(self) -> xtquant_pb2.TickChunk:
+        chunk = xtquant_pb2.TickChunk(
+            code_table=[code for code, _ in self._codes],
+            code_rows=[n for _, n in self._codes],
+            depth=TICK_DEPTH,
+        )
+        for name, parts in self._parts.items():
+            if not parts:
+                continue
+            dtype = TICK_COLUMNS[name][1] if name in TICK_COLUMNS else np.float64
+            column = np.concatenate(parts).astype(np.dtype(dtype).newbyteorder("<"), copy=False)
+            setattr(chunk, name, np.ascontiguousarray(column).tobytes())
+        return chunk
+
+
+# ====================== Financial Tables ======================
+
+
+def _financial_frame_to_arrow(code: str, df: pd.DataFrame) -> "pa.Table":
+    """One stock's financial table -> Arrow table with a leading stock_code column."""
+    df = df.reset_index(drop=True)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns: fall back to their string form, like the JSON path
+        table = pa.Table.from_pandas(
+            df.apply(lambda col: col.astype(str) if col.dtype == object else col),
+            preserve_index=False,
+        )
+    return table.add_column(0, "stock_code", pa.array([code] * len(df), pa.string()))
+
+
+def financial_to_arrow(data: dict) -> dict[str, bytes]:
+    """xtdata.get_financial_data result -> {table name: Arrow IPC stream}.
+
+    Each table becomes one IPC stream with one record batch per stock.
+    Column types are promoted across stocks so the stream has a single schema.
+    """
+    per_table: dict[str, list] = {}
+    for code, tables in data.items():
+        for name, df in tables.items():
+            if hasattr(df, "columns"):
+                per_table.setdefault(name, []).append(_financial_frame_to_arrow(code, df))
+
+    result = {}
+    for name, tables in per_table.items():
+        table = pa.concat_tables(tables, promote_options="permissive")
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        result[name] = sink.getvalue().to_pybytes()
+    return result
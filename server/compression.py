@@ -0,0 +1,112 @@
+"""Per-response gRPC compression for large market-data replies
+
+The server is created without a default compression algorithm; instead each
+large-response handler asks a ResponseCompressor whether the message it is
+about to send should be compressed. Replies below `min_bytes` go out
+uncompressed, and tick-snapshot streams never call it, so latency-sensitive
+paths pay no compression cost.
+
+With the default "none" nothing is measured, so responses are not
+serialized an extra time. gRPC compresses inside the C core, so its cost is
+not observable directly. Every `sample_every`-th compressed response is also
+deflated with zlib (the codec behind both gzip and deflate) on a background
+thread to estimate the ratio and CPU time per method; a sample is skipped
+while the previous one is still running.
+"""
+
+import itertools
+import threading
+import time
+import zlib
+from concurrent import futures
+
+import grpc
+
+from .metrics import Metrics
+
+# Supported --compression values. grpc core ships gzip and deflate only;
+# zstd is not available as a gRPC message encoding.
+COMPRESSION_ALGORITHMS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+
+class ResponseCompressor:
+    """Chooses compression per response and records per-method metrics."""
+
+    def __init__(self, algorithm: str = "none", min_bytes: int = 64 * 1024,
+                 metrics: Metrics | None = None, sample_every: int = 16):
+        if algorithm not in COMPRESSION_ALGORITHMS:
+            raise ValueError(f"Unknown compression '{algorithm}', expected one of {list(COMPRESSION_ALGORITHMS)}")
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.metrics = metrics or Metrics()
+        self.sample_every = max(1, sample_every)
+        self._compressed = itertools.count()
+        self._sampler = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="compression-sample")
+        self._sampling = threading.Lock()
+
+    def start_stream(self, context):
+        """Enable compression on a server stream; call before its first message.
+
+        gRPC only honours set_compression before the first message, so a
+        stream is compressed from the start and `apply(streaming=True)`
+        disables it for each chunk below `min_bytes`.
+        """
+        if self.algorithm != "none":
+            context.set_compression(COMPRESSION_ALGORITHMS[self.algorithm])
+
+    def apply(self, context, method: str, response, streaming: bool = False):
+        """Enable or skip compression for `response` before it is sent.
+
+        With "none" this returns at once. Streams must have called
+        `start_stream` first.
+        """
+        if self.algorithm == "none":
+            return
+        size = response.ByteSize()
+        prefix = f"compression.{method}"
+        self.metrics.add(f"{prefix}.responses")
+        self.metrics.add(f"{prefix}.bytes", size)
+        if size < self.min_bytes:
+            if streaming:
+                context.disable_next_message_compression()
+            return
+
+        if not streaming:
+            context.set_compression(COMPRESSION_ALGORITHMS[self.algorithm])
+        self.metrics.add(f"{prefix}.compressed")
+        self.metrics.add(f"{prefix}.compressed_bytes", size)
+        if next(self._compressed) % self.sample_every == 0 and self._sampling.acquire(blocking=False):
+            self._sampler.submit(self._sample, prefix, response)
+
+    def close(self):
+        """Wait for a running sample and stop the sampling thread."""
+        self._sampler.shutdown(wait=True)
+
+    def _sample(self, prefix: str, response):
+        try:
+            raw = response.SerializeToString()
+            start = time.thread_time()
+            out = zlib.compress(raw)
+            self.metrics.add(f"{prefix}.sample_cpu_seconds", time.thread_time() - start)
+            self.metrics.add(f"{prefix}.sample_bytes_in", len(raw))
+            self.metrics.add(f"{prefix}.sample_bytes_out", len(out))
+        finally:
+            self._sampling.release()
+
+
+def compression_ratios(values: dict[str, float]) -> dict[str, float]:
+    """Per-method ratio and CPU seconds per MB derived from sampled counters."""
+    derived = {}
+    for name, bytes_in in values.items():
+        if not (name.startswith("compression.") and name.endswith(".sample_bytes_in")) or not bytes_in:
+            continue
+        prefix = name[: -len(".sample_bytes_in")]
+        bytes_out = values.get(f"{prefix}.sample_bytes_out", 0)
+        if bytes_out:
+            derived[f"{prefix}.ratio"] = bytes_in / bytes_out
+        derived[f"{prefix}.cpu_seconds_per_mb"] = values.get(f"{prefix}.sample_cpu_seconds", 0) / (bytes_in / 1e6)
+    return derived
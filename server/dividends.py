@@ -0,0 +1,106 @@
+"""Server-side dividend adjustment of cached raw klines
+
+The kline cache stores unadjusted bars only. Adjusted series are derived from
+them with the per-stock ex-rights records of xtdata.get_divid_factors, using
+the same rules as xtdata:
+
+    front        v' = (v - interest + allotPrice * allotNum)
+                      / (1 + stockBonus + stockGift + allotNum)
+                 for every ex-date after the bar, oldest first
+    back         the inverse map, for every ex-date up to the bar, newest first
+    front_ratio  v' = v / dr  for every ex-date after the bar
+    back_ratio   v' = v * dr  for every ex-date up to the bar
+
+Each per-event map is affine (v' = a * v + b), so the composition over any
+run of events is affine too. The composed coefficients are computed once per
+event boundary and applied to all bars with a searchsorted lookup.
+"""
+
+import numpy as np
+
+from .periods import parse_time_ms
+
+# Supported GetMarketDataRequest.dividend_type values ("" means "none")
+DIVIDEND_TYPES = ("none", "front", "back", "front_ratio", "back_ratio")
+
+# Price columns rescaled by adjustment; volume / amount are left as traded
+ADJUSTED_COLUMNS = ("open", "high", "low", "close", "pre_close")
+
+
+def _column(df, name: str, n: int) -> np.ndarray:
+    if name not in df.columns:
+        return np.zeros(n)
+    return df[name].fillna(0).to_numpy(dtype=np.float64)
+
+
+def factors_from_frame(df) -> dict[str, np.ndarray]:
+    """xtdata.get_divid_factors DataFrame -> per-event arrays sorted by ex-date.
+
+    Keys: time (ex-date, epoch ms), scale (1 + bonus + gift + allotment
+    shares per share), cash (interest - allotment price * shares) and dr.
+    """
+    n = 0 if df is None else len(df)
+    if n == 0:
+        empty = np.zeros(0)
+        return {"time": np.zeros(0, dtype=np.int64), "scale": empty, "cash": empty, "dr": empty}
+    if "time" in df.columns:
+        time = df["time"].to_numpy(dtype=np.int64)
+    else:
+        time = np.array([parse_time_ms(str(ix)) for ix in df.index], dtype=np.int64)
+    allot_num = _column(df, "allotNum", n)
+    factors = {
+        "time": time,
+        "scale": 1.0 + _column(df, "stockBonus", n) + _column(df, "stockGift", n) + allot_num,
+        "cash": _column(df, "interest", n) - allot_num * _column(df, "allotPrice", n),
+        "dr": _column(df, "dr", n) if "dr" in df.columns else np.ones(n),
+    }
+    order = np.argsort(factors["time"], kind="stable")
+    return {name: arr[order] for name, arr in factors.items()}
+
+
+def _coefficients(factors: dict[str, np.ndarray], dividend_type: str) -> tuple[np.ndarray, np.ndarray]:
+    """Composed (a, b) for each event boundary k = 0..K.
+
+    front*: boundary k holds the composition of events k..K-1 (bars before event k)
+    back*:  boundary k holds the composition of events 0..k-1 (bars on or after event k-1)
+    """
+    k = len(factors["time"])
+    a, b = np.ones(k + 1), np.zeros(k + 1)
+    if dividend_type == "front_ratio":
+        a[:k] = np.cumprod((1.0 / factors["dr"])[::-1])[::-1]
+    elif dividend_type == "back_ratio":
+        a[1:] = np.cumprod(factors["dr"])
+    elif dividend_type == "front":
+        # S_j = S_{j+1} o f_j with f_j(v) = (v - cash_j) / scale_j
+        for j in range(k - 1, -1, -1):
+            a[j] = a[j + 1] / factors["scale"][j]
+            b[j] = b[j + 1] - a[j + 1] * factors["cash"][j] / factors["scale"][j]
+    elif dividend_type == "back":
+        # P_i = P_{i-1} o g_i with g_i(v) = v * scale_i + cash_i
+        for i in range(1, k + 1):
+            a[i] = a[i - 1] * factors["scale"][i - 1]
+            b[i] = a[i - 1] * factors["cash"][i - 1] + b[i - 1]
+    return a, b
+
+
+def adjust(arrays: dict[str, np.ndarray], factors: dict[str, np.ndarray], dividend_type: str) -> dict[str, np.ndarray]:
+    """Apply `dividend_type` adjustment to raw kline arrays.
+
+    Returns a new dict sharing the unadjusted columns; the input is not modified.
+    """
+    if dividend_type == "none" or len(factors["time"]) == 0 or len(arrays["time"]) == 0:
+        return arrays
+    a, b = _coefficients(factors, dividend_type)
+    # Events strictly after a bar apply to it for front; events at or before it for back
+    boundary = np.searchsorted(factors["time"], arrays["time"], side="right")
+    a, b = a[boundary], b[boundary]
+    out = dict(arrays)
+    for name in ADJUSTED_COLUMNS:
+        if name in arrays:
+            column = arrays[name]
+            adjusted = column * a + b
+            if name == "pre_close":
+                # Keep the zero-filled "no previous close" marker
+                adjusted[column == 0] = 0.0
+            out[name] = adjusted
+    return out
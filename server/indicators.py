@@ -0,0 +1,116 @@
+"""Technical indicators computed on the server from kline arrays
+
+Each indicator takes the per-column arrays of one stock (see server.columnar)
+and returns one or more equally long float64 series. Moving averages and
+Wilder smoothing use pandas' rolling / ewm kernels, so every series is
+computed in a single vectorized pass.
+
+    sma  [window=20]                  simple moving average of close
+    ema  [window=20]                  exponential moving average of close (span=window)
+    rsi  [window=14]                  Wilder RSI of close
+    macd [fast=12, slow=26, signal=9] .dif, .dea and .macd = 2 * (dif - dea)
+    atr  [window=14]                  Wilder average true range
+    boll [window=20, k=2]             .mid, .upper, .lower (population std)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _ema(values: pd.Series, span: float) -> pd.Series:
+    return values.ewm(span=span, adjust=False).mean()
+
+
+def _wilder(values: pd.Series, window: float) -> pd.Series:
+    return values.ewm(alpha=1.0 / window, adjust=False).mean()
+
+
+def _sma(arrays, window):
+    return {"": pd.Series(arrays["close"]).rolling(int(window)).mean()}
+
+
+def _ema_indicator(arrays, window):
+    return {"": _ema(pd.Series(arrays["close"]), window)}
+
+
+def _rsi(arrays, window):
+    change = pd.Series(arrays["close"]).diff()
+    gain = _wilder(change.clip(lower=0), window)
+    loss = _wilder(-change.clip(upper=0), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses in the window: RSI is 100 by definition
+    return {"": rsi.where(loss != 0, 100.0).where(change.notna())}
+
+
+def _macd(arrays, fast, slow, signal):
+    close = pd.Series(arrays["close"])
+    dif = _ema(close, fast) - _ema(close, slow)
+    dea = _ema(dif, signal)
+    return {".dif": dif, ".dea": dea, ".macd": 2.0 * (dif - dea)}
+
+
+def _atr(arrays, window):
+    high, low = pd.Series(arrays["high"]), pd.Series(arrays["low"])
+    prev_close = pd.Series(arrays["close"]).shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    return {"": _wilder(true_range, window)}
+
+
+def _boll(arrays, window, k):
+    close = pd.Series(arrays["close"]).rolling(int(window))
+    mid, std = close.mean(), close.std(ddof=0)
+    return {".mid": mid, ".upper": mid + k * std, ".lower": mid - k * std}
+
+
+# name -> (function, default params, kline columns needed)
+INDICATORS = {
+    "sma": (_sma, (20,), ("close",)),
+    "ema": (_ema_indicator, (20,), ("close",)),
+    "rsi": (_rsi, (14,), ("close",)),
+    "macd": (_macd, (12, 26, 9), ("close",)),
+    "atr": (_atr, (14,), ("high", "low", "close")),
+    "boll": (_boll, (20, 2), ("close",)),
+}
+
+
+def resolve(name: str, params) -> tuple[str, tuple]:
+    """Validate an indicator spec; returns (name, params with defaults filled in).
+
+    Raises ValueError for unknown indicators or bad parameters.
+    """
+    name = name.lower()
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator '{name}', expected one of {list(INDICATORS)}")
+    defaults = INDICATORS[name][1]
+    if len(params) > len(defaults):
+        raise ValueError(f"Indicator '{name}' takes at most {len(defaults)} parameters")
+    params = tuple(params) + defaults[len(params):]
+    if any(p <= 0 for p in params):
+        raise ValueError(f"Indicator '{name}' parameters must be positive, got {list(params)}")
+    return name, params
+
+
+def label(name: str, params: tuple) -> str:
+    """Series name prefix, e.g. "sma_20", "boll_20_2"."""
+    return "_".join([name] + [f"{p:g}" for p in params])
+
+
+def warmup_bars(name: str, params: tuple) -> int:
+    """Bars needed before the first value is stable.
+
+    Rolling windows need `window` bars; exponential smoothing is given five
+    time constants, after which the seed's weight is below 1%.
+    """
+    if name in ("sma", "boll"):
+        return int(params[0])
+    if name == "macd":
+        return int(5 * params[1] + 5 * params[2])
+    return int(5 * params[0])
+
+
+def compute(arrays: dict[str, np.ndarray], name: str, params: tuple) -> dict[str, np.ndarray]:
+    """{series label: values} for one resolved indicator over one stock's bars."""
+    prefix = label(name, params)
+    series = INDICATORS[name][0](arrays, *params)
+    return {prefix + suffix: values.to_numpy(dtype=np.float64) for suffix, values in series.items()}
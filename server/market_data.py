@@ -10,15 +10,46 @@ import logging
 import threading
 import functools
 import time
+from concurrent import futures
 
 import grpc
-import pandas as pd
 from xtquant import xtdata
 
 from pb import xtquant_pb2, xtquant_pb2_grpc
+from .bar_cache import BarCache, merge_tail
+from .coalesce import Singleflight
+from .columnar import (
+    BATCH_ENCODINGS, KLINE_ENCODINGS, SNAPSHOT_ENCODINGS, KlineColumns, TickColumns, arrow_available, financial_to_arrow,
+    frame_to_arrays, kline_fields, row_count, slice_rows, slice_time_range, snapshot_columns,
+    tick_frame_to_arrays, xtdata_field_list,
+)
+from .compression import ResponseCompressor, compression_ratios
+from . import indicators
+from .dividends import DIVIDEND_TYPES, adjust, factors_from_frame
+from .metrics import Metrics
+from .mirror import BarMirror
+from .periods import (
+    SESSIONS, format_time_ms, intraday_minutes, last_closed_day, next_bar_close, next_session_open, parse_time_ms,
+    session_bar_closes,
+)
+from .quote_hub import QuoteHub
+from .resample import resample, resample_plan
+from .stream_buffer import OVERFLOW_POLICIES, StreamBuffer
+from .tick_table import TickEntry, TickTable
 
 logger = logging.getLogger(__name__)
 
+# StreamMarketData defaults (overridable per request)
+_DEFAULT_CHUNK_ROWS = 100_000
+_DEFAULT_CHUNK_STOCKS = 50
+
+# Recent bars kept per shared SubscribeQuote (code, period) subscription
+_QUOTE_BUFFER_BARS = 1000
+
+# Concurrent sections of one GetMarketDataBatch call. A separate pool from the
+# fetch pool, since each section may itself wait on fetch-pool shards.
+_BATCH_WORKERS = 4
+
 
 def _xtdata_retry(max_retries=2, retry_delay=3):
     """Decorator that catches xtdata connection errors and retries.
@@ -59,43 +90,147 @@ def _xtdata_retry(max_retries=2, retry_delay=3):
     return decorator
 
 
+def _coalesced(compress: bool = True):
+    """Decorator that coalesces identical concurrent unary requests (see server.coalesce).
+
+    Requests are identical when method name and deterministic serialization
+    match. Only the leader runs the handler; followers wait and return the
+    same response object, or abort with the leader's status code and details.
+    With `compress`, followers apply the response compressor to their own
+    call, as the leader's handler did to its call.
+    """
+    def decorator(func):
+        method = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, request, context):
+            if self._singleflight is None:
+                return func(self, request, context)
+            key = (method, request.SerializeToString(deterministic=True))
+            call, leader = self._singleflight.join(key)
+            if leader:
+                self._metrics.add(f"coalesce.{method}.leaders")
+                try:
+                    call.result = func(self, request, context)
+                    return call.result
+                except Exception as e:
+                    call.error = e
+                    call.status = (context.code(), context.details())
+                    raise
+                finally:
+                    self._singleflight.finish(key, call)
+
+            self._metrics.add(f"coalesce.{method}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                code, details = call.status
+                if code is not None and code != grpc.StatusCode.OK:
+                    context.abort(code, details.decode() if isinstance(details, bytes) else details or "")
+                raise call.error
+            if compress:
+                self._compressor.apply(context, method, call.result)
+            return call.result
+        return wrapper
+    return decorator
+
+
 # ====================== Data Conversion Helpers ======================
 
 
-def _append_df_columns(code: str, df: pd.DataFrame, cols: dict):
-    """Append one stock's DataFrame rows into the columnar response dict.
+def _group_by_last_time(last: dict[str, int]) -> dict[int, list[str]]:
+    """{last bar time: codes} of stocks to refresh from their last bar on."""
+    groups: dict[int, list[str]] = {}
+    for code, since in last.items():
+        groups.setdefault(since, []).append(code)
+    return groups
+
+
+def _native_count(count: int, factor: int, minutes: int | None) -> int:
+    """Native bars to fetch for the last `count` resampled bars, plus a spare.
 
-    Uses vectorized pandas operations instead of row-by-row iteration.
+    Intraday buckets do not all hold `factor` native bars (session ends cut
+    them short, call-auction bars join the first one), so whole trading days
+    are fetched, one more than needed: the first, partially fetched day is
+    then never among the `count` returned. Multi-day buckets hold at most
+    `factor` daily bars, so one spare bucket is enough.
     """
-    n = len(df)
-    if n == 0:
-        return
-
-    cols["stock_code"].extend([code] * n)
-    # Pass raw millisecond timestamps from the 'time' column directly.
-    # DO NOT use df.index — it contains UTC dates which are off by 1 day
-    # for Chinese stocks.  Let the client convert to local time.
-    cols["time"].extend(df["time"].astype(int).tolist())
-    cols["open"].extend(df["open"].astype(float).tolist())
-    cols["high"].extend(df["high"].astype(float).tolist())
-    cols["low"].extend(df["low"].astype(float).tolist())
-    cols["close"].extend(df["close"].astype(float).tolist())
-    cols["volume"].extend(df["volume"].astype(float).tolist())
-    cols["amount"].extend(df["amount"].astype(float).tolist())
-    cols["pre_close"].extend(df["preClose"].astype(float).fillna(0).tolist())
-    cols["suspend_flag"].extend(df["suspendFlag"].fillna(0).astype(int).tolist())
-    cols["settlement_price"].extend(
-        df["settelmentPrice"].astype(float).fillna(0).tolist() if "settelmentPrice" in df.columns else [0.0] * n
-    )
-    cols["open_interest"].extend(
-        df["openInterest"].astype(float).fillna(0).tolist() if "openInterest" in df.columns else [0.0] * n
+    if not minutes:
+        return (count + 1) * factor
+    buckets_per_day = len(session_bar_closes(minutes * factor))
+    native_per_day = len(session_bar_closes(minutes)) + len(SESSIONS)  # + call-auction bars
+    return (-(-count // buckets_per_day) + 1) * native_per_day
+
+
+def _fetch_klines(request, codes: list[str], fields: tuple[str, ...]) -> dict:
+    """Call xtdata.get_market_data_ex with the options of a GetMarketDataRequest.
+
+    Only the xtdata columns behind `fields` are requested.
+    """
+    # proto3 int32 defaults to 0; treat 0 as "fetch all"
+    count = request.count if request.count != 0 else -1
+    return xtdata.get_market_data_ex(
+        xtdata_field_list(fields),
+        codes,
+        period=request.period or "1d",
+        start_time=request.start_time,
+        end_time=request.end_time,
+        count=count,
+        dividend_type=request.dividend_type or "none",
+        fill_data=request.fill_data,
     )
 
 
-def _tick_to_snapshot(code: str, tick: dict) -> xtquant_pb2.TickSnapshot:
+def _kline_builder(request, context, price_tick=None):
+    """Validate the output options of a GetMarketDataRequest.
+
+    Returns a factory for KlineColumns builders with the requested
+    encoding, stock_code layout and column projection.
+    """
+    encoding = request.encoding or "repeated"
+    if encoding not in KLINE_ENCODINGS:
+        context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"Unknown encoding '{request.encoding}', expected one of {list(KLINE_ENCODINGS)}",
+        )
+    if encoding == "arrow" and not arrow_available():
+        context.abort(grpc.StatusCode.FAILED_PRECONDITION, "encoding 'arrow' requires pyarrow on the server")
+    try:
+        fields = kline_fields(request.fields)
+    except ValueError as e:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+    return functools.partial(KlineColumns, encoding, request.dict_stock_code, fields, price_tick)
+
+
+def _row_chunks(groups, chunk_rows: int, new_chunk):
+    """Regroup per-stock arrays into builders of at most `chunk_rows` rows.
+
+    `groups` yields {code: arrays} dicts (one per xtdata fetch); a stock may
+    span consecutive chunks. Yields filled builders (KlineColumns / TickColumns).
+    """
+    chunk = new_chunk()
+    for data in groups:
+        for code, arrays in data.items():
+            start, n = 0, row_count(arrays)
+            while start < n:
+                stop = min(n, start + chunk_rows - chunk.rows)
+                chunk.add(code, slice_rows(arrays, start, stop))
+                start = stop
+                if chunk.rows >= chunk_rows:
+                    yield chunk
+                    chunk = new_chunk()
+    if chunk.rows:
+        yield chunk
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _tick_to_snapshot(code: str, tick: dict, received_at: int = 0) -> xtquant_pb2.TickSnapshot:
     """Convert an xtdata tick dict to a TickSnapshot message."""
     return xtquant_pb2.TickSnapshot(
         stock_code=code,
+        received_at=received_at,
         time=int(tick.get("time", 0)),
         last_price=float(tick.get("lastPrice", 0)),
         open=float(tick.get("open", 0)),
@@ -111,42 +246,577 @@ def _tick_to_snapshot(code: str, tick: dict) -> xtquant_pb2.TickSnapshot:
     )
 
 
+def _quote_bar(code: str, bar: dict) -> xtquant_pb2.KlineBar:
+    """Convert an xtdata subscribe_quote bar dict to a KlineBar message."""
+    return xtquant_pb2.KlineBar(
+        stock_code=code,
+        time=int(bar.get("time", 0)),
+        open=float(bar.get("open", 0)),
+        high=float(bar.get("high", 0)),
+        low=float(bar.get("low", 0)),
+        close=float(bar.get("close", 0)),
+        volume=float(bar.get("volume", 0)),
+        amount=float(bar.get("amount", 0)),
+    )
+
+
+def _quote_bars(key: tuple[str, str], datas: dict) -> list[xtquant_pb2.KlineBar]:
+    """subscribe_quote callback data -> KlineBar messages of the subscribed code."""
+    bars = []
+    for code, items in datas.items():
+        item_list = items if isinstance(items, list) else [items]
+        bars.extend(_quote_bar(code, it) for it in item_list)
+    return bars
+
+
+def _prime_quote_bars(key: tuple[str, str]) -> list[xtquant_pb2.KlineBar]:
+    """Last _QUOTE_BUFFER_BARS bars of a new (code, period) subscription.
+
+    Runs after the upstream subscribe_quote, whose count of
+    _QUOTE_BUFFER_BARS has xtdata supplement that much history locally.
+    """
+    code, period = key
+    try:
+        df = xtdata.get_market_data_ex([], [code], period=period, count=_QUOTE_BUFFER_BARS).get(code)
+    except Exception as e:
+        logger.warning("Priming quote buffer %s %s failed: %s", code, period, e)
+        return []
+    if df is None or df.empty:
+        return []
+    return [_quote_bar(code, row) for row in df.to_dict("records")]
+
+
+def _merge_quote_bars(retained: list | None, bars: list) -> list:
+    """Fold new bars into the retained buffer, in place.
+
+    A bar with the time of the last retained bar replaces it (the forming
+    bar is pushed repeatedly); older bars are ignored.
+    """
+    retained = retained if retained is not None else []
+    for bar in bars:
+        if retained and bar.time == retained[-1].time:
+            retained[-1] = bar
+        elif not retained or bar.time > retained[-1].time:
+            retained.append(bar)
+    if len(retained) > _QUOTE_BUFFER_BARS:
+        del retained[:len(retained) - _QUOTE_BUFFER_BARS]
+    return retained
+
+
+def _whole_quote_entries(key: str, datas: dict) -> list[TickEntry]:
+    """subscribe_whole_quote callback data of market / code `key` -> one TickEntry per code.
+
+    The TickSnapshot is built here, once for all streams; the raw tick is
+    kept for columnar batches.
+    """
+    received_at = _now_ms()
+    entries = []
+    for code, tick in datas.items():
+        # Compatible with both list and dict callback formats
+        if isinstance(tick, (list, tuple)):
+            tick = tick[0] if tick else {}
+        entry = TickEntry(code, tick, received_at)
+        entry.snapshot = _tick_to_snapshot(code, tick, received_at)
+        entries.append(entry)
+    return entries
+
+
 # ====================== Service Implementation ======================
 
 
 class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
-    """Market data gRPC service, maps 1-to-1 to xtdata module functions."""
+    """Market data gRPC service, maps 1-to-1 to xtdata module functions.
+
+    Args:
+        kline_cache_bytes: Memory budget of the server-side kline cache.
+            0 (default) disables it and every kline request goes to xtdata.
+        fetch_workers: Size of the thread pool used to fetch and convert large
+            kline requests in parallel shards. 0 (default) keeps them serial.
+        shard_size: Instruments per shard when `fetch_workers` > 0.
+        compression: Algorithm for large responses ("none", "gzip", "deflate").
+        compression_min_bytes: Smallest response that is compressed.
+        mirror_dir: Directory of the memory-mapped kline mirror, updated by
+            DownloadHistoryData. Empty (default) disables it.
+        coalesce: Share one in-flight call among identical concurrent
+            GetMarketData / GetFullTick / GetFinancialData requests.
+        tick_table_markets: Markets ("SH", "SZ", ...) kept in a live tick
+            table by one whole-quote subscription; GetFullTick answers their
+            codes from memory. Empty (default) always calls get_full_tick.
+        stream_buffer: Pending items held per SubscribeQuote /
+            SubscribeWholeQuote(Batch) stream for a slow client; 0 is unbounded.
+        stream_overflow: What a full stream buffer does (see
+            server.stream_buffer): "conflate" (default), "drop_oldest" or
+            "disconnect".
+    """
 
+    def __init__(
+        self, kline_cache_bytes: int = 0, fetch_workers: int = 0, shard_size: int = 200,
+        compression: str = "none", compression_min_bytes: int = 64 * 1024, mirror_dir: str = "",
+        coalesce: bool = True, tick_table_markets=(), stream_buffer: int = 10_000, stream_overflow: str = "conflate",
+    ):
+        if stream_overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown stream overflow policy '{stream_overflow}'")
+        self._bar_cache = BarCache(kline_cache_bytes) if kline_cache_bytes > 0 else None
+        self._mirror = BarMirror(mirror_dir) if mirror_dir else None
+        self._fetch_pool = (
+            futures.ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="kline-fetch")
+            if fetch_workers > 0 else None
+        )
+        self._shard_size = max(1, shard_size)
+        self._batch_pool = futures.ThreadPoolExecutor(max_workers=_BATCH_WORKERS, thread_name_prefix="kline-batch")
+        self._price_ticks: dict[str, float] = {}
+        self._metrics = Metrics()
+        self._compressor = ResponseCompressor(compression, compression_min_bytes, self._metrics)
+        self._singleflight = Singleflight() if coalesce else None
+        self._stream_buffer = stream_buffer
+        self._stream_overflow = stream_overflow
+        # One upstream subscribe_whole_quote per market / code, shared by all
+        # SubscribeWholeQuote(Batch) streams and the live tick table
+        self._whole_quote_hub = QuoteHub(
+            "whole_quote",
+            lambda code, callback: xtdata.subscribe_whole_quote([code], callback=callback),
+            lambda seq: xtdata.unsubscribe_quote(seq),
+            _whole_quote_entries,
+        )
+        # Always present: versions polled ticks for GetFullTick.since_version
+        self._tick_table = TickTable(tick_table_markets, _tick_to_snapshot)
+        if self._tick_table.markets:
+            self._tick_table.start(self._whole_quote_hub)
+        # One upstream subscribe_quote per (code, period), with a shared buffer of recent bars;
+        # its count has xtdata supplement that much history for the primed buffer
+        self._quote_hub = QuoteHub(
+            "quote",
+            lambda key, callback: xtdata.subscribe_quote(
+                key[0], period=key[1], count=_QUOTE_BUFFER_BARS, callback=callback,
+            ),
+            lambda seq: xtdata.unsubscribe_quote(seq),
+            _quote_bars,
+            prime=_prime_quote_bars,
+            merge=_merge_quote_bars,
+        )
+
+    def close(self):
+        """Release background subscriptions (the live tick table) and the compression sampler."""
+        self._tick_table.stop()
+        self._compressor.close()
+
+    def _load_klines(self, request, codes: list[str], context) -> dict[str, dict]:
+        """Per-stock column arrays for a GetMarketDataRequest, in request order.
+
+        Code lists longer than `shard_size` are split into shards that are
+        fetched and converted concurrently on the fetch pool, then merged
+        back in request order. Custom periods are built from the nearest
+        native period (see server.resample). Tick history has no kline
+        columns and is rejected; it is served by StreamTickHistory.
+        """
+        if request.period == "tick":
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "period 'tick' has no kline columns; use StreamTickHistory for tick history",
+            )
+        try:
+            plan = resample_plan(request.period or "1d")
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        if plan is not None:
+            return self._load_resampled(request, codes, context, *plan)
+
+        if self._fetch_pool is None or len(codes) <= self._shard_size:
+            return self._load_shard(request, codes, context)
+
+        shards = [codes[i:i + self._shard_size] for i in range(0, len(codes), self._shard_size)]
+        logger.debug("Kline fan-out: %d stocks in %d shards", len(codes), len(shards))
+        pending = [self._fetch_pool.submit(self._load_shard, request, shard, context) for shard in shards]
+        merged = {}
+        for future in pending:
+            merged.update(future.result())
+        return merged
+
+    def _load_resampled(self, request, codes: list[str], context, native: str, factor: int) -> dict[str, dict]:
+        """Load native-period bars and aggregate them into the requested period."""
+        native_request = xtquant_pb2.GetMarketDataRequest()
+        native_request.CopyFrom(request)
+        native_request.period = native
+        minutes = intraday_minutes(native)
+        if request.count > 0:
+            native_request.count = _native_count(request.count, factor, minutes)
+        return {
+            code: slice_time_range(resample(arrays, factor, minutes), None, None, request.count)
+            for code, arrays in self._load_klines(native_request, codes, context).items()
+        }
+
+    def _load_shard(self, request, codes: list[str], context) -> dict[str, dict]:
+        """Per-stock column arrays for one group of codes.
+
+        With the kline cache enabled, each stock's full unadjusted local
+        history is fetched once per (code, period, fill_data) and range /
+        count requests are served by slicing the cached arrays. When an entry
+        expires, only bars from its last cached timestamp on are fetched and
+        appended. Adjusted series are computed from the raw bars and the
+        stock's cached dividend factors (see server.dividends).
+
+        With the mirror enabled, stocks not in the cache start from their
+        memory-mapped history (see server.mirror) and only fetch the bars
+        after it; ranges ending before the last mirrored bar are served
+        straight from the mapped files. Without the cache, stocks that are
+        not mirrored are fetched for just the requested range and fields.
+        """
+        period = request.period or "1d"
+        use_mirror = self._mirror is not None and not request.fill_data
+        if self._bar_cache is None and not use_mirror:
+            # Convert only the projected columns; 'time' is always needed for slicing
+            fields = kline_fields(request.fields, include_time=True)
+            data = _fetch_klines(request, codes, fields)
+            return {code: frame_to_arrays(df, fields) for code, df in data.items()}
+
+        dividend_type = request.dividend_type or "none"
+        if dividend_type not in DIVIDEND_TYPES:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Unknown dividend_type '{request.dividend_type}', expected one of {list(DIVIDEND_TYPES)}",
+            )
+        try:
+            start_ms = parse_time_ms(request.start_time)
+            end_ms = parse_time_ms(request.end_time, end=True)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        now = time.time()
+        expires_at = next_bar_close(period, now)
+        full, stale, missing, direct = {}, {}, [], {}
+        for code in codes:
+            arrays, fresh = (
+                self._bar_cache.lookup((code, period, request.fill_data), now)
+                if self._bar_cache is not None else (None, False)
+            )
+            if fresh:
+                full[code] = arrays
+            elif arrays is not None and len(arrays["time"]) > 0:
+                stale[code] = arrays
+            else:
+                missing.append(code)
+
+        if use_mirror and missing:
+            # Without the cache nothing outlives this request, so map only the projected columns
+            fields = kline_fields(request.fields) if self._bar_cache is None else kline_fields([])
+            unmirrored = []
+            for code in missing:
+                mirrored = self._mirror.read(period, code, fields)
+                if mirrored is None:
+                    unmirrored.append(code)
+                elif self._bar_cache is None and end_ms is not None and end_ms < mirrored["time"][-1]:
+                    full[code] = mirrored
+                elif self._bar_cache is None:
+                    # Merge the fresh tail into the requested window only, so just that
+                    # window is copied; the last mirrored bar stays as the refetch point
+                    window = slice_time_range(mirrored, start_ms, None, request.count)
+                    if len(window["time"]) == 0:
+                        window = slice_rows(mirrored, len(mirrored["time"]) - 1, len(mirrored["time"]))
+                    stale[code] = window
+                else:
+                    stale[code] = mirrored
+            missing = unmirrored
+            if self._bar_cache is None and missing:
+                # Nothing to keep: fetch only what was asked, as the uncached path does
+                direct_fields = kline_fields(request.fields, include_time=True)
+                for code, df in _fetch_klines(request, missing, direct_fields).items():
+                    direct[code] = frame_to_arrays(df, direct_fields)
+                missing = []
+
+        def fetch(fetch_codes, start_time=""):
+            return xtdata.get_market_data_ex(
+                [], fetch_codes, period=period, start_time=start_time, end_time="", count=-1,
+                dividend_type="none", fill_data=request.fill_data,
+            )
+
+        def store(code, arrays):
+            full[code] = arrays
+            if self._bar_cache is not None:
+                self._bar_cache.put((code, period, request.fill_data), arrays, expires_at)
+
+        # One refetch per distinct last-bar time, so a long-suspended stock
+        # does not drag the whole group back to its gap; the last cached bar
+        # itself is re-read since it may still have been forming
+        for since, since_codes in _group_by_last_time(
+            {code: int(arrays["time"][-1]) for code, arrays in stale.items()}
+        ).items():
+            tails = fetch(since_codes, format_time_ms(since))
+            for code in since_codes:
+                arrays = stale[code]
+                store(code, merge_tail(arrays, frame_to_arrays(tails[code])) if code in tails else arrays)
+
+        if missing:
+            for code, df in fetch(missing).items():
+                store(code, frame_to_arrays(df))
+
+        if (stale or missing) and self._bar_cache is not None:
+            logger.debug(
+                "Kline cache: %d fresh, %d tail-refreshed, %d fetched, %s",
+                len(codes) - len(stale) - len(missing), len(stale), len(missing), self._bar_cache.stats(),
+            )
+
+        result = {}
+        for code in codes:
+            if code in direct:
+                result[code] = direct[code]
+                continue
+            if code not in full:
+                continue
+            arrays = slice_time_range(full[code], start_ms, end_ms, request.count)
+            if dividend_type != "none":
+                arrays = adjust(arrays, self._divid_factors(code, now), dividend_type)
+            result[code] = arrays
+        return result
+
+    def _divid_factors(self, code: str, now: float) -> dict:
+        """Per-event dividend factors of one stock, cached alongside its bars.
+
+        New ex-rights records only take effect at a session open, so entries
+        stay fresh until the next one.
+        """
+        if self._bar_cache is None:
+            return factors_from_frame(xtdata.get_divid_factors(code))
+        key = (code, "divid_factors")
+        factors, fresh = self._bar_cache.lookup(key, now)
+        if not fresh:
+            factors = factors_from_frame(xtdata.get_divid_factors(code))
+            self._bar_cache.put(key, factors, next_session_open(now))
+        return factors
+
+    def _price_tick(self, code: str) -> float:
+        """Instrument price tick for encoding="compact" (0 if unknown), cached per code."""
+        tick = self._price_ticks.get(code)
+        if tick is None:
+            detail = xtdata.get_instrument_detail(code)
+            if not detail:
+                return 0.0
+            tick = self._price_ticks[code] = float(detail.get("PriceTick") or 0)
+        return tick
+
+    @_coalesced()
     @_xtdata_retry()
     def GetMarketData(self, request, context):
         """Get kline data -> xtdata.get_market_data_ex"""
-        # proto3 int32 defaults to 0; treat 0 as "fetch all"
+        new_columns = _kline_builder(request, context, self._price_tick)
+        data = self._load_klines(request, list(request.stock_codes), context)
+        columns = new_columns()
+        for code, arrays in data.items():
+            columns.add(code, arrays)
+        response = columns.build()
+        self._compressor.apply(context, "GetMarketData", response)
+        return response
+
+    @_xtdata_retry()
+    def GetMarketDataBatch(self, request, context):
+        """Get kline data for several periods of one code list -> xtdata.get_market_data_ex
+
+        Each spec is loaded concurrently (cache, fan-out and resampling apply
+        as for GetMarketData) and returned as one section, in spec order.
+        """
+        new_columns = _kline_builder(request.base, context, self._price_tick)
+        codes = list(request.base.stock_codes)
+
+        def load(spec):
+            section_request = xtquant_pb2.GetMarketDataRequest()
+            section_request.CopyFrom(request.base)
+            section_request.period = spec.period
+            section_request.start_time = spec.start_time
+            section_request.end_time = spec.end_time
+            section_request.count = spec.count
+            columns = new_columns()
+            for code, arrays in self._load_klines(section_request, codes, context).items():
+                columns.add(code, arrays)
+            return xtquant_pb2.KlineSection(spec=spec, data=columns.build())
+
+        pending = [self._batch_pool.submit(load, spec) for spec in request.specs]
+        response = xtquant_pb2.GetMarketDataBatchResponse(sections=[future.result() for future in pending])
+        self._compressor.apply(context, "GetMarketDataBatch", response)
+        return response
+
+    @_xtdata_retry()
+    def GetCrossSection(self, request, context):
+        """One row per instrument: its latest bar at or before `as_of`
+
+        With the kline cache enabled, each stock's row is found by a binary
+        search on its cached bar times; otherwise xtdata is asked for the
+        last bar up to `as_of` (count=1). Instruments without a bar by then
+        are omitted; suspended ones return their last traded bar.
+
+        A daily (or longer) bar is only known after the close, so an `as_of`
+        with a time of day before 15:00 gets the previous day's bar for
+        those periods rather than one holding data from after `as_of`.
+        """
+        new_columns = _kline_builder(request, context, self._price_tick)
+        if not request.stock_codes and not request.sector_name:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Either stock_codes or sector_name is required")
+        period = request.period or "1d"
+        end_time = request.as_of
+        try:
+            as_of_ms = parse_time_ms(request.as_of)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        has_time = sum(ch.isdigit() for ch in request.as_of) > 8
+        if has_time and intraday_minutes(period) is None:
+            end_time = last_closed_day(as_of_ms)
+        codes = list(request.stock_codes) or xtdata.get_stock_list_in_sector(request.sector_name)
+
+        bars_request = xtquant_pb2.GetMarketDataRequest(
+            stock_codes=codes, period=period, end_time=end_time, count=1,
+            dividend_type=request.dividend_type, fields=request.fields,
+        )
+        columns = new_columns()
+        for code, arrays in self._load_klines(bars_request, codes, context).items():
+            columns.add(code, arrays)
+        response = columns.build()
+        self._compressor.apply(context, "GetCrossSection", response)
+        return response
+
+    @_xtdata_retry()
+    def ComputeIndicators(self, request, context):
+        """Compute technical indicators on the server (see server.indicators)
+
+        Loads `lookback` bars per stock through the GetMarketData path (cache,
+        fan-out and custom periods apply) and returns the last `last_n`
+        values of every indicator series.
+        """
+        try:
+            specs = [indicators.resolve(spec.name, spec.params) for spec in request.indicators]
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        if not specs:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "No indicators requested")
+
+        last_n = max(1, request.last_n)
+        lookback = request.lookback or last_n + max(indicators.warmup_bars(*spec) for spec in specs)
+        fields = {"time"}.union(*(indicators.INDICATORS[name][2] for name, _ in specs))
+        bars_request = xtquant_pb2.GetMarketDataRequest(
+            stock_codes=request.stock_codes, period=request.period or "1d", end_time=request.end_time,
+            count=lookback, dividend_type=request.dividend_type, fields=sorted(fields),
+        )
+
+        response = xtquant_pb2.ComputeIndicatorsResponse()
+        for code, arrays in self._load_klines(bars_request, list(request.stock_codes), context).items():
+            stock = response.stocks.add(stock_code=code, time=arrays["time"][-last_n:].tolist())
+            for spec in specs:
+                for name, values in indicators.compute(arrays, *spec).items():
+                    stock.series.add(name=name, values=values[-last_n:].tolist())
+        return response
+
+    def StreamMarketData(self, request, context):
+        """Get kline data in columnar chunks (server stream) -> xtdata.get_market_data_ex
+
+        Fetches `chunk_stocks` instruments per xtdata call and yields a
+        GetMarketDataResponse every `chunk_rows` rows, so only one stock group
+        is held in memory at a time. A stock may span consecutive chunks.
+        """
+        new_columns = _kline_builder(request, context, self._price_tick)
+        codes = list(request.stock_codes)
+        chunk_rows = request.chunk_rows if request.chunk_rows > 0 else _DEFAULT_CHUNK_ROWS
+        chunk_stocks = request.chunk_stocks if request.chunk_stocks > 0 else _DEFAULT_CHUNK_STOCKS
+
+        logger.info(
+            "StreamMarketData request: %d stocks, period=%s, chunk_rows=%d, chunk_stocks=%d",
+            len(codes), request.period or "1d", chunk_rows, chunk_stocks,
+        )
+
+        def groups():
+            for i in range(0, len(codes), chunk_stocks):
+                if not context.is_active():
+                    return
+                yield self._load_klines(request, codes[i:i + chunk_stocks], context)
+
+        self._compressor.start_stream(context)
+        for chunk in _row_chunks(groups(), chunk_rows, new_columns):
+            response = chunk.build()
+            self._compressor.apply(context, "StreamMarketData", response, streaming=True)
+            yield response
+
+    def StreamTickHistory(self, request, context):
+        """Get tick history in columnar chunks (server stream) -> xtdata.get_market_data_ex(period="tick")
+
+        Same chunking as StreamMarketData. Each TickChunk carries packed
+        time / last price / volume / amount columns and the bid / ask depth
+        as flattened rows x depth matrices.
+        """
+        codes = list(request.stock_codes)
+        chunk_rows = request.chunk_rows if request.chunk_rows > 0 else _DEFAULT_CHUNK_ROWS
+        chunk_stocks = request.chunk_stocks if request.chunk_stocks > 0 else _DEFAULT_CHUNK_STOCKS
         count = request.count if request.count != 0 else -1
-        data = xtdata.get_market_data_ex(
-            [],
-            list(request.stock_codes),
-            period=request.period or "1d",
-            start_time=request.start_time,
-            end_time=request.end_time,
-            count=count,
-            dividend_type=request.dividend_type or "none",
-            fill_data=request.fill_data,
+
+        logger.info(
+            "StreamTickHistory request: %d stocks, %s-%s, chunk_rows=%d, chunk_stocks=%d",
+            len(codes), request.start_time, request.end_time, chunk_rows, chunk_stocks,
         )
-        cols = {k: [] for k in [
-            "stock_code", "time", "open", "high", "low", "close",
-            "volume", "amount", "pre_close", "suspend_flag",
-            "settlement_price", "open_interest",
-        ]}
-        for code, df in data.items():
-            _append_df_columns(code, df, cols)
-        return xtquant_pb2.GetMarketDataResponse(**cols)
 
+        def groups():
+            for i in range(0, len(codes), chunk_stocks):
+                if not context.is_active():
+                    return
+                data = xtdata.get_market_data_ex(
+                    [], codes[i:i + chunk_stocks], period="tick",
+                    start_time=request.start_time, end_time=request.end_time, count=count,
+                )
+                yield {code: tick_frame_to_arrays(df) for code, df in data.items()}
+
+        self._compressor.start_stream(context)
+        for chunk in _row_chunks(groups(), chunk_rows, TickColumns):
+            response = chunk.build()
+            self._compressor.apply(context, "StreamTickHistory", response, streaming=True)
+            yield response
+
+    @_coalesced(compress=False)
     @_xtdata_retry()
     def GetFullTick(self, request, context):
-        """Get real-time tick snapshot -> xtdata.get_full_tick"""
-        data = xtdata.get_full_tick(list(request.stock_codes))
-        ticks = {code: _tick_to_snapshot(code, tick) for code, tick in data.items()}
-        return xtquant_pb2.GetFullTickResponse(ticks=ticks)
+        """Get real-time tick snapshot -> xtdata.get_full_tick
+
+        With a live tick table, codes of its markets are answered from memory
+        and only the rest is fetched from xtdata. encoding="columnar" returns
+        one TickSnapshotColumns instead of a map of TickSnapshot messages.
+
+        Every response carries `version`; with `since_version` set to an
+        earlier one, only codes whose tick changed since then are returned
+        and `unchanged` is set when there are none. A token the server does
+        not know (e.g. from before a restart) yields a full response.
+        """
+        encoding = request.encoding or "map"
+        if encoding not in SNAPSHOT_ENCODINGS:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Unknown encoding '{encoding}', expected one of {list(SNAPSHOT_ENCODINGS)}",
+            )
+        table = self._tick_table
+        codes = list(request.stock_codes)
+        # Read before the lookup: a tick stored meanwhile is at worst sent twice, never missed
+        version = table.version
+        entries, missing = table.lookup(codes) if table.markets else ({}, codes)
+        if table.markets:
+            self._metrics.add("tick_table.hits", len(codes) - len(missing))
+            self._metrics.add("tick_table.misses", len(missing))
+        if missing:
+            polled = table.record(xtdata.get_full_tick(missing), _now_ms())
+            # The token must cover the versions just recorded; look the live
+            # codes up again so no live tick at or below it is left out
+            version = table.version
+            if entries:
+                missing_set = set(missing)
+                entries, _ = table.lookup([code for code in codes if code not in missing_set])
+            entries.update(polled)
+
+        since = request.since_version if 0 < request.since_version <= version else 0
+        if since:
+            entries = {code: entry for code, entry in entries.items() if entry.version > since}
+
+        response = xtquant_pb2.GetFullTickResponse(version=version, unchanged=bool(since) and not entries)
+        if encoding == "columnar":
+            response.columns.CopyFrom(snapshot_columns(
+                list(entries),
+                [entry.tick for entry in entries.values()],
+                [entry.received_at for entry in entries.values()],
+            ))
+        else:
+            for code, snapshot in table.snapshots(entries).items():
+                response.ticks[code].CopyFrom(snapshot)
+        return response
 
     @_xtdata_retry()
     def GetInstrumentDetail(self, request, context):
@@ -275,6 +945,42 @@ class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
         else:
             logger.info("Download complete: %d/%d instruments", finished_count, total_stocks)
 
+        if self._mirror is not None and not download_error[0] and resample_plan(period) is None and period != "tick":
+            mirrored = self._update_mirror(codes, period)
+            yield xtquant_pb2.DownloadProgress(
+                total=total_stocks, finished=total_stocks, stock_code="",
+                message=f"Mirror updated: {mirrored} instruments",
+            )
+
+    def _update_mirror(self, codes: list[str], period: str) -> int:
+        """Append newly downloaded bars to the mirror; returns instruments written.
+
+        Already mirrored stocks are read back from their last mirrored bar
+        (which may have been forming), new ones in full.
+        """
+        written = 0
+        for i in range(0, len(codes), _DEFAULT_CHUNK_STOCKS):
+            group = codes[i:i + _DEFAULT_CHUNK_STOCKS]
+            last = {code: info["last"] for code in group if (info := self._mirror.info(period, code))}
+            fetches = [
+                (since_codes, format_time_ms(since)) for since, since_codes in _group_by_last_time(last).items()
+            ]
+            new = [code for code in group if code not in last]
+            if new:
+                fetches.append((new, ""))
+            for fetch_codes, start_time in fetches:
+                data = xtdata.get_market_data_ex(
+                    [], fetch_codes, period=period, start_time=start_time, end_time="", count=-1,
+                    dividend_type="none", fill_data=False,
+                )
+                for code, df in data.items():
+                    if code in fetch_codes and len(df):
+                        self._mirror.write(period, code, frame_to_arrays(df))
+                        written += 1
+            self._mirror.flush()
+        logger.info("Mirror updated: %d/%d instruments, period=%s", written, len(codes), period)
+        return written
+
     @_xtdata_retry()
     def GetTradingDates(self, request, context):
         """Get trading dates -> xtdata.get_trading_dates"""
@@ -287,6 +993,7 @@ class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
         )
         return xtquant_pb2.GetTradingDatesResponse(dates=[int(d) for d in dates])
 
+    @_coalesced()
     @_xtdata_retry()
     def GetFinancialData(self, request, context):
         """Get financial data (JSON response) -> xtdata.get_financial_data
@@ -296,7 +1003,16 @@ class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
 
         Available tables: Balance, Income, CashFlow, Capital, Holdernum,
         Top10holder, Top10flowholder, Pershareindex.
+
+        With format="arrow", each table is returned as an Arrow IPC stream
+        in `arrow_tables` instead of JSON.
         """
+        fmt = request.format or "json"
+        if fmt not in ("json", "arrow"):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Unknown format '{request.format}'")
+        if fmt == "arrow" and not arrow_available():
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "format 'arrow' requires pyarrow on the server")
+
         data = xtdata.get_financial_data(
             list(request.stock_codes),
             table_list=list(request.table_list) or [],
@@ -304,14 +1020,33 @@ class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
             end_time=request.end_time,
             report_type=request.report_type or "report_time",
         )
-        result = {}
-        for code, tables in data.items():
-            result[code] = {}
-            for name, df in tables.items():
-                result[code][name] = df.to_dict(orient="records") if hasattr(df, "to_dict") else str(df)
-        return xtquant_pb2.GetFinancialDataResponse(
-            data_json=json.dumps(result, ensure_ascii=False, default=str),
-        )
+        if fmt == "arrow":
+            response = xtquant_pb2.GetFinancialDataResponse(arrow_tables=financial_to_arrow(data))
+        else:
+            result = {}
+            for code, tables in data.items():
+                result[code] = {}
+                for name, df in tables.items():
+                    result[code][name] = df.to_dict(orient="records") if hasattr(df, "to_dict") else str(df)
+            response = xtquant_pb2.GetFinancialDataResponse(
+                data_json=json.dumps(result, ensure_ascii=False, default=str),
+            )
+        self._compressor.apply(context, "GetFinancialData", response)
+        return response
+
+    def GetServerMetrics(self, request, context):
+        """Per-method response size / compression metrics and kline cache stats"""
+        values = self._metrics.snapshot()
+        values.update(compression_ratios(values))
+        if self._bar_cache is not None:
+            values.update({f"kline_cache.{name}": value for name, value in self._bar_cache.stats().items()})
+        if self._singleflight is not None:
+            values["coalesce.in_flight"] = self._singleflight.in_flight()
+        if self._tick_table.markets:
+            values["tick_table.size"] = self._tick_table.size()
+        for hub in (self._quote_hub, self._whole_quote_hub):
+            values.update({f"quote_hub.{hub.name}.{name}": value for name, value in hub.stats().items()})
+        return xtquant_pb2.ServerMetrics(values=values)
 
     def DownloadFinancialData(self, request, context):
         """Download financial data (server stream) -> xtdata.download_financial_data2
@@ -474,77 +1209,158 @@ class MarketDataServicer(xtquant_pb2_grpc.MarketDataServiceServicer):
 
         return xtquant_pb2.GetValuationMetricsResponse(valuations=valuations)
 
-    def SubscribeQuote(self, request, context):
-        """Subscribe to single-stock quotes (server stream) -> xtdata.subscribe_quote
+    def _drain(self, method: str, buffer: StreamBuffer, context, linger: float = 0.0, enough: int = 0):
+        """Yield (items, StreamStats or None) from a stream buffer while the client is connected.
 
-        Bridges xtdata's callback model with gRPC streaming via queue.
-        Automatically unsubscribes when the client disconnects.
+        StreamStats is given with the first items after the buffer's
+        conflated / dropped counts changed; the increments also go to the
+        server metrics. An overflowed "disconnect" buffer ends the stream
+        with RESOURCE_EXHAUSTED. `linger` / `enough` are passed to
+        StreamBuffer.get.
         """
-        data_queue: queue.Queue = queue.Queue()
-
-        seq = xtdata.subscribe_quote(
-            request.stock_code,
-            period=request.period or "1d",
-            count=request.count,
-            callback=lambda datas: data_queue.put(datas),
-        )
-        if seq < 0:
-            context.abort(grpc.StatusCode.INTERNAL, "Failed to subscribe quote")
-
-        logger.info("Subscribe quote: %s %s (seq=%d)", request.stock_code, request.period, seq)
-
+        reported = (0, 0)
         while context.is_active():
-            # Poll queue every second, also allowing client disconnect detection
-            try:
-                datas = data_queue.get(timeout=1.0)
-            except queue.Empty:
+            # Wait at most a second, also allowing client disconnect detection
+            items = buffer.get(timeout=1.0, linger=linger, enough=enough)
+            if buffer.overflowed:
+                self._metrics.add(f"stream.{method}.disconnected")
+                context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    f"Stream buffer overflow ({buffer.max_items} pending items): client too slow",
+                )
+            if not items:
                 continue
+            counts = buffer.stats()
+            stats = None
+            if counts != reported:
+                self._metrics.add(f"stream.{method}.conflated", counts[0] - reported[0])
+                self._metrics.add(f"stream.{method}.dropped", counts[1] - reported[1])
+                stats = xtquant_pb2.StreamStats(conflated=counts[0], dropped=counts[1])
+                reported = counts
+            yield items, stats
 
-            for code, items in datas.items():
-                item_list = items if isinstance(items, list) else [items]
-                bars = [xtquant_pb2.KlineBar(
-                    stock_code=code,
-                    time=int(it.get("time", 0)),
-                    open=float(it.get("open", 0)),
-                    high=float(it.get("high", 0)),
-                    low=float(it.get("low", 0)),
-                    close=float(it.get("close", 0)),
-                    volume=float(it.get("volume", 0)),
-                    amount=float(it.get("amount", 0)),
-                ) for it in item_list]
-                yield xtquant_pb2.QuoteUpdate(stock_code=code, period=request.period, bars=bars)
-
-        xtdata.unsubscribe_quote(seq)
-        logger.info("Unsubscribed: %s (seq=%d)", request.stock_code, seq)
+    def SubscribeQuote(self, request, context):
+        """Subscribe to single-stock quotes (server stream) -> xtdata.subscribe_quote
 
-    def SubscribeWholeQuote(self, request, context):
-        """Subscribe to full-market tick stream -> xtdata.subscribe_whole_quote
+        Streams share one upstream subscription per (code, period) (see
+        server.quote_hub); bars are converted once per callback for all of
+        them. `count` > 0 first sends up to that many recent bars from the
+        shared buffer (at most _QUOTE_BUFFER_BARS), without another xtdata
+        fetch. Automatically detaches when the client disconnects.
 
-        Pushes tick snapshots for the entire market; suitable for scenarios
-        requiring real-time data for a large number of instruments.
+        Pending bars of a slow client are bounded; with "conflate", a full
+        buffer lets updates of the same bar replace each other.
         """
-        data_queue: queue.Queue = queue.Queue()
-
-        seq = xtdata.subscribe_whole_quote(
-            list(request.code_list),
-            callback=lambda datas: data_queue.put(datas),
-        )
-        if seq < 0:
-            context.abort(grpc.StatusCode.INTERNAL, "Failed to subscribe whole quote")
-
-        logger.info("Subscribe whole quote: %s (seq=%d)", list(request.code_list), seq)
+        period = request.period or "1d"
+        key = (request.stock_code, period)
+        buffer = StreamBuffer(self._stream_buffer, self._stream_overflow, key=lambda bar: bar.time)
+        try:
+            subscriber = self._quote_hub.attach([key], buffer)
+        except RuntimeError as e:
+            context.abort(grpc.StatusCode.INTERNAL, f"Failed to subscribe quote: {e}")
+
+        logger.info("Subscribe quote: %s %s", request.stock_code, period)
+        try:
+            backlog = subscriber.backlog[key]
+            if request.count > 0 and backlog:
+                yield xtquant_pb2.QuoteUpdate(
+                    stock_code=request.stock_code, period=period, bars=backlog[-request.count:],
+                )
+            for bars, stats in self._drain("SubscribeQuote", buffer, context):
+                yield xtquant_pb2.QuoteUpdate(
+                    stock_code=request.stock_code, period=period, bars=bars, stream_stats=stats,
+                )
+        finally:
+            self._quote_hub.detach(subscriber)
+            logger.info("Quote stream closed: %s %s", request.stock_code, period)
 
-        while context.is_active():
-            try:
-                datas = data_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
+    def SubscribeWholeQuote(self, request, context):
+        """Subscribe to full-market tick stream -> xtdata.subscribe_whole_quote
 
-            for code, tick in datas.items():
-                # Compatible with both list and dict callback formats
-                if isinstance(tick, (list, tuple)):
-                    tick = tick[0] if tick else {}
-                yield _tick_to_snapshot(code, tick)
+        Pushes tick snapshots for the entire market; suitable for scenarios
+        requiring real-time data for a large number of instruments. Streams
+        share one upstream subscription per market / code (see
+        server.quote_hub), and each pushed batch is converted once for all.
 
-        xtdata.unsubscribe_quote(seq)
-        logger.info("Unsubscribed whole quote (seq=%d)", seq)
+        Pending ticks of a slow client are bounded; with "conflate", a full
+        buffer keeps only the latest tick per code.
+        """
+        codes = list(request.code_list)
+        if not codes:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "code_list must not be empty")
+        buffer = StreamBuffer(self._stream_buffer, self._stream_overflow, key=lambda entry: entry.code)
+        try:
+            subscriber = self._whole_quote_hub.attach(codes, buffer)
+        except RuntimeError as e:
+            context.abort(grpc.StatusCode.INTERNAL, f"Failed to subscribe whole quote: {e}")
+
+        logger.info("Subscribe whole quote: %s", codes)
+        try:
+            for entries, stats in self._drain("SubscribeWholeQuote", buffer, context):
+                ticks = [entry.snapshot for entry in entries]
+                if stats is not None:
+                    # Snapshots are shared with other streams: report on a copy
+                    first = xtquant_pb2.TickSnapshot()
+                    first.CopyFrom(ticks[0])
+                    first.stream_stats.CopyFrom(stats)
+                    ticks[0] = first
+                yield from ticks
+        finally:
+            self._whole_quote_hub.detach(subscriber)
+            logger.info("Whole quote stream closed: %s", codes)
+
+    def SubscribeWholeQuoteBatch(self, request, context):
+        """Batched full-market tick stream -> xtdata.subscribe_whole_quote
+
+        Same shared subscriptions and buffering as SubscribeWholeQuote, but
+        each message is a TickBatch holding every tick pending for the
+        stream (normally one xtdata callback) instead of one message per
+        code. encoding="columnar" packs the ticks as TickSnapshotColumns.
+
+        `max_batch` > 0 caps the ticks per message; larger batches are split.
+        `max_latency_ms` > 0 waits up to that long after the first pending
+        tick for more (or until `max_batch` are pending) before sending; all
+        merged ticks are sent in order unless the stream buffer fills up.
+        """
+        codes = list(request.code_list)
+        if not codes:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "code_list must not be empty")
+        encoding = request.encoding or "rows"
+        if encoding not in BATCH_ENCODINGS:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Unknown encoding '{encoding}', expected one of {list(BATCH_ENCODINGS)}",
+            )
+        if request.max_batch < 0 or request.max_latency_ms < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "max_batch and max_latency_ms must not be negative")
+        buffer = StreamBuffer(self._stream_buffer, self._stream_overflow, key=lambda entry: entry.code)
+        try:
+            subscriber = self._whole_quote_hub.attach(codes, buffer)
+        except RuntimeError as e:
+            context.abort(grpc.StatusCode.INTERNAL, f"Failed to subscribe whole quote: {e}")
+
+        logger.info("Subscribe whole quote batches: %s (encoding=%s)", codes, encoding)
+        linger = request.max_latency_ms / 1000
+        try:
+            for entries, stats in self._drain(
+                "SubscribeWholeQuoteBatch", buffer, context, linger=linger, enough=request.max_batch,
+            ):
+                step = request.max_batch or len(entries)
+                for start in range(0, len(entries), step):
+                    chunk = entries[start:start + step]
+                    batch = xtquant_pb2.TickBatch()
+                    if stats is not None:
+                        batch.stream_stats.CopyFrom(stats)
+                        stats = None
+                    if encoding == "columnar":
+                        batch.columns.CopyFrom(snapshot_columns(
+                            [entry.code for entry in chunk],
+                            [entry.tick for entry in chunk],
+                            [entry.received_at for entry in chunk],
+                        ))
+                    else:
+                        batch.ticks.extend(entry.snapshot for entry in chunk)
+                    yield batch
+        finally:
+            self._whole_quote_hub.detach(subscriber)
+            logger.info("Whole quote batch stream closed: %s", codes)
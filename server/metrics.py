@@ -0,0 +1,29 @@
+"""In-process server metrics
+
+A flat, thread-safe registry of float counters keyed on dotted names
+("compression.GetMarketData.responses", ...). Exposed through the
+GetServerMetrics RPC for tuning; no external metrics backend is required.
+"""
+
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """Thread-safe named counters."""
+
+    def __init__(self):
+        self._values: defaultdict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value: float = 1.0):
+        with self._lock:
+            self._values[name] += value
+
+    def set(self, name: str, value: float):
+        with self._lock:
+            self._values[name] = value
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._values)
@@ -0,0 +1,145 @@
+"""Memory-mapped columnar mirror of downloaded kline history
+
+Layout under the mirror root:
+
+    index.json                      {period: {code: {"rows": n, "first": ms, "last": ms, "gen": g}}}
+    <period>/<code>/<column>.bin    raw little-endian array per KLINE_COLUMNS column (gen 0)
+    <period>/<code>/<column>.<g>.bin  the same for generation g > 0
+
+Only unadjusted bars are stored (dividend adjustment is applied on read, see
+server.dividends). Reads map the column files with np.memmap, so slicing a
+range touches only the pages it needs and copies nothing.
+
+Bytes a reader may have mapped are never modified. Updates are incremental:
+new bars past the mirrored ones, and leading bars equal to mirrored ones, are
+appended after `rows` in the current files. When a mirrored bar changes (it
+was still forming), the kept rows and the new bars are written to the files
+of the next generation and the index switches to it; the old files are
+removed where the OS allows it (Windows keeps files that are still mapped).
+Files are never shrunk; `rows` in the index is authoritative and any bytes
+past it are ignored.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+from .columnar import KLINE_COLUMNS
+
+_INDEX_FILE = "index.json"
+
+
+class BarMirror:
+    """Per-(period, code) memory-mapped column files plus a JSON time-range index."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._index: dict[str, dict[str, dict]] = {}
+        path = os.path.join(root, _INDEX_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    def _dir(self, period: str, code: str) -> str:
+        return os.path.join(self.root, period, code)
+
+    @staticmethod
+    def _path(directory: str, name: str, gen: int) -> str:
+        return os.path.join(directory, f"{name}.bin" if gen == 0 else f"{name}.{gen}.bin")
+
+    def info(self, period: str, code: str) -> dict | None:
+        """{"rows", "first", "last"} of a mirrored series, or None."""
+        with self._lock:
+            entry = self._index.get(period, {}).get(code)
+            return dict(entry) if entry else None
+
+    def read(self, period: str, code: str, fields=tuple(KLINE_COLUMNS)) -> dict[str, np.ndarray] | None:
+        """Memory-mapped (read-only) column arrays of a mirrored series, or None.
+
+        'time' is always included so the result can be sliced by time.
+        """
+        entry = self.info(period, code)
+        if not entry or entry["rows"] == 0:
+            return None
+        directory = self._dir(period, code)
+        rows, gen = entry["rows"], entry.get("gen", 0)
+        arrays = {}
+        for name in KLINE_COLUMNS:
+            if name != "time" and name not in fields:
+                continue
+            dtype = np.dtype(KLINE_COLUMNS[name][1]).newbyteorder("<")
+            arrays[name] = np.memmap(self._path(directory, name, gen), dtype=dtype, mode="r", shape=(rows,))
+        return arrays
+
+    def write(self, period: str, code: str, arrays: dict[str, np.ndarray]):
+        """Merge bars into the mirror: rows at or after arrays' first time are replaced.
+
+        The new rows become visible to readers at once; call `flush` to persist the index.
+        """
+        n = len(arrays["time"])
+        if n == 0:
+            return
+        directory = self._dir(period, code)
+        with self._lock:
+            entry = self._index.get(period, {}).get(code)
+            rows, gen = (entry["rows"], entry.get("gen", 0)) if entry else (0, 0)
+            first = entry["first"] if rows else int(arrays["time"][0])
+            last = int(arrays["time"][-1])
+            arrays = {name: np.asarray(arrays[name], dtype=dtype) for name, (_, dtype) in KLINE_COLUMNS.items()}
+            cut = 0
+            if rows:
+                mapped = {
+                    name: np.memmap(self._path(directory, name, gen), dtype=np.dtype(dtype).newbyteorder("<"),
+                                    mode="r", shape=(rows,))
+                    for name, (_, dtype) in KLINE_COLUMNS.items()
+                }
+                cut = int(np.searchsorted(mapped["time"], arrays["time"][0], side="left"))
+                if cut == 0:
+                    first = int(arrays["time"][0])
+                # Leading bars equal to the mirrored ones stay where they are
+                overlap = min(rows - cut, n)
+                same = np.ones(overlap, dtype=bool)
+                for name, column in arrays.items():
+                    old, new = mapped[name][cut:cut + overlap], column[:overlap]
+                    same &= (old == new) | (np.isnan(old) & np.isnan(new)) if new.dtype.kind == "f" else old == new
+                skip = overlap if same.all() else int(np.argmin(same))
+                cut += skip
+                arrays = {name: column[skip:] for name, column in arrays.items()}
+                n -= skip
+            os.makedirs(directory, exist_ok=True)
+            if n and cut < rows:
+                # Mirrored bars change: write the next generation, leaving mapped bytes untouched
+                new_gen = gen + 1
+                for name, (_, dtype) in KLINE_COLUMNS.items():
+                    dtype = np.dtype(dtype).newbyteorder("<")
+                    with open(self._path(directory, name, new_gen), "wb") as f:
+                        f.write(np.ascontiguousarray(mapped[name][:cut]).tobytes())
+                        f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+                del mapped
+                for name in KLINE_COLUMNS:
+                    try:
+                        os.remove(self._path(directory, name, gen))
+                    except OSError:
+                        pass
+                gen = new_gen
+            elif n:
+                for name, (_, dtype) in KLINE_COLUMNS.items():
+                    dtype = np.dtype(dtype).newbyteorder("<")
+                    path = self._path(directory, name, gen)
+                    with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+                        f.seek(cut * dtype.itemsize)
+                        f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+            self._index.setdefault(period, {})[code] = {"rows": cut + n, "first": first, "last": last, "gen": gen}
+
+    def flush(self):
+        """Persist the index atomically (write to a temp file, then rename)."""
+        path = os.path.join(self.root, _INDEX_FILE)
+        tmp = path + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, path)
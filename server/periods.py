@@ -0,0 +1,107 @@
+"""Kline period and timestamp helpers
+
+xtdata bar timestamps are epoch milliseconds; request times are strings such
+as "20240101" or "20240101093000" in Beijing time (UTC+8, no DST).
+"""
+
+import functools
+from datetime import datetime, time as dtime, timedelta, timezone
+
+CST = timezone(timedelta(hours=8))
+
+# A-share session bounds used to decide when a daily bar can still change
+SESSION_OPEN = dtime(9, 15)
+SESSION_CLOSE = dtime(15, 0)
+
+# Continuous-trading sessions; intraday bars are aligned to the start of each
+# (1h bars close at 10:30, 11:30, 14:00 and 15:00)
+SESSIONS = ((dtime(9, 30), dtime(11, 30)), (dtime(13, 0), dtime(15, 0)))
+
+_TIME_FORMATS = {8: "%Y%m%d", 12: "%Y%m%d%H%M", 14: "%Y%m%d%H%M%S"}
+_UNIT_MINUTES = {"m": 1, "h": 60}
+
+
+def intraday_minutes(period: str) -> int | None:
+    """Bar length in minutes for intraday periods ("1m", "5m", "1h"), else None."""
+    if len(period) < 2 or period[-1] not in _UNIT_MINUTES or not period[:-1].isdigit():
+        return None
+    return int(period[:-1]) * _UNIT_MINUTES[period[-1]]
+
+
+@functools.lru_cache(maxsize=None)
+def session_bar_closes(minutes: int) -> tuple[int, ...]:
+    """Minutes after midnight at which `minutes`-long bars close.
+
+    Each session is cut every `minutes` from its start; a shorter last bar
+    closes at the session end.
+    """
+    closes = []
+    for start, end in SESSIONS:
+        start_min, end_min = start.hour * 60 + start.minute, end.hour * 60 + end.minute
+        closes.extend(range(start_min + minutes, end_min, minutes))
+        closes.append(end_min)
+    return tuple(closes)
+
+
+def parse_time_ms(value: str, end: bool = False) -> int | None:
+    """xtdata time string -> epoch milliseconds, or None if empty.
+
+    A date-only `end` time covers the whole day (23:59:59.999).
+    Raises ValueError for unrecognized formats.
+    """
+    digits = "".join(ch for ch in value if ch.isdigit())
+    if not digits:
+        return None
+    fmt = _TIME_FORMATS.get(len(digits))
+    if fmt is None:
+        raise ValueError(f"Unrecognized time '{value}', expected YYYYMMDD[HHMM[SS]]")
+    dt = datetime.strptime(digits, fmt).replace(tzinfo=CST)
+    if end and len(digits) == 8:
+        dt += timedelta(days=1, milliseconds=-1)
+    return int(dt.timestamp() * 1000)
+
+
+def format_time_ms(ms: int) -> str:
+    """Epoch milliseconds -> xtdata time string "YYYYMMDDHHMMSS" (Beijing time)."""
+    return datetime.fromtimestamp(ms / 1000, CST).strftime("%Y%m%d%H%M%S")
+
+
+def next_bar_close(period: str, now: float) -> float:
+    """Epoch seconds at which the bar forming at `now` stops changing.
+
+    Intraday periods close on the session-aligned grid of
+    `session_bar_closes`. Daily and longer bars are final outside the
+    trading session and are valid until the next open; during the session
+    today's bar is still forming, so they are only kept until the next
+    1-minute close. Before the open (and after the last close) everything is
+    valid until the open.
+    """
+    local = datetime.fromtimestamp(now, CST)
+    today = local.date()
+    if local.time() < SESSION_OPEN:
+        return datetime.combine(today, SESSION_OPEN, CST).timestamp()
+    minutes = intraday_minutes(period)
+    if not minutes:
+        if local.time() >= SESSION_CLOSE:
+            return datetime.combine(today + timedelta(days=1), SESSION_OPEN, CST).timestamp()
+        minutes = 1
+    midnight = datetime.combine(today, dtime(0), CST)
+    elapsed = (local - midnight) / timedelta(minutes=1)
+    for close in session_bar_closes(minutes):
+        if close > elapsed:
+            return (midnight + timedelta(minutes=close)).timestamp()
+    return datetime.combine(today + timedelta(days=1), SESSION_OPEN, CST).timestamp()
+
+
+def next_session_open(now: float) -> float:
+    """Epoch seconds of the next session open (SESSION_OPEN) after `now`."""
+    local = datetime.fromtimestamp(now, CST)
+    day = local.date() if local.time() < SESSION_OPEN else local.date() + timedelta(days=1)
+    return datetime.combine(day, SESSION_OPEN, CST).timestamp()
+
+
+def last_closed_day(ms: int) -> str:
+    """"YYYYMMDD" of the last calendar day whose session had closed at `ms` (epoch ms)."""
+    local = datetime.fromtimestamp(ms / 1000, CST)
+    day = local.date() if local.time() >= SESSION_CLOSE else local.date() - timedelta(days=1)
+    return day.strftime("%Y%m%d")
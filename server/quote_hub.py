@@ -0,0 +1,193 @@
+"""Shared upstream quote subscriptions with fan-out to many streams
+
+Without a hub, every streaming RPC opens its own xtdata subscription and
+converts every callback batch itself, so N clients watching the same market
+cost N upstream subscriptions and N conversions. A QuoteHub keeps one
+upstream subscription per key (a market or instrument code, ...), reference
+counted by the attached subscribers. Each callback batch is converted once
+and its items are put in the buffer of every subscriber of that key. The
+upstream subscription is dropped when its last subscriber detaches.
+
+A hub can also retain recent data per key (e.g. the last N bars): `prime`
+seeds it once when the upstream subscription is created and `merge` folds
+every converted batch into it. A subscriber attaching later receives the
+retained items as its backlog, with no gap or extra upstream fetch.
+
+Subscribing and priming a new key run outside the hub-wide lock, so one slow
+upstream call does not hold up attaches and detaches of other keys; other
+subscribers of the same key wait for it to be ready.
+"""
+
+import logging
+import threading
+from typing import Callable, Hashable
+
+from .stream_buffer import StreamBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """One attached stream: the keys it watches and its buffer of converted items.
+
+    `backlog` maps each key to a copy of its retained items at attach time
+    (hubs with `merge` only).
+    """
+
+    def __init__(self, keys: tuple, buffer):
+        self.keys = keys
+        self.buffer = buffer
+        self.backlog: dict = {}
+
+    def put(self, batch):
+        self.buffer.put(batch)
+
+
+class _Upstream:
+    """One upstream subscription and its current subscribers."""
+
+    def __init__(self, key):
+        self.key = key
+        self.seq = -1
+        # Replaced, never mutated, so detach does not need to wait for a callback in progress
+        self.subscribers: tuple[Subscriber, ...] = ()
+        self.retained = None
+        # Orders callbacks against attaches, so a new subscriber's backlog and queue neither overlap nor leave a gap
+        self.lock = threading.Lock()
+        # Set once subscribed and primed (or failed); attaches in progress keep the upstream alive
+        self.ready = threading.Event()
+        self.failed = False
+        self.pending = 0
+
+
+class QuoteHub:
+    """Reference-counted upstream subscriptions keyed on e.g. market code.
+
+    Args:
+        name: Label for logs and metrics ("whole_quote", ...).
+        subscribe: (key, callback) -> subscription seq, < 0 on failure.
+        unsubscribe: (seq) -> None.
+        convert: (key, callback data) -> list of items delivered to
+            subscribers; called once per callback, whatever the number of
+            subscribers.
+        prime: (key) -> initial retained items, called once per upstream
+            subscription. Optional.
+        merge: (retained, batch) -> retained; folds each batch into the
+            retained items. None (default) retains nothing.
+    """
+
+    def __init__(
+        self, name: str, subscribe: Callable, unsubscribe: Callable, convert: Callable,
+        prime: Callable | None = None, merge: Callable | None = None,
+    ):
+        self.name = name
+        self._subscribe = subscribe
+        self._unsubscribe = unsubscribe
+        self._convert = convert
+        self._prime = prime
+        self._merge = merge
+        self._upstreams: dict[Hashable, _Upstream] = {}
+        self._lock = threading.Lock()
+
+    def _callback(self, upstream: _Upstream):
+        def on_data(datas):
+            with upstream.lock:
+                subscribers = upstream.subscribers
+                if not subscribers and self._merge is None:
+                    return
+                batch = self._convert(upstream.key, datas)
+                if self._merge is not None:
+                    upstream.retained = self._merge(upstream.retained, batch)
+                for subscriber in subscribers:
+                    subscriber.put(batch)
+        return on_data
+
+    def attach(self, keys, buffer: StreamBuffer | None = None) -> Subscriber:
+        """Attach a subscriber to `keys`, subscribing upstream where needed.
+
+        Items are delivered into `buffer` (default: an unbounded
+        StreamBuffer; anything with a `put(items)` method will do).
+        Raises RuntimeError (after detaching again) if an upstream
+        subscription fails.
+        """
+        keys = tuple(dict.fromkeys(keys))
+        subscriber = Subscriber(keys, buffer if buffer is not None else StreamBuffer())
+        for key in keys:
+            with self._lock:
+                upstream = self._upstreams.get(key)
+                created = upstream is None
+                if created:
+                    # Placeholder: later attaches of this key wait on `ready` instead of subscribing again
+                    upstream = self._upstreams[key] = _Upstream(key)
+                upstream.pending += 1
+            try:
+                if created:
+                    self._open(upstream)
+                else:
+                    upstream.ready.wait()
+                    if upstream.failed:
+                        raise RuntimeError(f"Failed to subscribe {self.name} for {key}")
+            except BaseException:
+                with self._lock:
+                    upstream.pending -= 1
+                    self._drop_if_unused(upstream)
+                    self._detach_locked(subscriber)
+                raise
+            with self._lock:
+                upstream.pending -= 1
+                with upstream.lock:
+                    upstream.subscribers = upstream.subscribers + (subscriber,)
+                    if self._merge is not None:
+                        subscriber.backlog[key] = list(upstream.retained or [])
+        return subscriber
+
+    def _open(self, upstream: _Upstream):
+        """Subscribe and prime a new upstream, without holding the hub lock."""
+        key = upstream.key
+        try:
+            upstream.seq = self._subscribe(key, self._callback(upstream))
+            if upstream.seq < 0:
+                raise RuntimeError(f"Failed to subscribe {self.name} for {key}")
+            logger.info("Hub %s: subscribed %s (seq=%d)", self.name, key, upstream.seq)
+            if self._prime is not None:
+                primed = self._prime(key)
+                with upstream.lock:
+                    # Batches pushed while priming are newer than the primed items
+                    upstream.retained = self._merge(primed, upstream.retained or [])
+        except BaseException:
+            upstream.failed = True
+            with self._lock:
+                if self._upstreams.get(key) is upstream:
+                    del self._upstreams[key]
+            if upstream.seq >= 0:
+                self._unsubscribe(upstream.seq)
+            raise
+        finally:
+            upstream.ready.set()
+
+    def detach(self, subscriber: Subscriber):
+        """Detach a subscriber; upstream subscriptions left without subscribers are dropped."""
+        with self._lock:
+            self._detach_locked(subscriber)
+
+    def _detach_locked(self, subscriber: Subscriber):
+        for key in subscriber.keys:
+            upstream = self._upstreams.get(key)
+            if upstream is None or subscriber not in upstream.subscribers:
+                continue
+            upstream.subscribers = tuple(s for s in upstream.subscribers if s is not subscriber)
+            self._drop_if_unused(upstream)
+
+    def _drop_if_unused(self, upstream: _Upstream):
+        """Unsubscribe an upstream with no subscribers and no attach in progress (hub lock held)."""
+        if upstream.subscribers or upstream.pending or self._upstreams.get(upstream.key) is not upstream:
+            return
+        del self._upstreams[upstream.key]
+        self._unsubscribe(upstream.seq)
+        logger.info("Hub %s: unsubscribed %s (seq=%d)", self.name, upstream.key, upstream.seq)
+
+    def stats(self) -> dict[str, float]:
+        """Upstream subscription and attached-subscriber counts."""
+        with self._lock:
+            subscribers = {s for upstream in self._upstreams.values() for s in upstream.subscribers}
+            return {"upstreams": len(self._upstreams), "subscribers": len(subscribers)}
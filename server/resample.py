@@ -0,0 +1,121 @@
+"""Server-side resampling of kline arrays to custom periods
+
+Periods xtdata does not support natively ("3m", "10m", "2h", "2d", ...) are
+built from the largest native period that divides them, using vectorized
+group-by aggregation over the per-column arrays from server.columnar.
+"""
+
+import numpy as np
+
+from .periods import SESSIONS, intraday_minutes
+
+# Periods get_market_data_ex supports directly
+NATIVE_PERIODS = ("tick", "1m", "5m", "15m", "30m", "1h", "1d", "1w", "1mon", "1q", "1hy", "1y")
+
+# Native intraday bar lengths in minutes, largest first
+_NATIVE_MINUTES = {60: "1h", 30: "30m", 15: "15m", 5: "5m", 1: "1m"}
+
+_DAY_MS = 86_400_000
+_CST_OFFSET_MS = 8 * 3_600_000
+# Multi-day buckets count weekdays from this Monday, so their boundaries do not depend on the range fetched
+_NDAY_EPOCH = np.datetime64("1970-01-05", "D")
+
+
+def resample_plan(period: str) -> tuple[str, int] | None:
+    """(native period, native bars per target bar) for a custom period.
+
+    Returns None for native periods; raises ValueError for unsupported ones.
+    """
+    if period in NATIVE_PERIODS:
+        return None
+    minutes = intraday_minutes(period)
+    if minutes:
+        base = next(m for m in _NATIVE_MINUTES if minutes % m == 0)
+        return _NATIVE_MINUTES[base], minutes // base
+    if period.endswith("d") and period[:-1].isdigit() and int(period[:-1]) > 0:
+        return "1d", int(period[:-1])
+    raise ValueError(
+        f"Unsupported period '{period}', expected one of {list(NATIVE_PERIODS)} or Nm / Nh / Nd"
+    )
+
+
+def _session_buckets(tod: np.ndarray, span: int) -> np.ndarray:
+    """Bucket number within the day of bars ending `tod` minutes after midnight.
+
+    Each session is cut every `span` minutes from its start, as in
+    periods.session_bar_closes. Bars before a session start (call auction)
+    join its first bucket; bars after the last session join the last one.
+    """
+    bucket = np.zeros(len(tod), dtype=np.int64)
+    after = np.ones(len(tod), dtype=bool)
+    for i, (start, end) in enumerate(SESSIONS):
+        start_min, end_min = start.hour * 60 + start.minute, end.hour * 60 + end.minute
+        mask = after if i == len(SESSIONS) - 1 else after & (tod <= end_min)
+        offset = np.clip(tod[mask] - start_min, 1, end_min - start_min)
+        bucket[mask] = i * 10_000 + (offset - 1) // span
+        after &= ~mask
+    return bucket
+
+
+def _bucket_starts(time: np.ndarray, factor: int, minutes: int | None) -> np.ndarray:
+    """Row index where each target bar begins.
+
+    Intraday buckets (native bars of `minutes`, labelled with their end
+    time) are session-aligned on fixed offsets from 09:30 and 13:00, so
+    boundaries do not depend on which bars were fetched and never span two
+    sessions. Multi-day buckets group every `factor` weekdays counted from a
+    fixed Monday.
+    """
+    local = time + _CST_OFFSET_MS
+    day = local // _DAY_MS
+    if minutes:
+        tod = (local % _DAY_MS) // 60_000
+        key = day * 100_000 + _session_buckets(tod, minutes * factor)
+    else:
+        key = np.busday_count(_NDAY_EPOCH, day.astype("datetime64[D]")) // factor
+    return np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+
+
+# Aggregation per column: "first" / "last" bar of the bucket, or a ufunc reduction
+_AGGREGATION = {
+    "time": "last",
+    "open": "first",
+    "high": np.fmax,
+    "low": np.fmin,
+    "close": "last",
+    "volume": np.add,
+    "amount": np.add,
+    "pre_close": "first",
+    "suspend_flag": np.minimum,
+    "settlement_price": "last",
+    "open_interest": "last",
+}
+
+
+def resample(arrays: dict[str, np.ndarray], factor: int, minutes: int | None) -> dict[str, np.ndarray]:
+    """Aggregate `factor` native bars into one target bar.
+
+    `minutes` is the native bar length for intraday periods, None for days.
+
+    open / pre_close take the first bar; close / settlement_price /
+    open_interest the last; high / low the NaN-ignoring max / min; volume and
+    amount are summed. suspend_flag is set only if every bar was suspended.
+    Each target bar is labelled with the time of its last native bar.
+    Only the columns present in `arrays` are aggregated.
+    """
+    n = len(arrays["time"])
+    if n == 0 or factor == 1:
+        return arrays
+    starts = _bucket_starts(arrays["time"], factor, minutes)
+    ends = np.r_[starts[1:], n] - 1
+
+    out = {}
+    for name, arr in arrays.items():
+        how = _AGGREGATION[name]
+        if how == "first":
+            out[name] = arr[starts]
+        elif how == "last":
+            out[name] = arr[ends]
+        else:
+            out[name] = how.reduceat(arr, starts)
+    return out
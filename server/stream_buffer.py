@@ -0,0 +1,119 @@
+"""Bounded per-stream buffers for server-streaming RPCs
+
+A streaming RPC drains its buffer from the gRPC worker thread while xtdata /
+xttrader callbacks fill it. When a client reads slower than data arrives,
+an unbounded queue grows without limit; a StreamBuffer holds at most
+`max_items` pending items. Below the cap every item is queued in order; a
+full buffer applies an overflow policy:
+
+    conflate     a new item replaces the newest pending item with the same
+                 key (e.g. stock code), keeping its place in line; an item
+                 with a key not pending drops the oldest item
+    drop_oldest  the oldest pending item is dropped
+    disconnect   nothing is dropped; the buffer is marked overflowed and
+                 the stream is expected to end
+
+Conflated and dropped counts are kept per buffer so the stream can report
+them to its client and to the server metrics.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable
+
+OVERFLOW_POLICIES = ("conflate", "drop_oldest", "disconnect")
+
+
+class StreamBuffer:
+    """Thread-safe bounded buffer of pending stream items.
+
+    Args:
+        max_items: Cap on pending items; 0 means unbounded.
+        policy: One of OVERFLOW_POLICIES.
+        key: item -> conflation key; required for "conflate".
+    """
+
+    def __init__(self, max_items: int = 0, policy: str = "drop_oldest", key: Callable | None = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}', expected one of {list(OVERFLOW_POLICIES)}")
+        if policy == "conflate" and key is None:
+            raise ValueError("The conflate policy needs a key function")
+        self.max_items = max_items
+        self.policy = policy
+        self._key = key
+        # conflate: {sequence number: item} plus the newest pending sequence number per key
+        self._items = OrderedDict() if policy == "conflate" else deque()
+        self._latest: dict = {}
+        self._seq = 0
+        self._ready = threading.Condition()
+        self.conflated = 0
+        self.dropped = 0
+        self.overflowed = False
+
+    def __len__(self) -> int:
+        with self._ready:
+            return len(self._items)
+
+    def put(self, items):
+        """Append items (in order), applying the overflow policy."""
+        with self._ready:
+            if self.overflowed:
+                return
+            for item in items:
+                if self.policy == "conflate":
+                    key = self._key(item)
+                    if self.max_items and len(self._items) >= self.max_items:
+                        seq = self._latest.get(key)
+                        if seq is not None:
+                            self._items[seq] = item
+                            self.conflated += 1
+                            continue
+                        old_seq, old = self._items.popitem(last=False)
+                        if self._latest.get(self._key(old)) == old_seq:
+                            del self._latest[self._key(old)]
+                        self.dropped += 1
+                    self._seq += 1
+                    self._items[self._seq] = item
+                    self._latest[key] = self._seq
+                elif self.max_items and len(self._items) >= self.max_items:
+                    if self.policy == "disconnect":
+                        self.overflowed = True
+                        self._items.clear()
+                        break
+                    self._items.popleft()
+                    self.dropped += 1
+                    self._items.append(item)
+                else:
+                    self._items.append(item)
+            self._ready.notify_all()
+
+    def get(self, timeout: float, linger: float = 0.0, enough: int = 0) -> list:
+        """Wait up to `timeout` seconds and take every pending item ([] if none).
+
+        With `linger`, once an item is pending keep waiting up to that many
+        seconds for more (the overflow policy still applies meanwhile), or
+        until `enough` items are pending. Returns [] at once once the buffer
+        has overflowed.
+        """
+        with self._ready:
+            if not self._items and not self.overflowed:
+                self._ready.wait(timeout)
+            if linger > 0 and self._items:
+                deadline = time.monotonic() + linger
+                while not self.overflowed and not (enough and len(self._items) >= enough):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+            if self.overflowed:
+                return []
+            items = list(self._items.values()) if self.policy == "conflate" else list(self._items)
+            self._items.clear()
+            self._latest.clear()
+            return items
+
+    def stats(self) -> tuple[int, int]:
+        """(conflated, dropped) so far."""
+        with self._ready:
+            return self.conflated, self.dropped
@@ -0,0 +1,177 @@
+"""Latest tick per code, with per-code versions for delta polling
+
+Live markets: the table attaches to the server's whole-quote hub (see
+server.quote_hub) for the configured markets ("SH", "SZ", ...), sharing the
+upstream subscribe_whole_quote with SubscribeWholeQuote streams. Every pushed
+tick arrives stamped with its receive time and is stored under its code, so GetFullTick can be answered
+from memory instead of calling xtdata.get_full_tick per request. After
+subscribing, the table is seeded with one get_full_tick of the markets, so
+instruments that have not ticked since (suspended, illiquid, pre-open) are
+present too; a market whose seed failed is answered by the caller. Codes the
+table has not seen (other markets) are reported as missing and left to the
+caller.
+
+Polled codes: ticks the caller fetched itself are recorded with `record`,
+which compares each tick with the previous poll of the code and keeps the
+old entry when nothing changed.
+
+Every new tick of a code gets the next value of one table-wide version
+counter, so "changed since version v" is simply `entry.version > v`. The
+counter starts at the table's creation time in microseconds, so versions
+handed out by an earlier server process are older than every current one.
+The raw tick dict is kept for columnar responses. Pushed ticks come with the
+TickSnapshot the hub built for all its subscribers; for polled ticks it is
+built on first use. Either is reused until the next tick of the code arrives.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from xtquant import xtdata
+
+logger = logging.getLogger(__name__)
+
+
+def _market(code: str) -> str:
+    """Market suffix of an instrument code ("600000.SH" -> "SH")."""
+    return code.rsplit(".", 1)[-1]
+
+
+class TickEntry:
+    """Latest tick of one code: raw xtdata dict, receive time, version and cached TickSnapshot."""
+
+    __slots__ = ("code", "tick", "received_at", "version", "snapshot")
+
+    def __init__(self, code: str, tick: dict, received_at: int, version: int = 0):
+        self.code = code
+        self.tick = tick
+        self.received_at = received_at
+        self.version = version
+        self.snapshot = None
+
+
+class TickTable:
+    """Latest tick per code for the subscribed markets and for polled codes.
+
+    Args:
+        markets: Market codes to attach to on the whole-quote hub, e.g. ["SH", "SZ"].
+            Empty: no subscription, only polled codes are versioned.
+        convert: (code, tick dict, received_at ms) -> TickSnapshot, used by
+            `snapshots` for ticks without one.
+    """
+
+    def __init__(self, markets, convert: Callable):
+        self.markets = tuple(markets)
+        self._convert = convert
+        self._ticks: dict[str, dict] = {market: {} for market in self.markets}
+        self._polled: dict[str, TickEntry] = {}
+        self._seeded: set[str] = set()
+        self._version = time.time_ns() // 1000
+        self._lock = threading.Lock()
+        self._hub = None
+        self._subscriber = None
+
+    @property
+    def version(self) -> int:
+        """Version of the newest tick in the table."""
+        with self._lock:
+            return self._version
+
+    def start(self, hub):
+        """Attach to the configured markets on a whole-quote QuoteHub, then seed.
+
+        The hub delivers its TickEntry batches to `put`. Raises RuntimeError
+        if the upstream subscription fails.
+        """
+        self._subscriber = hub.attach(self.markets, self)
+        self._hub = hub
+        logger.info("Tick table attached: %s", list(self.markets))
+        self._seed()
+
+    def _seed(self):
+        """Store a get_full_tick snapshot of the markets; pushed ticks already stored win."""
+        received_at = int(time.time() * 1000)
+        try:
+            datas = xtdata.get_full_tick(list(self.markets))
+        except Exception as e:
+            logger.warning("Tick table seed failed, markets stay with get_full_tick: %s", e)
+            return
+        with self._lock:
+            for code, tick in datas.items():
+                market = _market(code)
+                market_ticks = self._ticks.setdefault(market, {})
+                if code not in market_ticks:
+                    self._version += 1
+                    market_ticks[code] = TickEntry(code, tick, received_at, self._version)
+                self._seeded.add(market)
+        logger.info("Tick table seeded: %d instruments", len(datas))
+
+    def stop(self):
+        if self._subscriber is not None:
+            self._hub.detach(self._subscriber)
+            logger.info("Tick table detached: %s", list(self.markets))
+            self._subscriber = None
+
+    def put(self, entries: list[TickEntry]):
+        """Store a batch of pushed ticks (called by the hub, like StreamBuffer.put)."""
+        with self._lock:
+            for pushed in entries:
+                self._version += 1
+                entry = TickEntry(pushed.code, pushed.tick, pushed.received_at, self._version)
+                entry.snapshot = pushed.snapshot
+                self._ticks.setdefault(_market(pushed.code), {})[pushed.code] = entry
+
+    def record(self, datas: dict, received_at: int) -> dict[str, TickEntry]:
+        """Store ticks fetched by the caller; returns their entries in `datas` order.
+
+        A tick equal to the previous poll of its code keeps the previous
+        entry (and version), and so does one older than it (a concurrent
+        poll that finished late), so versions never move back in time.
+        """
+        entries = {}
+        with self._lock:
+            for code, tick in datas.items():
+                entry = self._polled.get(code)
+                if entry is None or (entry.tick != tick and (tick.get("time") or 0) >= (entry.tick.get("time") or 0)):
+                    self._version += 1
+                    entry = self._polled[code] = TickEntry(code, tick, received_at, self._version)
+                entries[code] = entry
+        return entries
+
+    def lookup(self, codes) -> tuple[dict[str, TickEntry], list[str]]:
+        """(live entries found, codes not served by the subscription).
+
+        A market code ("SH") expands to every instrument of that market in
+        the table; it is missing unless the market was seeded.
+        """
+        found, missing = {}, []
+        with self._lock:
+            for code in codes:
+                if code in self.markets:
+                    if code in self._seeded:
+                        found.update(self._ticks[code])
+                    else:
+                        missing.append(code)
+                    continue
+                entry = self._ticks.get(_market(code), {}).get(code)
+                if entry is None:
+                    missing.append(code)
+                else:
+                    found[code] = entry
+        return found, missing
+
+    def snapshots(self, entries: dict[str, TickEntry]) -> dict:
+        """{code: TickSnapshot} of looked-up entries, converting each tick at most once."""
+        out = {}
+        for code, entry in entries.items():
+            if entry.snapshot is None:
+                entry.snapshot = self._convert(code, entry.tick, entry.received_at)
+            out[code] = entry.snapshot
+        return out
+
+    def size(self) -> int:
+        """Live entries held for the subscribed markets."""
+        with self._lock:
+            return sum(len(market_ticks) for market_ticks in self._ticks.values())
@@ -4,7 +4,6 @@ Exposes xttrader trading APIs to remote gRPC clients,
 supporting order placement, cancellation, queries, and real-time event streaming.
 """
 
-import queue
 import logging
 import threading
 
@@ -13,9 +12,13 @@ from xtquant.xttrader import XtQuantTrader, XtQuantTraderCallback
 from xtquant.xttype import StockAccount
 
 from pb import xtquant_pb2, xtquant_pb2_grpc
+from .stream_buffer import StreamBuffer
 
 logger = logging.getLogger(__name__)
 
+# Pending events per SubscribeTrading stream before the stream is closed
+_MAX_PENDING_EVENTS = 10_000
+
 
 # ====================== Data Conversion Helpers ======================
 
@@ -82,27 +85,27 @@ def _position_to_pb(pos) -> xtquant_pb2.PositionInfo:
 class _TradingCallback(XtQuantTraderCallback):
     """Trading callback that forwards xttrader events to gRPC stream subscribers.
 
-    Manages subscribers as (account_id, queue) pairs, filtering events by account.
+    Manages subscribers as (account_id, buffer) pairs, filtering events by account.
     """
 
     def __init__(self):
         self._lock = threading.Lock()
-        self._subscribers: list[tuple[str, queue.Queue]] = []
+        self._subscribers: list[tuple[str, StreamBuffer]] = []
 
-    def add_subscriber(self, account_id: str, q: queue.Queue):
+    def add_subscriber(self, account_id: str, buffer: StreamBuffer):
         with self._lock:
-            self._subscribers.append((account_id, q))
+            self._subscribers.append((account_id, buffer))
 
-    def remove_subscriber(self, q: queue.Queue):
+    def remove_subscriber(self, buffer: StreamBuffer):
         with self._lock:
-            self._subscribers = [(a, sq) for a, sq in self._subscribers if sq is not q]
+            self._subscribers = [(a, sb) for a, sb in self._subscribers if sb is not buffer]
 
     def _broadcast(self, event: xtquant_pb2.TradingEvent, account_id: str = ""):
         """Broadcast event to matching subscribers."""
         with self._lock:
-            for sub_acc, sub_q in self._subscribers:
+            for sub_acc, sub_buffer in self._subscribers:
                 if not account_id or sub_acc == account_id:
-                    sub_q.put(event)
+                    sub_buffer.put([event])
 
     def on_disconnected(self):
         logger.warning("Trading connection lost")
@@ -147,9 +150,15 @@ class TradingServicer(xtquant_pb2_grpc.TradingServiceServicer):
 
     Connects to MiniQMT on initialization and registers trading callbacks.
     The service lifecycle matches the gRPC server.
+
+    Args:
+        max_pending_events: Events held per SubscribeTrading stream for a slow
+            client. Events are never dropped: a stream that exceeds the cap
+            receives a "stream_overflow" disconnected event and is closed.
     """
 
-    def __init__(self, mini_qmt_path: str, session_id: int):
+    def __init__(self, mini_qmt_path: str, session_id: int, max_pending_events: int = _MAX_PENDING_EVENTS):
+        self._max_pending_events = max_pending_events
         self._callback = _TradingCallback()
         self._subscribed_accounts: set[str] = set()
         self._lock = threading.Lock()
@@ -238,7 +247,10 @@ class TradingServicer(xtquant_pb2_grpc.TradingServiceServicer):
         """Subscribe to trading events (server stream)
 
         Pushes xttrader callback events to clients via gRPC streaming.
-        Each client connection gets its own event queue, filtered by account.
+        Each client connection gets its own bounded event buffer, filtered by
+        account. On overflow the client gets TradingEvent(disconnected=
+        "stream_overflow") and the stream ends with RESOURCE_EXHAUSTED; it
+        should resubscribe and re-query orders and trades.
         """
         acc = _make_account(request.account_id, request.account_type)
 
@@ -250,17 +262,22 @@ class TradingServicer(xtquant_pb2_grpc.TradingServiceServicer):
                     context.abort(grpc.StatusCode.INTERNAL, f"Failed to subscribe account (code={result})")
                 self._subscribed_accounts.add(request.account_id)
 
-        # Create event queue for this connection
-        event_queue: queue.Queue = queue.Queue()
-        self._callback.add_subscriber(request.account_id, event_queue)
+        # Create event buffer for this connection
+        buffer = StreamBuffer(self._max_pending_events, "disconnect")
+        self._callback.add_subscriber(request.account_id, buffer)
         logger.info("Client subscribed to trading events: %s", request.account_id)
 
-        while context.is_active():
-            try:
-                event = event_queue.get(timeout=1.0)
-                yield event
-            except queue.Empty:
-                continue
-
-        self._callback.remove_subscriber(event_queue)
-        logger.info("Client disconnected from trading events: %s", request.account_id)
+        try:
+            while context.is_active():
+                events = buffer.get(timeout=1.0)
+                if buffer.overflowed:
+                    logger.warning("Trading event stream overflow: %s", request.account_id)
+                    yield xtquant_pb2.TradingEvent(disconnected="stream_overflow")
+                    context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED,
+                        f"More than {self._max_pending_events} pending trading events: client too slow",
+                    )
+                yield from events
+        finally:
+            self._callback.remove_subscriber(buffer)
+            logger.info("Client disconnected from trading events: %s", request.account_id)
@@ -15,8 +15,10 @@ from xtquant import xtdata
 from pb import xtquant_pb2_grpc
 from server.market_data import MarketDataServicer
 
-# gRPC test server port
+# gRPC test server ports
 TEST_PORT = 50199
+CACHED_TEST_PORT = 50197
+MIRROR_TEST_PORT = 50196
 
 
 @pytest.fixture(scope="session")
@@ -59,3 +61,38 @@ def grpc_channel(grpc_server):
 def market_stub(grpc_channel):
     """MarketDataService gRPC stub."""
     return xtquant_pb2_grpc.MarketDataServiceStub(grpc_channel)
+
+
+@pytest.fixture(scope="session")
+def cached_market_stub(ensure_xtdata_connected):
+    """MarketDataService stub backed by a server with the kline cache enabled.
+
+    Also fetches in parallel one-stock shards, so multi-stock requests
+    exercise the fan-out / merge path, and gzip-compresses responses over 4 KB.
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    servicer = MarketDataServicer(
+        kline_cache_bytes=256 * 1024 * 1024, fetch_workers=2, shard_size=1,
+        compression="gzip", compression_min_bytes=4096,
+    )
+    xtquant_pb2_grpc.add_MarketDataServiceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{CACHED_TEST_PORT}")
+    server.start()
+    channel = grpc.insecure_channel(f"localhost:{CACHED_TEST_PORT}")
+    yield xtquant_pb2_grpc.MarketDataServiceStub(channel)
+    channel.close()
+    server.stop(grace=2)
+
+
+@pytest.fixture(scope="session")
+def mirror_market_stub(ensure_xtdata_connected, tmp_path_factory):
+    """MarketDataService stub backed by a server with a kline mirror in a temp directory."""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    servicer = MarketDataServicer(mirror_dir=str(tmp_path_factory.mktemp("mirror")))
+    xtquant_pb2_grpc.add_MarketDataServiceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{MIRROR_TEST_PORT}")
+    server.start()
+    channel = grpc.insecure_channel(f"localhost:{MIRROR_TEST_PORT}")
+    yield xtquant_pb2_grpc.MarketDataServiceStub(channel)
+    channel.close()
+    server.stop(grace=2)
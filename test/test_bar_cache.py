@@ -0,0 +1,142 @@
+"""Kline cache tests — LRU byte budget, expiry, and period/time helpers
+
+Pure in-process checks (xtdata patched for the refresh test); no MiniQMT
+connection needed.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from pb import xtquant_pb2
+from server.bar_cache import BarCache, merge_tail
+from server.market_data import MarketDataServicer
+from server.periods import (
+    CST, format_time_ms, intraday_minutes, last_closed_day, next_bar_close, next_session_open, parse_time_ms,
+    session_bar_closes,
+)
+from test.test_columnar import make_kline_frame
+
+
+def make_arrays(n):
+    return {"time": np.arange(n, dtype=np.int64), "close": np.ones(n)}
+
+
+def local_ts(*args):
+    return datetime(*args, tzinfo=CST).timestamp()
+
+
+class TestBarCache:
+    """BarCache LRU behaviour"""
+
+    def test_hit_and_expiry(self):
+        """Expired entries are still returned, flagged stale"""
+        cache = BarCache(1024)
+        cache.put(("600000.SH", "1d"), make_arrays(4), expires_at=100.0)
+        arrays, fresh = cache.lookup(("600000.SH", "1d"), now=50.0)
+        assert arrays is not None and fresh
+        arrays, fresh = cache.lookup(("600000.SH", "1d"), now=100.0)
+        assert arrays is not None and not fresh
+        assert cache.lookup(("000001.SZ", "1d"), now=0) == (None, False)
+        stats = cache.stats()
+        assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = BarCache(3 * 64)  # each entry: 4 rows * 16 bytes = 64 bytes
+        for code in ["A", "B", "C"]:
+            cache.put((code,), make_arrays(4), expires_at=1e12)
+        cache.lookup(("A",), now=0)  # A becomes most recently used
+        cache.put(("D",), make_arrays(4), expires_at=1e12)
+        assert cache.lookup(("B",), now=0)[0] is None
+        assert cache.lookup(("A",), now=0)[0] is not None
+        assert cache.stats()["bytes"] <= 3 * 64
+
+    def test_oversized_entry_not_cached(self):
+        cache = BarCache(10)
+        cache.put(("A",), make_arrays(4), expires_at=1e12)
+        assert cache.lookup(("A",), now=0)[0] is None
+
+    def test_merge_tail_replaces_forming_bar(self):
+        """Tail rows overwrite cached rows from the first tail timestamp on"""
+        cached = {"time": np.array([1, 2, 3]), "close": np.array([1.0, 2.0, 3.0])}
+        tail = {"time": np.array([3, 4]), "close": np.array([3.5, 4.0])}
+        merged = merge_tail(cached, tail)
+        assert merged["time"].tolist() == [1, 2, 3, 4]
+        assert merged["close"].tolist() == [1.0, 2.0, 3.5, 4.0]
+        empty = {"time": np.array([], dtype=np.int64), "close": np.array([])}
+        assert merge_tail(cached, empty) is cached
+
+
+class TestPeriods:
+    """Period and time helpers"""
+
+    def test_intraday_minutes(self):
+        assert intraday_minutes("1m") == 1
+        assert intraday_minutes("15m") == 15
+        assert intraday_minutes("1h") == 60
+        assert intraday_minutes("1d") is None
+        assert intraday_minutes("tick") is None
+
+    def test_parse_time_ms(self):
+        assert parse_time_ms("") is None
+        assert parse_time_ms("20240102") == int(local_ts(2024, 1, 2) * 1000)
+        assert parse_time_ms("20240102", end=True) == int(local_ts(2024, 1, 3) * 1000) - 1
+        assert parse_time_ms("20240102093000") == int(local_ts(2024, 1, 2, 9, 30) * 1000)
+
+    def test_format_time_ms(self):
+        ms = parse_time_ms("20240102093000")
+        assert format_time_ms(ms) == "20240102093000"
+
+    def test_session_bar_closes(self):
+        assert session_bar_closes(60) == (630, 690, 840, 900)  # 10:30 11:30 14:00 15:00
+        assert session_bar_closes(120) == (690, 900)
+        assert session_bar_closes(1)[:2] == (571, 572)
+
+    def test_next_bar_close(self):
+        assert next_bar_close("5m", local_ts(2024, 1, 2, 9, 31, 10)) == local_ts(2024, 1, 2, 9, 35)
+        # 1h bars are session-aligned, not hour-aligned
+        assert next_bar_close("1h", local_ts(2024, 1, 2, 10, 40)) == local_ts(2024, 1, 2, 11, 30)
+        assert next_bar_close("1h", local_ts(2024, 1, 2, 12, 0)) == local_ts(2024, 1, 2, 14, 0)
+        assert next_bar_close("5m", local_ts(2024, 1, 2, 15, 2)) == local_ts(2024, 1, 3, 9, 15)
+        assert next_bar_close("1d", local_ts(2024, 1, 2, 8, 0)) == local_ts(2024, 1, 2, 9, 15)
+        # Today's daily bar is forming during the session: kept for one minute at most
+        assert next_bar_close("1d", local_ts(2024, 1, 2, 10, 0, 30)) == local_ts(2024, 1, 2, 10, 1)
+        assert next_bar_close("1w", local_ts(2024, 1, 2, 12, 0)) == local_ts(2024, 1, 2, 13, 1)
+        assert next_bar_close("1d", local_ts(2024, 1, 2, 16, 0)) == local_ts(2024, 1, 3, 9, 15)
+
+    def test_last_closed_day(self):
+        assert last_closed_day(int(local_ts(2024, 1, 3, 10, 30) * 1000)) == "20240102"
+        assert last_closed_day(int(local_ts(2024, 1, 3, 15, 0) * 1000)) == "20240103"
+
+    def test_next_session_open(self):
+        assert next_session_open(local_ts(2024, 1, 2, 8, 0)) == local_ts(2024, 1, 2, 9, 15)
+        assert next_session_open(local_ts(2024, 1, 2, 10, 0)) == local_ts(2024, 1, 3, 9, 15)
+
+
+class TestTailRefresh:
+    """Expired cache entries refetch only the bars after their last one"""
+
+    def test_grouped_by_last_bar(self):
+        day = 86_400_000
+        frames = {
+            "600000.SH": make_kline_frame(10),
+            "000001.SZ": make_kline_frame(10),
+            "600001.SH": make_kline_frame(3),  # suspended: last bar a week earlier
+        }
+        servicer = MarketDataServicer(kline_cache_bytes=1 << 20)
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=list(frames), period="1d", count=2)
+        with patch("server.market_data.xtdata") as xtdata, \
+                patch("server.market_data.next_bar_close", return_value=0):  # entries expire at once
+            xtdata.get_market_data_ex.side_effect = lambda fields, codes, **kw: {c: frames[c] for c in codes}
+            servicer.GetMarketData(request, MagicMock())
+            xtdata.get_market_data_ex.reset_mock()
+            servicer.GetMarketData(request, MagicMock())
+        starts = {
+            call.kwargs["start_time"]: sorted(call.args[1]) for call in xtdata.get_market_data_ex.call_args_list
+        }
+        last = int(frames["600000.SH"]["time"].iloc[-1])
+        assert starts == {
+            format_time_ms(last): ["000001.SZ", "600000.SH"],
+            format_time_ms(last - 7 * day): ["600001.SH"],
+        }
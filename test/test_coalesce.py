@@ -0,0 +1,137 @@
+"""Request coalescing tests — identical concurrent requests share one xtdata call
+
+Uses a patched xtdata module; no MiniQMT connection needed.
+"""
+
+import threading
+import time
+from concurrent import futures
+from unittest.mock import MagicMock, patch
+
+import grpc
+import pytest
+
+from pb import xtquant_pb2, xtquant_pb2_grpc
+from server.coalesce import Singleflight
+from server.market_data import MarketDataServicer, _coalesced
+from server.metrics import Metrics
+
+COALESCE_TEST_PORT = 50195
+
+
+def slow(result, delay=0.3):
+    def call(*args, **kwargs):
+        time.sleep(delay)
+        return result
+    return call
+
+
+@pytest.fixture(scope="module")
+def coalesce_stub():
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+    servicer = MarketDataServicer()
+    xtquant_pb2_grpc.add_MarketDataServiceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{COALESCE_TEST_PORT}")
+    server.start()
+    channel = grpc.insecure_channel(f"localhost:{COALESCE_TEST_PORT}")
+    yield xtquant_pb2_grpc.MarketDataServiceStub(channel)
+    channel.close()
+    server.stop(grace=2)
+
+
+def run_concurrently(fn, n=8):
+    with futures.ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(fn) for _ in range(n)]]
+
+
+class TestCoalescedRpc:
+    """Identical concurrent requests over gRPC"""
+
+    def test_full_tick_single_xtdata_call(self, coalesce_stub):
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.get_full_tick.side_effect = slow({"600000.SH": {"lastPrice": 10.5}})
+            request = xtquant_pb2.GetFullTickRequest(stock_codes=["600000.SH"])
+            responses = run_concurrently(lambda: coalesce_stub.GetFullTick(request))
+        assert xtdata.get_full_tick.call_count == 1
+        assert all(r.ticks["600000.SH"].last_price == 10.5 for r in responses)
+        values = coalesce_stub.GetServerMetrics(xtquant_pb2.Empty()).values
+        assert values["coalesce.GetFullTick.leaders"] + values["coalesce.GetFullTick.coalesced"] == 8
+
+    def test_different_requests_not_coalesced(self, coalesce_stub):
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.get_full_tick.side_effect = slow({})
+            codes = iter(["600000.SH", "000001.SZ"])
+            lock = threading.Lock()
+
+            def call():
+                with lock:
+                    code = next(codes)
+                return coalesce_stub.GetFullTick(xtquant_pb2.GetFullTickRequest(stock_codes=[code]))
+            run_concurrently(call, n=2)
+        assert xtdata.get_full_tick.call_count == 2
+
+    def test_leader_error_shared(self, coalesce_stub):
+        with patch("server.market_data.xtdata") as xtdata:
+            def fail(*args, **kwargs):
+                time.sleep(0.3)
+                raise KeyError("boom")
+            xtdata.get_financial_data.side_effect = fail
+            request = xtquant_pb2.GetFinancialDataRequest(stock_codes=["600000.SH"])
+
+            def call():
+                with pytest.raises(grpc.RpcError) as exc:
+                    coalesce_stub.GetFinancialData(request)
+                return exc.value.code()
+            codes = run_concurrently(call, n=4)
+        assert xtdata.get_financial_data.call_count == 1
+        assert set(codes) == {grpc.StatusCode.UNKNOWN}
+
+
+class _AbortError(Exception):
+    pass
+
+
+class FakeContext:
+    """Minimal ServicerContext: abort() records the status and raises."""
+
+    def __init__(self):
+        self._code, self._details = None, None
+
+    def abort(self, code, details):
+        self._code, self._details = code, details
+        raise _AbortError()
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+class TestCoalescedDecorator:
+    """_coalesced status propagation"""
+
+    def test_followers_abort_with_leader_status(self):
+        class Servicer:
+            _singleflight = Singleflight()
+            _metrics = Metrics()
+            _compressor = MagicMock()
+
+            @_coalesced()
+            def Get(self, request, context):
+                time.sleep(0.3)
+                context.abort(grpc.StatusCode.NOT_FOUND, "no such code")
+
+        servicer = Servicer()
+        contexts = [FakeContext() for _ in range(4)]
+        request = xtquant_pb2.GetFullTickRequest(stock_codes=["600000.SH"])
+
+        def call(context):
+            with pytest.raises(_AbortError):
+                servicer.Get(request, context)
+
+        with futures.ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(call, contexts))
+        assert {(c.code(), c.details()) for c in contexts} == {(grpc.StatusCode.NOT_FOUND, "no such code")}
+        assert servicer._metrics.snapshot()["coalesce.Get.leaders"] == 1
+        assert servicer._singleflight.in_flight() == 0
@@ -0,0 +1,235 @@
+"""Columnar conversion tests — DataFrame -> NumPy arrays -> GetMarketDataResponse
+
+Pure data-conversion checks on synthetic frames; no MiniQMT connection needed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from server.columnar import (
+    KlineColumns, TickColumns, _depth_matrix, decode_compact, delta_of_delta, financial_to_arrow, frame_to_arrays, kline_fields,
+    row_count, slice_rows, snapshot_columns, tick_frame_to_arrays, undo_delta_of_delta, xtdata_field_list,
+)
+
+
+def make_kline_frame(n=5, start_ms=1704067200000, step_ms=86400000):
+    """Build a DataFrame shaped like xtdata.get_market_data_ex output."""
+    close = 10.0 + np.arange(n) * 0.1
+    return pd.DataFrame({
+        "time": start_ms + step_ms * np.arange(n),
+        "open": close - 0.05,
+        "high": close + 0.1,
+        "low": close - 0.1,
+        "close": close,
+        "volume": np.arange(n, dtype=float) * 100,
+        "amount": np.arange(n, dtype=float) * 1000,
+        "preClose": np.r_[np.nan, close[:-1]][:n],
+        "suspendFlag": [0] * n,
+    })
+
+
+class TestFrameToArrays:
+    """frame_to_arrays conversion"""
+
+    def test_dtypes_and_zero_fill(self):
+        """Missing / NaN columns are zero-filled with the response dtypes"""
+        arrays = frame_to_arrays(make_kline_frame(3))
+        assert arrays["time"].dtype == np.int64
+        assert arrays["suspend_flag"].dtype == np.int32
+        assert arrays["pre_close"][0] == 0.0
+        assert not arrays["settlement_price"].any()
+        assert row_count(arrays) == 3
+
+    def test_slice_rows(self):
+        arrays = frame_to_arrays(make_kline_frame(5))
+        part = slice_rows(arrays, 1, 3)
+        assert row_count(part) == 2
+        assert part["time"][0] == arrays["time"][1]
+
+
+class TestKlineFields:
+    """Column projection"""
+
+    def test_projection_order_and_time(self):
+        """Fields come back in response column order; include_time adds 'time'"""
+        assert kline_fields(["close", "open"]) == ("open", "close")
+        assert kline_fields(["close"], include_time=True) == ("time", "close")
+        assert xtdata_field_list(kline_fields(["pre_close"], include_time=True)) == ["time", "preClose"]
+        assert xtdata_field_list(kline_fields([])) == []
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            kline_fields(["close", "vwap"])
+
+    def test_projected_build(self):
+        """Unrequested columns are left empty in every encoding"""
+        fields = kline_fields(["time", "close"])
+        arrays = frame_to_arrays(make_kline_frame(3), fields)
+        assert set(arrays) == {"time", "close"}
+        repeated, packed = KlineColumns(fields=fields), KlineColumns("packed", fields=fields)
+        repeated.add("600000.SH", arrays)
+        packed.add("600000.SH", arrays)
+        r, p = repeated.build(), packed.build()
+        assert len(r.close) == 3 and len(r.open) == 0
+        assert p.packed.close and not p.packed.volume
+
+
+class TestKlineColumns:
+    """KlineColumns response builder"""
+
+    def test_build_multiple_stocks(self):
+        columns = KlineColumns()
+        columns.add("600000.SH", frame_to_arrays(make_kline_frame(3)))
+        columns.add("000001.SZ", frame_to_arrays(make_kline_frame(2)))
+        columns.add("000002.SZ", frame_to_arrays(make_kline_frame(0)))
+        resp = columns.build()
+        assert list(resp.stock_code) == ["600000.SH"] * 3 + ["000001.SZ"] * 2
+        assert len(resp.time) == len(resp.close) == len(resp.open_interest) == 5
+        assert columns.rows == 5
+
+    def test_packed_round_trip(self):
+        """encoding="packed" buffers decode to the same values as repeated fields"""
+        arrays = frame_to_arrays(make_kline_frame(4))
+        repeated, packed = KlineColumns(), KlineColumns("packed")
+        repeated.add("600000.SH", arrays)
+        packed.add("600000.SH", arrays)
+        r, p = repeated.build(), packed.build()
+
+        assert len(p.close) == 0
+        assert list(p.stock_code) == list(r.stock_code)
+        assert np.frombuffer(p.packed.time, "<i8").tolist() == list(r.time)
+        assert np.frombuffer(p.packed.close, "<f8").tolist() == list(r.close)
+        assert np.frombuffer(p.packed.suspend_flag, "<i4").tolist() == list(r.suspend_flag)
+
+    def test_dict_codes(self):
+        """dict_codes emits one (code, rows) run per stock instead of per-row codes"""
+        columns = KlineColumns(dict_codes=True)
+        columns.add("600000.SH", frame_to_arrays(make_kline_frame(3)))
+        columns.add("000001.SZ", frame_to_arrays(make_kline_frame(2)))
+        resp = columns.build()
+        assert len(resp.stock_code) == 0
+        assert list(resp.code_table) == ["600000.SH", "000001.SZ"]
+        assert list(resp.code_rows) == [3, 2]
+        codes = np.repeat(np.arange(len(resp.code_table)), resp.code_rows)
+        assert len(codes) == len(resp.time)
+
+    def test_arrow_round_trip(self):
+        """encoding="arrow" yields one IPC stream with a record batch per stock"""
+        pa = pytest.importorskip("pyarrow")
+        columns = KlineColumns("arrow")
+        columns.add("600000.SH", frame_to_arrays(make_kline_frame(3)))
+        columns.add("000001.SZ", frame_to_arrays(make_kline_frame(2)))
+        resp = columns.build()
+
+        reader = pa.ipc.open_stream(resp.arrow_ipc)
+        batches = list(reader)
+        assert [b.num_rows for b in batches] == [3, 2]
+        df = pa.Table.from_batches(batches).to_pandas()
+        assert df["stock_code"].astype(str).tolist() == ["600000.SH"] * 3 + ["000001.SZ"] * 2
+        assert df["close"].tolist() == make_kline_frame(3)["close"].tolist() + make_kline_frame(2)["close"].tolist()
+
+
+class TestCompactEncoding:
+    """encoding="compact" — delta-of-delta time, prices in ticks"""
+
+    def test_delta_of_delta_round_trip(self):
+        for n in (0, 1, 2, 7):
+            t = 1704067200000 + 60000 * np.arange(n, dtype=np.int64)
+            t[n // 2:] += 3600000  # a session gap
+            assert undo_delta_of_delta(delta_of_delta(t)).tolist() == t.tolist()
+
+    def test_round_trip_tick_aligned(self):
+        arrays = frame_to_arrays(make_kline_frame(50))
+        columns = KlineColumns("compact", price_tick=lambda code: 0.01)
+        columns.add("600000.SH", arrays)
+        block = columns.build().compact[0]
+        assert block.price_tick == 0.01 and block.rows == 50
+        assert max(abs(v) for v in block.time[2:]) == 0
+        decoded = decode_compact(block)
+        assert decoded["time"].tolist() == arrays["time"].tolist()
+        for name in ("open", "high", "low", "close", "pre_close"):
+            np.testing.assert_allclose(decoded[name], arrays[name], rtol=0, atol=1e-9)
+        np.testing.assert_array_equal(decoded["volume"], arrays["volume"])
+
+    def test_unaligned_prices_fall_back_to_raw(self):
+        """Adjusted (non tick-aligned) prices are sent as raw doubles"""
+        arrays = frame_to_arrays(make_kline_frame(5))
+        arrays["close"] = arrays["close"] * 0.987654
+        columns = KlineColumns("compact", price_tick=lambda code: 0.01)
+        columns.add("600000.SH", arrays)
+        block = columns.build().compact[0]
+        assert block.price_tick == 0 and len(block.close) == 0
+        np.testing.assert_array_equal(decode_compact(block)["close"], arrays["close"])
+
+    def test_smaller_than_repeated(self):
+        arrays = frame_to_arrays(make_kline_frame(2000, step_ms=60000))
+        repeated, compact = KlineColumns(), KlineColumns("compact", price_tick=lambda code: 0.01)
+        repeated.add("600000.SH", arrays)
+        compact.add("600000.SH", arrays)
+        ratio = repeated.build().ByteSize() / compact.build().ByteSize()
+        print(f"\n  repeated / compact size: {ratio:.1f}x")
+        assert ratio > 2
+
+
+class TestTickColumns:
+    """Tick history conversion"""
+
+    def test_depth_matrix_ragged(self):
+        """Short rows are zero-padded, extra levels dropped"""
+        matrix = _depth_matrix([[1, 2, 3, 4, 5], [1, 2], [1, 2, 3, 4, 5, 6]])
+        assert matrix.shape == (3, 5)
+        assert matrix[1].tolist() == [1, 2, 0, 0, 0]
+        assert matrix[2, -1] == 5
+
+    def test_build_round_trip(self):
+        df = pd.DataFrame({
+            "time": [1, 2, 3], "lastPrice": [10.0, 10.01, 10.02], "volume": [1, 2, 3], "amount": [10.0, 20.0, 30.0],
+            "bidPrice": [[9.99, 9.98, 9.97, 9.96, 9.95]] * 3, "askPrice": [[10.01, 10.02]] * 3,
+            "bidVol": [[1, 2, 3, 4, 5]] * 3, "askVol": [[5, 4, 3, 2, 1]] * 3,
+        })
+        columns = TickColumns()
+        columns.add("600000.SH", tick_frame_to_arrays(df))
+        columns.add("000001.SZ", slice_rows(tick_frame_to_arrays(df), 0, 1))
+        chunk = columns.build()
+        assert list(chunk.code_rows) == [3, 1]
+        assert np.frombuffer(chunk.time, "<i8").tolist() == [1, 2, 3, 1]
+        ask = np.frombuffer(chunk.ask_price, "<f8").reshape(-1, chunk.depth)
+        assert ask[0].tolist() == [10.01, 10.02, 0, 0, 0]
+
+    def test_snapshot_columns(self):
+        """Full-tick dicts -> parallel columns; missing keys and levels become 0"""
+        ticks = [
+            {"time": 5, "lastPrice": 10.5, "lastClose": 10.0, "bidPrice": [10.49, 10.48], "bidVol": [1, 2, 3, 4, 5]},
+            {"time": 6, "lastPrice": 20.0, "volume": None},
+        ]
+        columns = snapshot_columns(["600000.SH", "000001.SZ"], ticks, [100, 200])
+        assert list(columns.stock_code) == ["600000.SH", "000001.SZ"]
+        assert np.frombuffer(columns.time, "<i8").tolist() == [5, 6]
+        assert np.frombuffer(columns.last_price, "<f8").tolist() == [10.5, 20.0]
+        assert np.frombuffer(columns.volume, "<f8").tolist() == [0, 0]
+        assert np.frombuffer(columns.received_at, "<i8").tolist() == [100, 200]
+        bid = np.frombuffer(columns.bid_price, "<f8").reshape(-1, columns.depth)
+        assert bid.tolist() == [[10.49, 10.48, 0, 0, 0], [0, 0, 0, 0, 0]]
+        assert np.frombuffer(columns.bid_volume, "<f8").reshape(-1, columns.depth)[0].tolist() == [1, 2, 3, 4, 5]
+
+    def test_snapshot_columns_empty(self):
+        columns = snapshot_columns([], [], [])
+        assert len(columns.stock_code) == 0
+        assert np.frombuffer(columns.ask_price, "<f8").size == 0
+
+
+class TestFinancialToArrow:
+    """financial_to_arrow conversion"""
+
+    def test_tables_promoted_across_stocks(self):
+        """Per-table streams share one schema even when stock frames differ"""
+        pa = pytest.importorskip("pyarrow")
+        data = {
+            "600000.SH": {"Balance": pd.DataFrame({"m_timetag": ["20240331"], "total_assets": [1.5]})},
+            "000001.SZ": {"Balance": pd.DataFrame({"m_timetag": ["20240331", "20240630"], "total_assets": [2, 3]})},
+        }
+        tables = financial_to_arrow(data)
+        table = pa.ipc.open_stream(tables["Balance"]).read_all()
+        assert table.column("stock_code").to_pylist() == ["600000.SH", "000001.SZ", "000001.SZ"]
+        assert table.column("total_assets").to_pylist() == [1.5, 2.0, 3.0]
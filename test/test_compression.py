@@ -0,0 +1,72 @@
+"""Response compression tests — per-response choice and metrics
+
+Uses a mocked grpc.ServicerContext; no MiniQMT connection needed.
+"""
+
+from unittest.mock import MagicMock
+
+import grpc
+import pytest
+
+from pb import xtquant_pb2
+from server.compression import ResponseCompressor, compression_ratios
+
+
+def make_response(n):
+    return xtquant_pb2.GetMarketDataResponse(
+        stock_code=["600000.SH"] * n, time=list(range(n)), close=[10.0] * n,
+    )
+
+
+class TestResponseCompressor:
+    """ResponseCompressor.apply"""
+
+    def test_threshold(self):
+        compressor = ResponseCompressor("gzip", min_bytes=1024, sample_every=1)
+        small, large = MagicMock(), MagicMock()
+        compressor.apply(small, "GetMarketData", make_response(5))
+        compressor.apply(large, "GetMarketData", make_response(1000))
+        small.set_compression.assert_not_called()
+        large.set_compression.assert_called_once_with(grpc.Compression.Gzip)
+
+        compressor.close()  # let the background sample finish
+        values = compressor.metrics.snapshot()
+        assert values["compression.GetMarketData.responses"] == 2
+        assert values["compression.GetMarketData.compressed"] == 1
+        ratios = compression_ratios(values)
+        assert ratios["compression.GetMarketData.ratio"] > 1
+
+    def test_streaming_decided_before_first_chunk(self):
+        compressor = ResponseCompressor("deflate", min_bytes=1024)
+        context = MagicMock()
+        compressor.start_stream(context)
+        context.set_compression.assert_called_once_with(grpc.Compression.Deflate)
+        compressor.apply(context, "StreamMarketData", make_response(5), streaming=True)
+        compressor.apply(context, "StreamMarketData", make_response(1000), streaming=True)
+        context.set_compression.assert_called_once()
+        context.disable_next_message_compression.assert_called_once()
+        values = compressor.metrics.snapshot()
+        assert values["compression.StreamMarketData.responses"] == 2
+        assert values["compression.StreamMarketData.compressed"] == 1
+
+    def test_none_does_nothing(self):
+        compressor = ResponseCompressor()
+        context = MagicMock()
+        response = MagicMock()
+        compressor.start_stream(context)
+        compressor.apply(context, "GetFinancialData", response)
+        context.set_compression.assert_not_called()
+        response.ByteSize.assert_not_called()
+        assert compressor.metrics.snapshot() == {}
+
+    def test_sample_skipped_while_busy(self):
+        compressor = ResponseCompressor("gzip", min_bytes=0, sample_every=1)
+        compressor._sampling.acquire()
+        compressor.apply(MagicMock(), "GetMarketData", make_response(10))
+        compressor._sampling.release()
+        compressor.close()
+        assert "compression.GetMarketData.sample_bytes_in" not in compressor.metrics.snapshot()
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            ResponseCompressor("zstd")
@@ -0,0 +1,98 @@
+"""Dividend adjustment tests — adjusted klines computed from raw bars + ex-rights factors
+
+Pure array checks; no MiniQMT connection needed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from server.dividends import adjust, factors_from_frame
+
+DAY_MS = 86_400_000
+
+
+def make_raw(n=6):
+    close = np.array([10.0, 10.2, 9.0, 9.1, 7.0, 7.2])[:n]
+    return {
+        "time": DAY_MS * np.arange(n, dtype=np.int64),
+        "close": close,
+        "pre_close": np.r_[0.0, close[:-1]],
+        "volume": np.full(n, 100.0),
+    }
+
+
+def make_factors():
+    """Two ex-dates: a cash dividend on day 2, a bonus share issue on day 4."""
+    return factors_from_frame(pd.DataFrame({
+        "time": [4 * DAY_MS, 2 * DAY_MS],  # unsorted on purpose
+        "interest": [0.0, 1.0],
+        "stockBonus": [0.3, 0.0],
+        "stockGift": [0.0, 0.0],
+        "allotNum": [0.0, 0.0],
+        "allotPrice": [0.0, 0.0],
+        "dr": [1.3, 1.1],
+    }))
+
+
+def front_one_by_one(v, t, factors):
+    """Reference: apply each later event in turn, as xtdata does."""
+    out = v.copy()
+    for et, scale, cash in zip(factors["time"], factors["scale"], factors["cash"]):
+        before = t < et
+        out[before] = (out[before] - cash) / scale
+    return out
+
+
+class TestAdjust:
+    """adjust() for each dividend_type"""
+
+    def test_none_is_identity(self):
+        raw = make_raw()
+        assert adjust(raw, make_factors(), "none") is raw
+
+    def test_front_matches_event_by_event(self):
+        raw, factors = make_raw(), make_factors()
+        out = adjust(raw, factors, "front")
+        expected = front_one_by_one(raw["close"], raw["time"], factors)
+        np.testing.assert_allclose(out["close"], expected)
+        assert out["close"][-1] == raw["close"][-1]  # latest bars unchanged
+        np.testing.assert_array_equal(out["volume"], raw["volume"])
+        assert out["pre_close"][0] == 0.0  # zero marker kept
+
+    def test_back_inverts_front(self):
+        """Front-adjusting the back-adjusted series through every event gives the front series"""
+        raw, factors = make_raw(), make_factors()
+        front = adjust(raw, factors, "front")["close"]
+        back = adjust(raw, factors, "back")["close"]
+        assert back[0] == raw["close"][0]
+        before_all = np.full(len(back), -1)
+        np.testing.assert_allclose(front_one_by_one(back, before_all, factors), front)
+
+    def test_ratios(self):
+        raw, factors = make_raw(), make_factors()
+        front = adjust(raw, factors, "front_ratio")["close"]
+        back = adjust(raw, factors, "back_ratio")["close"]
+        np.testing.assert_allclose(front[:2], raw["close"][:2] / (1.1 * 1.3))
+        np.testing.assert_allclose(front[2:4], raw["close"][2:4] / 1.3)
+        np.testing.assert_allclose(back[4:], raw["close"][4:] * 1.1 * 1.3)
+        np.testing.assert_allclose(back / front, 1.1 * 1.3)
+
+    def test_input_not_modified(self):
+        raw, factors = make_raw(), make_factors()
+        before = raw["close"].copy()
+        adjust(raw, factors, "back")
+        np.testing.assert_array_equal(raw["close"], before)
+
+    def test_no_events(self):
+        raw = make_raw()
+        assert adjust(raw, factors_from_frame(pd.DataFrame()), "front") is raw
+
+
+class TestFactorsFromFrame:
+    def test_index_dates_without_time_column(self):
+        df = pd.DataFrame({"interest": [0.5], "dr": [1.05]}, index=["20240620"])
+        factors = factors_from_frame(df)
+        assert factors["time"].tolist() == [1718812800000]
+        assert factors["scale"].tolist() == [1.0]
+        assert factors["cash"].tolist() == [pytest.approx(0.5)]
@@ -10,9 +10,12 @@ import json
 import time
 import threading
 
+import grpc
+import numpy as np
 import pytest
 
 from pb import xtquant_pb2, xtquant_pb2_grpc
+from server.columnar import decode_compact
 
 
 class TestGetMarketData:
@@ -71,6 +74,355 @@ class TestGetMarketData:
         assert "000001.SZ" in resp.data
         print(f"\n  000001.SZ 1m kline count: {len(resp.data['000001.SZ'].bars)}")
 
+    def test_packed_encoding(self, market_stub):
+        """encoding="packed" returns the same values as raw column buffers"""
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH"], period="1d", count=20)
+        plain = market_stub.GetMarketData(request)
+        request.encoding = "packed"
+        packed = market_stub.GetMarketData(request)
+        assert np.frombuffer(packed.packed.time, "<i8").tolist() == list(plain.time)
+        assert np.frombuffer(packed.packed.close, "<f8").tolist() == list(plain.close)
+        print(f"\n  repeated={plain.ByteSize()}B packed={packed.ByteSize()}B")
+
+    def test_arrow_encoding(self, market_stub):
+        """encoding="arrow" returns an IPC stream with one batch per stock"""
+        pa = pytest.importorskip("pyarrow")
+        codes = ["600000.SH", "000001.SZ"]
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=codes, period="1d", count=10)
+        plain = market_stub.GetMarketData(request)
+        request.encoding = "arrow"
+        resp = market_stub.GetMarketData(request)
+        table = pa.ipc.open_stream(resp.arrow_ipc).read_all()
+        assert table.column("time").to_pylist() == list(plain.time)
+        assert [str(c) for c in table.column("stock_code").to_pylist()] == list(plain.stock_code)
+
+    def test_dict_stock_code(self, market_stub):
+        """dict_stock_code=True expands back to the plain stock_code column"""
+        codes = ["600000.SH", "000001.SZ"]
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=codes, period="1d", count=10)
+        plain = market_stub.GetMarketData(request)
+        request.dict_stock_code = True
+        encoded = market_stub.GetMarketData(request)
+        assert len(encoded.stock_code) == 0
+        expanded = np.repeat(list(encoded.code_table), list(encoded.code_rows))
+        assert expanded.tolist() == list(plain.stock_code)
+
+    def test_compact_encoding(self, market_stub):
+        """encoding="compact" decodes to the same bars as the repeated encoding"""
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH", "000001.SZ"], period="1m", count=240)
+        plain = market_stub.GetMarketData(request)
+        request.encoding = "compact"
+        compact = market_stub.GetMarketData(request)
+        print(f"\n  repeated {plain.ByteSize()} bytes, compact {compact.ByteSize()} bytes")
+        assert [block.stock_code for block in compact.compact] == list(dict.fromkeys(plain.stock_code))
+        decoded = [decode_compact(block) for block in compact.compact]
+        assert np.concatenate([d["time"] for d in decoded]).tolist() == list(plain.time)
+        np.testing.assert_allclose(np.concatenate([d["close"] for d in decoded]), list(plain.close), atol=1e-9)
+
+    def test_field_projection(self, market_stub):
+        """fields=[...] returns only the requested columns, matching the full response"""
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH"], period="1d", count=10)
+        full = market_stub.GetMarketData(request)
+        request.fields.extend(["time", "close"])
+        projected = market_stub.GetMarketData(request)
+        print(f"\n  Projected rows: {len(projected.time)}")
+        assert list(projected.time) == list(full.time)
+        assert list(projected.close) == list(full.close)
+        assert len(projected.open) == len(projected.volume) == 0
+
+    def test_unknown_field(self, market_stub):
+        """Unknown field names are rejected with INVALID_ARGUMENT"""
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], fields=["vwap"],
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    def test_unknown_encoding(self, market_stub):
+        """Unknown encoding is rejected with INVALID_ARGUMENT"""
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], encoding="csv",
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    def test_tick_period(self, market_stub):
+        """period="tick" is rejected instead of returning zero-filled kline columns"""
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], period="tick", count=10,
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert "StreamTickHistory" in exc.value.details()
+
+
+class TestKlineCache:
+    """GetMarketData served from the server-side kline cache"""
+
+    @pytest.mark.parametrize("kwargs", [
+        dict(period="1d", count=10),
+        dict(period="1d", start_time="20250101", end_time="20250131"),
+        dict(period="1d", start_time="20250101", count=5),
+        dict(period="1m", count=30),
+    ])
+    def test_matches_uncached(self, market_stub, cached_market_stub, kwargs):
+        """Sliced cache entries match a direct xtdata fetch"""
+        request = xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH", "000001.SZ"], **kwargs)
+        expected = market_stub.GetMarketData(request)
+        for _ in range(2):  # miss, then hit
+            resp = cached_market_stub.GetMarketData(request)
+            assert list(resp.stock_code) == list(expected.stock_code)
+            assert list(resp.time) == list(expected.time)
+            assert list(resp.close) == list(expected.close)
+
+    @pytest.mark.parametrize("dividend_type", ["front", "back", "front_ratio", "back_ratio"])
+    def test_adjusted_matches_xtdata(self, market_stub, cached_market_stub, dividend_type):
+        """Adjustment computed from cached raw bars matches xtdata's own adjusted series"""
+        request = xtquant_pb2.GetMarketDataRequest(
+            stock_codes=["600000.SH", "000001.SZ"], period="1d", count=250, dividend_type=dividend_type,
+        )
+        expected = market_stub.GetMarketData(request)
+        resp = cached_market_stub.GetMarketData(request)
+        assert list(resp.time) == list(expected.time)
+        assert list(resp.close) == pytest.approx(list(expected.close), rel=1e-3)
+        assert list(resp.volume) == list(expected.volume)
+
+    def test_unknown_dividend_type(self, cached_market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            cached_market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], dividend_type="forward",
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestKlineMirror:
+    """GetMarketData served from the memory-mapped mirror"""
+
+    def test_download_then_read(self, market_stub, mirror_market_stub):
+        """Bars mirrored by DownloadHistoryData match a direct xtdata fetch"""
+        codes = ["600000.SH", "000001.SZ"]
+        progress = list(mirror_market_stub.DownloadHistoryData(xtquant_pb2.DownloadHistoryDataRequest(
+            stock_codes=codes, period="1d", start_time="20240101",
+        )))
+        assert progress[-1].message.startswith("Mirror updated")
+        print(f"\n  {progress[-1].message}")
+
+        for kwargs in (dict(start_time="20250101", end_time="20250331"), dict(count=20)):
+            request = xtquant_pb2.GetMarketDataRequest(stock_codes=codes, period="1d", **kwargs)
+            expected = market_stub.GetMarketData(request)
+            resp = mirror_market_stub.GetMarketData(request)
+            assert list(resp.stock_code) == list(expected.stock_code)
+            assert list(resp.time) == list(expected.time)
+            assert list(resp.close) == list(expected.close)
+
+
+class TestServerMetrics:
+    """GetServerMetrics"""
+
+    def test_compression_and_cache_metrics(self, cached_market_stub):
+        """Large compressed responses are counted and sampled"""
+        cached_market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+            stock_codes=["600000.SH"], period="1m", count=2000,
+        ))
+        # The ratio is sampled on a background thread
+        deadline = time.time() + 5
+        values = cached_market_stub.GetServerMetrics(xtquant_pb2.Empty()).values
+        while "compression.GetMarketData.ratio" not in values and time.time() < deadline:
+            time.sleep(0.05)
+            values = cached_market_stub.GetServerMetrics(xtquant_pb2.Empty()).values
+        print(f"\n  GetMarketData ratio: {values.get('compression.GetMarketData.ratio')}")
+        assert values["compression.GetMarketData.compressed"] >= 1
+        assert values["compression.GetMarketData.ratio"] > 1
+        assert "kline_cache.bytes" in values
+
+
+class TestResampledPeriods:
+    """GetMarketData with custom (server-resampled) periods"""
+
+    def test_3m_from_1m(self, market_stub):
+        """3m bars aggregate the matching 1m bars"""
+        resp = market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+            stock_codes=["600000.SH"], period="3m", count=5,
+        ))
+        assert 0 < len(resp.time) <= 5
+        minute = market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+            stock_codes=["600000.SH"], period="1m", count=30,
+        ))
+        assert resp.time[-1] == minute.time[-1]
+        assert resp.close[-1] == minute.close[-1]
+        assert resp.high[-1] >= max(minute.high[-3:])
+
+    def test_unsupported_period(self, market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], period="7x",
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestParallelFetch:
+    """GetMarketData fan-out across the fetch pool"""
+
+    def test_merged_in_request_order(self, cached_market_stub):
+        """Shards are merged back in request order"""
+        codes = ["000001.SZ", "600000.SH", "000300.SH", "000002.SZ"]
+        resp = cached_market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+            stock_codes=codes, period="1d", count=3, dict_stock_code=True,
+        ))
+        assert list(resp.code_table) == [c for c in codes if c in resp.code_table]
+        assert len(resp.code_table) > 1
+
+
+class TestGetMarketDataBatch:
+    """gRPC GetMarketDataBatch endpoint"""
+
+    @pytest.mark.parametrize("stub_name", ["market_stub", "cached_market_stub"])
+    def test_sections_match_single_calls(self, request, stub_name):
+        """Each section equals the GetMarketData response for its spec"""
+        stub = request.getfixturevalue(stub_name)
+        base = xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH", "000001.SZ"], fields=["time", "close"])
+        specs = [
+            xtquant_pb2.KlineSpec(period="1m", count=60),
+            xtquant_pb2.KlineSpec(period="5m", count=20),
+            xtquant_pb2.KlineSpec(period="1d", start_time="20250101", end_time="20250131"),
+            xtquant_pb2.KlineSpec(period="1w", count=10),
+        ]
+        resp = stub.GetMarketDataBatch(xtquant_pb2.GetMarketDataBatchRequest(base=base, specs=specs))
+        assert [section.spec.period for section in resp.sections] == ["1m", "5m", "1d", "1w"]
+        for spec, section in zip(specs, resp.sections):
+            single = xtquant_pb2.GetMarketDataRequest()
+            single.CopyFrom(base)
+            single.period, single.start_time, single.end_time, single.count = (
+                spec.period, spec.start_time, spec.end_time, spec.count,
+            )
+            expected = stub.GetMarketData(single)
+            assert list(section.data.time) == list(expected.time)
+            assert list(section.data.close) == list(expected.close)
+        print(f"\n  Batch sections: {[len(s.data.time) for s in resp.sections]}")
+
+    @pytest.mark.parametrize("period", ["7x", "tick"])
+    def test_invalid_period(self, market_stub, period):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetMarketDataBatch(xtquant_pb2.GetMarketDataBatchRequest(
+                base=xtquant_pb2.GetMarketDataRequest(stock_codes=["600000.SH"]),
+                specs=[xtquant_pb2.KlineSpec(period="1d"), xtquant_pb2.KlineSpec(period=period)],
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestGetCrossSection:
+    """gRPC GetCrossSection endpoint"""
+
+    @pytest.mark.parametrize("stub_name", ["market_stub", "cached_market_stub"])
+    def test_one_row_per_stock(self, request, stub_name):
+        """Each stock's row is its last bar of the as-of day"""
+        stub = request.getfixturevalue(stub_name)
+        codes = ["600000.SH", "000001.SZ"]
+        resp = stub.GetCrossSection(xtquant_pb2.GetCrossSectionRequest(
+            stock_codes=codes, as_of="20250115", fields=["time", "close", "volume"],
+        ))
+        assert list(resp.stock_code) == codes
+        for i, code in enumerate(codes):
+            bars = stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=[code], period="1d", start_time="20250101", end_time="20250115",
+            ))
+            assert resp.time[i] == bars.time[-1]
+            assert resp.close[i] == bars.close[-1]
+        assert len(resp.open) == 0
+        print(f"\n  Cross-section closes: {list(resp.close)}")
+
+    def test_invalid_as_of(self, market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetCrossSection(xtquant_pb2.GetCrossSectionRequest(
+                stock_codes=["600000.SH"], as_of="2025-1",
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    def test_intraday_as_of_uses_previous_daily_bar(self, market_stub):
+        """A daily bar before the close would hold data from after as_of"""
+        request = xtquant_pb2.GetCrossSectionRequest(stock_codes=["600000.SH"], fields=["time"])
+        request.as_of = "20250115103000"
+        intraday = market_stub.GetCrossSection(request)
+        request.as_of = "20250114"
+        assert list(intraday.time) == list(market_stub.GetCrossSection(request).time)
+
+    def test_no_codes_or_sector(self, market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetCrossSection(xtquant_pb2.GetCrossSectionRequest(as_of="20250115"))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestComputeIndicators:
+    """gRPC ComputeIndicators endpoint"""
+
+    def test_last_values(self, market_stub):
+        """Returns last_n values per series, matching a client-side SMA"""
+        resp = market_stub.ComputeIndicators(xtquant_pb2.ComputeIndicatorsRequest(
+            stock_codes=["600000.SH", "000001.SZ"], period="1d", last_n=3,
+            indicators=[
+                xtquant_pb2.IndicatorSpec(name="sma", params=[5]),
+                xtquant_pb2.IndicatorSpec(name="macd"),
+                xtquant_pb2.IndicatorSpec(name="boll"),
+            ],
+        ))
+        assert [s.stock_code for s in resp.stocks] == ["600000.SH", "000001.SZ"]
+        stock = resp.stocks[0]
+        names = [series.name for series in stock.series]
+        assert names[:4] == ["sma_5", "macd_12_26_9.dif", "macd_12_26_9.dea", "macd_12_26_9.macd"]
+        assert all(len(series.values) == 3 for series in stock.series)
+
+        bars = market_stub.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+            stock_codes=["600000.SH"], period="1d", count=5,
+        ))
+        assert stock.time[-1] == bars.time[-1]
+        assert stock.series[0].values[-1] == pytest.approx(np.mean(bars.close))
+        print(f"\n  600000.SH {names[0]} = {stock.series[0].values[-1]:.3f}")
+
+    def test_unknown_indicator(self, market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.ComputeIndicators(xtquant_pb2.ComputeIndicatorsRequest(
+                stock_codes=["600000.SH"], indicators=[xtquant_pb2.IndicatorSpec(name="kdj")],
+            ))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestStreamMarketData:
+    """gRPC StreamMarketData streaming endpoint"""
+
+    def test_chunks_match_unary(self, market_stub):
+        """Chunks respect chunk_rows and concatenate to the unary response"""
+        codes = ["600000.SH", "000001.SZ", "000300.SH"]
+        request = xtquant_pb2.GetMarketDataRequest(
+            stock_codes=codes, period="1d", count=30, chunk_rows=25, chunk_stocks=2,
+        )
+        chunks = list(market_stub.StreamMarketData(request))
+        unary = market_stub.GetMarketData(request)
+
+        assert all(len(c.time) <= 25 for c in chunks)
+        assert [code for c in chunks for code in c.stock_code] == list(unary.stock_code)
+        assert [t for c in chunks for t in c.time] == list(unary.time)
+        print(f"\n  {len(unary.time)} rows streamed in {len(chunks)} chunks")
+
+
+class TestStreamTickHistory:
+    """gRPC StreamTickHistory streaming endpoint"""
+
+    def test_columnar_chunks(self, market_stub):
+        """Chunks carry packed columns and rows x depth order-book matrices"""
+        request = xtquant_pb2.StreamTickHistoryRequest(
+            stock_codes=["600000.SH", "000001.SZ"], count=100, chunk_rows=60,
+        )
+        chunks = list(market_stub.StreamTickHistory(request))
+        assert chunks
+        rows = 0
+        for chunk in chunks:
+            n = sum(chunk.code_rows)
+            assert 0 < n <= 60
+            assert len(np.frombuffer(chunk.time, "<i8")) == n
+            assert np.frombuffer(chunk.bid_price, "<f8").reshape(-1, chunk.depth).shape == (n, 5)
+            rows += n
+        print(f"\n  {rows} ticks streamed in {len(chunks)} chunks")
+
 
 class TestGetFullTick:
     """gRPC GetFullTick endpoint"""
@@ -83,6 +435,7 @@ class TestGetFullTick:
         assert "600000.SH" in resp.ticks
         tick = resp.ticks["600000.SH"]
         assert tick.stock_code == "600000.SH"
+        assert tick.received_at > 0
         # last_price may be 0 outside trading hours
         print(f"\n  600000.SH tick: last={tick.last_price} bid={list(tick.bid_price)[:3]}")
 
@@ -96,6 +449,26 @@ class TestGetFullTick:
             assert code in resp.ticks
         print(f"\n  Batch tick fetched {len(resp.ticks)} instruments")
 
+    def test_columnar_matches_map(self, market_stub):
+        """encoding="columnar" carries the same values as the TickSnapshot map"""
+        codes = ["600000.SH", "000001.SZ"]
+        ticks = market_stub.GetFullTick(xtquant_pb2.GetFullTickRequest(stock_codes=codes)).ticks
+        columns = market_stub.GetFullTick(xtquant_pb2.GetFullTickRequest(
+            stock_codes=codes, encoding="columnar",
+        )).columns
+        assert sorted(columns.stock_code) == sorted(ticks)
+        last_close = np.frombuffer(columns.last_close, "<f8")
+        bid = np.frombuffer(columns.bid_price, "<f8").reshape(-1, columns.depth)
+        for i, code in enumerate(columns.stock_code):
+            assert last_close[i] == ticks[code].last_close
+            assert bid[i, :len(ticks[code].bid_price)].tolist() == list(ticks[code].bid_price)
+        print(f"\n  Columnar ticks: {len(columns.stock_code)} instruments, depth={columns.depth}")
+
+    def test_unknown_encoding(self, market_stub):
+        with pytest.raises(grpc.RpcError) as exc:
+            market_stub.GetFullTick(xtquant_pb2.GetFullTickRequest(stock_codes=["600000.SH"], encoding="rows"))
+        assert exc.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
 
 class TestGetInstrumentDetail:
     """gRPC GetInstrumentDetail endpoint"""
@@ -265,6 +638,23 @@ class TestGetFinancialData:
         assert "Income" in tables
         print(f"\n  Financial tables retrieved: {list(tables.keys())}")
 
+    @pytest.mark.slow
+    def test_arrow_format(self, market_stub):
+        """format="arrow" returns one IPC stream per table"""
+        pa = pytest.importorskip("pyarrow")
+        from xtquant import xtdata
+        xtdata.download_financial_data(["600000.SH"], table_list=["Balance"])
+
+        resp = market_stub.GetFinancialData(xtquant_pb2.GetFinancialDataRequest(
+            stock_codes=["600000.SH"],
+            table_list=["Balance"],
+            format="arrow",
+        ))
+        assert not resp.data_json
+        table = pa.ipc.open_stream(resp.arrow_tables["Balance"]).read_all()
+        assert table.num_rows > 0
+        assert set(table.column("stock_code").to_pylist()) == {"600000.SH"}
+
 
 class TestDownloadFinancialData:
     """gRPC DownloadFinancialData streaming endpoint"""
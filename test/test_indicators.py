@@ -0,0 +1,86 @@
+"""Indicator tests — server-side SMA / EMA / RSI / MACD / ATR / BOLL
+
+Pure array checks against straightforward reference loops; no MiniQMT connection needed.
+"""
+
+import numpy as np
+import pytest
+
+from server.indicators import compute, label, resolve, warmup_bars
+
+
+def make_bars(n=200, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 10 + np.cumsum(rng.normal(0, 0.1, n))
+    return {
+        "time": np.arange(n, dtype=np.int64),
+        "close": close,
+        "high": close + rng.uniform(0, 0.2, n),
+        "low": close - rng.uniform(0, 0.2, n),
+    }
+
+
+def ema_loop(values, alpha):
+    out = np.empty_like(values)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+class TestResolve:
+    def test_defaults_and_label(self):
+        assert resolve("MACD", []) == ("macd", (12, 26, 9))
+        assert resolve("boll", [10]) == ("boll", (10, 2))
+        assert label("boll", (20, 2.5)) == "boll_20_2.5"
+        assert warmup_bars("sma", (20,)) == 20
+
+    @pytest.mark.parametrize("name, params", [("kdj", []), ("sma", [5, 6]), ("ema", [0])])
+    def test_invalid(self, name, params):
+        with pytest.raises(ValueError):
+            resolve(name, params)
+
+
+class TestCompute:
+    def test_sma_and_ema(self):
+        bars = make_bars()
+        sma = compute(bars, "sma", (5,))["sma_5"]
+        assert np.isnan(sma[3])
+        assert sma[-1] == pytest.approx(bars["close"][-5:].mean())
+        ema = compute(bars, "ema", (10,))["ema_10"]
+        np.testing.assert_allclose(ema, ema_loop(bars["close"], 2 / 11))
+
+    def test_rsi(self):
+        bars = make_bars()
+        rsi = compute(bars, "rsi", (14,))["rsi_14"]
+        change = np.diff(bars["close"])
+        gain = ema_loop(np.clip(change, 0, None), 1 / 14)
+        loss = ema_loop(np.clip(-change, 0, None), 1 / 14)
+        with np.errstate(divide="ignore"):
+            np.testing.assert_allclose(rsi[1:], 100 - 100 / (1 + gain / loss))
+        assert ((rsi[1:] >= 0) & (rsi[1:] <= 100)).all()
+
+    def test_rsi_without_losses(self):
+        bars = {"close": np.arange(1.0, 30.0)}
+        assert compute(bars, "rsi", (14,))["rsi_14"][-1] == 100.0
+
+    def test_macd(self):
+        bars = make_bars()
+        out = compute(bars, "macd", (12, 26, 9))
+        dif = ema_loop(bars["close"], 2 / 13) - ema_loop(bars["close"], 2 / 27)
+        np.testing.assert_allclose(out["macd_12_26_9.dif"], dif)
+        np.testing.assert_allclose(out["macd_12_26_9.macd"], 2 * (dif - ema_loop(dif, 2 / 10)))
+
+    def test_atr(self):
+        bars = make_bars()
+        atr = compute(bars, "atr", (14,))["atr_14"]
+        prev = np.r_[np.nan, bars["close"][:-1]]
+        tr = np.nanmax([bars["high"] - bars["low"], abs(bars["high"] - prev), abs(bars["low"] - prev)], axis=0)
+        np.testing.assert_allclose(atr, ema_loop(tr, 1 / 14))
+
+    def test_boll(self):
+        bars = make_bars()
+        out = compute(bars, "boll", (20, 2))
+        window = bars["close"][-20:]
+        assert out["boll_20_2.mid"][-1] == pytest.approx(window.mean())
+        assert out["boll_20_2.upper"][-1] == pytest.approx(window.mean() + 2 * window.std())
@@ -0,0 +1,120 @@
+"""Kline mirror tests — memory-mapped per-(period, code) column files
+
+Uses a temporary directory; no MiniQMT connection needed.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from pb import xtquant_pb2
+from server.bar_cache import merge_tail
+from server.columnar import frame_to_arrays, slice_rows
+from server.market_data import MarketDataServicer
+from server.mirror import BarMirror
+from test.test_columnar import make_kline_frame
+
+
+class TestBarMirror:
+    """BarMirror read / write / index"""
+
+    def test_write_and_map(self, tmp_path):
+        mirror = BarMirror(str(tmp_path))
+        arrays = frame_to_arrays(make_kline_frame(10))
+        mirror.write("1d", "600000.SH", arrays)
+        mapped = mirror.read("1d", "600000.SH")
+        assert isinstance(mapped["close"], np.memmap)
+        assert mapped["time"].tolist() == arrays["time"].tolist()
+        assert mapped["suspend_flag"].dtype == np.int32
+        assert mirror.read("1d", "000001.SZ") is None
+
+    def test_projection_keeps_time(self, tmp_path):
+        mirror = BarMirror(str(tmp_path))
+        mirror.write("1d", "600000.SH", frame_to_arrays(make_kline_frame(3)))
+        assert set(mirror.read("1d", "600000.SH", ("close",))) == {"time", "close"}
+
+    def test_incremental_overwrites_tail(self, tmp_path):
+        """New bars replace rows from their first timestamp on and append the rest"""
+        mirror = BarMirror(str(tmp_path))
+        full = frame_to_arrays(make_kline_frame(10))
+        mirror.write("1d", "600000.SH", slice_rows(full, 0, 6))
+        tail = {name: arr.copy() for name, arr in slice_rows(full, 5, 10).items()}
+        tail["close"][0] = 99.0  # the bar that was still forming
+        mirror.write("1d", "600000.SH", tail)
+
+        mapped = mirror.read("1d", "600000.SH")
+        assert mapped["time"].tolist() == full["time"].tolist()
+        assert mapped["close"][5] == 99.0
+        assert mirror.info("1d", "600000.SH") == {
+            "rows": 10, "first": int(full["time"][0]), "last": int(full["time"][-1]), "gen": 1,
+        }
+
+    def test_changed_bar_leaves_mapped_rows_intact(self, tmp_path):
+        """A reader's mapping keeps the bars it mapped while the mirror switches generation"""
+        mirror = BarMirror(str(tmp_path))
+        full = frame_to_arrays(make_kline_frame(10))
+        mirror.write("1d", "600000.SH", slice_rows(full, 0, 6))
+        before = mirror.read("1d", "600000.SH")
+        tail = {name: arr.copy() for name, arr in slice_rows(full, 5, 10).items()}
+        tail["close"][0] = 99.0
+        mirror.write("1d", "600000.SH", tail)
+        assert before["close"][5] == full["close"][5]
+        assert mirror.read("1d", "600000.SH")["close"][5] == 99.0
+
+    def test_equal_overlap_appends_in_place(self, tmp_path):
+        mirror = BarMirror(str(tmp_path))
+        full = frame_to_arrays(make_kline_frame(10))
+        mirror.write("1d", "600000.SH", slice_rows(full, 0, 6))
+        mirror.write("1d", "600000.SH", slice_rows(full, 5, 10))
+        assert mirror.info("1d", "600000.SH")["gen"] == 0
+        assert mirror.read("1d", "600000.SH")["close"].tolist() == full["close"].tolist()
+
+    def test_shorter_rewrite_ignores_stale_bytes(self, tmp_path):
+        """Files are never shrunk; the index row count bounds what is read"""
+        mirror = BarMirror(str(tmp_path))
+        full = frame_to_arrays(make_kline_frame(10))
+        mirror.write("1d", "600000.SH", full)
+        mirror.write("1d", "600000.SH", slice_rows(full, 4, 6))
+        assert mirror.read("1d", "600000.SH")["time"].tolist() == full["time"][:6].tolist()
+
+    def test_index_persisted_on_flush(self, tmp_path):
+        mirror = BarMirror(str(tmp_path))
+        mirror.write("1m", "600000.SH", frame_to_arrays(make_kline_frame(4)))
+        assert BarMirror(str(tmp_path)).info("1m", "600000.SH") is None
+        mirror.flush()
+        assert BarMirror(str(tmp_path)).info("1m", "600000.SH")["rows"] == 4
+
+
+class TestMirrorWithoutCache:
+    """GetMarketData with --mirror-dir and no kline cache"""
+
+    def test_unmirrored_fetches_requested_range(self, tmp_path):
+        servicer = MarketDataServicer(mirror_dir=str(tmp_path))
+        servicer._mirror.write("1d", "600000.SH", frame_to_arrays(make_kline_frame(10)))
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.get_market_data_ex.side_effect = lambda fields, codes, **kw: (
+                {"000001.SZ": make_kline_frame(5)} if codes == ["000001.SZ"] else {}
+            )
+            resp = servicer.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH", "000001.SZ"], period="1d", count=5, fields=["close"],
+            ), MagicMock())
+        # The mirrored stock only refreshes its tail; the other is fetched for the request alone
+        fields, codes = xtdata.get_market_data_ex.call_args_list[0].args
+        assert codes == ["000001.SZ"] and fields == ["time", "close"]
+        assert xtdata.get_market_data_ex.call_args_list[0].kwargs["count"] == 5
+        assert list(resp.stock_code) == ["600000.SH"] * 5 + ["000001.SZ"] * 5
+
+    def test_tail_merged_into_requested_window(self, tmp_path):
+        servicer = MarketDataServicer(mirror_dir=str(tmp_path))
+        servicer._mirror.write("1d", "600000.SH", frame_to_arrays(make_kline_frame(10)))
+        latest = make_kline_frame(12)
+        with patch("server.market_data.xtdata") as xtdata, \
+                patch("server.market_data.merge_tail", wraps=merge_tail) as merge:
+            xtdata.get_market_data_ex.side_effect = lambda fields, codes, **kw: {"600000.SH": latest.iloc[9:]}
+            resp = servicer.GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], period="1d", count=3, fields=["time", "close"],
+            ), MagicMock())
+        # Only the last `count` mirrored bars are copied into the merged series
+        assert len(merge.call_args.args[0]["time"]) == 3
+        assert list(resp.time) == latest["time"].iloc[-3:].tolist()
+        assert list(resp.close) == latest["close"].iloc[-3:].tolist()
@@ -0,0 +1,473 @@
+"""Quote hub tests — shared upstream subscriptions fanned out to many streams
+
+Uses fake subscribe functions and a patched xtdata module; no MiniQMT
+connection needed.
+"""
+
+import threading
+import time
+from concurrent import futures
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pb import xtquant_pb2
+from server.market_data import _QUOTE_BUFFER_BARS, MarketDataServicer, _merge_quote_bars
+from server.quote_hub import QuoteHub
+
+
+class FakeUpstream:
+    """Records subscribe / unsubscribe calls and keeps the callbacks."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.unsubscribed = []
+        self.next_seq = 1
+
+    def subscribe(self, key, callback):
+        seq, self.next_seq = self.next_seq, self.next_seq + 1
+        self.callbacks[key] = (seq, callback)
+        return seq
+
+    def unsubscribe(self, seq):
+        self.unsubscribed.append(seq)
+
+    def push(self, key, datas):
+        self.callbacks[key][1](datas)
+
+
+@pytest.fixture
+def upstream():
+    return FakeUpstream()
+
+
+@pytest.fixture
+def hub(upstream):
+    converted = []
+
+    def convert(key, datas):
+        converted.append(datas)
+        return sorted(datas)
+
+    hub = QuoteHub("test", upstream.subscribe, upstream.unsubscribe, convert)
+    hub.converted = converted
+    return hub
+
+
+class TestQuoteHub:
+    """Reference counting and fan-out"""
+
+    def test_shared_upstream(self, hub, upstream):
+        a = hub.attach(["SH", "SZ"])
+        b = hub.attach(["SH"])
+        assert sorted(upstream.callbacks) == ["SH", "SZ"]
+        assert hub.stats() == {"upstreams": 2, "subscribers": 2}
+
+        upstream.push("SH", {"600000.SH": {}})
+        assert len(hub.converted) == 1, "one conversion for all subscribers"
+        a_items, b_items = a.buffer.get(0), b.buffer.get(0)
+        assert a_items == b_items == ["600000.SH"]
+
+        upstream.push("SZ", {"000001.SZ": {}})
+        assert a.buffer.get(0) == ["000001.SZ"]
+        assert not b.buffer.get(0)
+
+    def test_unsubscribe_with_last_subscriber(self, hub, upstream):
+        a = hub.attach(["SH", "SZ"])
+        b = hub.attach(["SH"])
+        hub.detach(a)
+        assert upstream.unsubscribed == [upstream.callbacks["SZ"][0]]
+        hub.detach(b)
+        assert sorted(upstream.unsubscribed) == [1, 2]
+        assert hub.stats() == {"upstreams": 0, "subscribers": 0}
+        hub.detach(b)  # idempotent
+        assert len(upstream.unsubscribed) == 2
+
+    def test_resubscribe_after_last_left(self, hub, upstream):
+        hub.detach(hub.attach(["SH"]))
+        hub.attach(["SH"])
+        assert upstream.callbacks["SH"][0] == 2
+
+    def test_failed_subscribe_rolls_back(self, hub, upstream):
+        def subscribe(key, callback):
+            return -1 if key == "SZ" else upstream.subscribe(key, callback)
+        hub._subscribe = subscribe
+        with pytest.raises(RuntimeError):
+            hub.attach(["SH", "SZ"])
+        assert upstream.unsubscribed == [1]
+        assert hub.stats()["upstreams"] == 0
+
+    def test_slow_subscribe_does_not_block_other_keys(self, hub, upstream):
+        """Subscribing one key runs outside the hub lock; its other subscribers wait for it"""
+        release = threading.Event()
+
+        def subscribe(key, callback):
+            if key == "SH":
+                release.wait(5)
+            return upstream.subscribe(key, callback)
+        hub._subscribe = subscribe
+        with futures.ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(hub.attach, ["SH"])
+            second = pool.submit(hub.attach, ["SH"])
+            # Another key attaches and detaches while SH is still subscribing
+            hub.detach(hub.attach(["SZ"]))
+            assert not first.done() and not second.done()
+            release.set()
+            a, b = first.result(timeout=2), second.result(timeout=2)
+        assert list(upstream.callbacks) == ["SZ", "SH"]
+        assert hub.stats() == {"upstreams": 1, "subscribers": 2}
+        upstream.push("SH", {"600000.SH": {}})
+        assert a.buffer.get(0) == b.buffer.get(0) == ["600000.SH"]
+
+    def test_waiters_fail_with_creator(self, hub, upstream):
+        release = threading.Event()
+
+        def subscribe(key, callback):
+            release.wait(5)
+            return -1
+        hub._subscribe = subscribe
+        with futures.ThreadPoolExecutor(max_workers=2) as pool:
+            attaches = [pool.submit(hub.attach, ["SH"]) for _ in range(2)]
+            time.sleep(0.05)
+            release.set()
+            for attach in attaches:
+                with pytest.raises(RuntimeError):
+                    attach.result(timeout=2)
+        assert hub.stats() == {"upstreams": 0, "subscribers": 0}
+
+    def test_no_conversion_without_subscribers(self, hub, upstream):
+        hub.attach(["SH"])
+        callback = upstream.callbacks["SH"][1]
+        hub.detach(hub._upstreams["SH"].subscribers[0])
+        callback({"600000.SH": {}})
+        assert hub.converted == []
+
+
+class TestRetainedBacklog:
+    """prime / merge: recent items handed to late subscribers"""
+
+    @pytest.fixture
+    def buffered_hub(self, upstream):
+        primes = []
+
+        def prime(key):
+            primes.append(key)
+            return [1, 2, 3]
+
+        def merge(retained, batch):
+            return ((retained or []) + batch)[-4:]
+
+        hub = QuoteHub("test", upstream.subscribe, upstream.unsubscribe, lambda key, datas: list(datas),
+                       prime=prime, merge=merge)
+        hub.primes = primes
+        return hub
+
+    def test_backlog(self, buffered_hub, upstream):
+        a = buffered_hub.attach(["600000.SH"])
+        assert a.backlog["600000.SH"] == [1, 2, 3]
+        upstream.push("600000.SH", [4, 5])
+        b = buffered_hub.attach(["600000.SH"])
+        assert b.backlog["600000.SH"] == [2, 3, 4, 5]
+        assert not b.buffer.get(0), "items in the backlog are not queued again"
+        assert a.buffer.get(0) == [4, 5]
+        assert buffered_hub.primes == ["600000.SH"], "primed once per upstream subscription"
+
+    def test_backlog_is_a_copy(self, buffered_hub, upstream):
+        a = buffered_hub.attach(["600000.SH"])
+        upstream.push("600000.SH", [4])
+        assert a.backlog["600000.SH"] == [1, 2, 3]
+
+
+class TestMergeQuoteBars:
+    """Shared SubscribeQuote bar buffer"""
+
+    def bars(self, *times):
+        return [xtquant_pb2.KlineBar(time=t, close=float(t)) for t in times]
+
+    def test_forming_bar_replaced(self):
+        retained = _merge_quote_bars(None, self.bars(1, 2))
+        forming = xtquant_pb2.KlineBar(time=2, close=9.0)
+        retained = _merge_quote_bars(retained, [forming] + self.bars(3))
+        assert [b.time for b in retained] == [1, 2, 3]
+        assert retained[1].close == 9.0
+
+    def test_older_bars_ignored_and_trimmed(self):
+        retained = _merge_quote_bars(None, self.bars(*range(_QUOTE_BUFFER_BARS + 5)))
+        assert len(retained) == _QUOTE_BUFFER_BARS
+        assert retained[0].time == 5
+        retained = _merge_quote_bars(retained, self.bars(3))
+        assert retained[-1].time == _QUOTE_BUFFER_BARS + 4
+
+
+class TestSubscribeQuoteHub:
+    """SubscribeQuote streams sharing one xtdata subscription per (code, period)"""
+
+    def test_backlog_without_refetch(self):
+        history = pd.DataFrame({"time": [1, 2, 3], "open": 1.0, "high": 2.0, "low": 0.5, "close": [1.1, 1.2, 1.3],
+                                "volume": 10.0, "amount": 100.0})
+        callbacks = []
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.get_market_data_ex.return_value = {"600000.SH": history}
+            xtdata.subscribe_quote.side_effect = lambda code, period, count, callback: callbacks.append(callback) or 5
+            servicer = MarketDataServicer()
+            context = MagicMock()
+            context.is_active.return_value = True
+            request = xtquant_pb2.SubscribeQuoteRequest(stock_code="600000.SH", period="1m", count=2)
+
+            first = servicer.SubscribeQuote(request, context)
+            assert [b.time for b in next(first).bars] == [2, 3]
+            callbacks[0]({"600000.SH": [{"time": 4, "close": 1.4}]})
+
+            second = servicer.SubscribeQuote(request, context)
+            assert [b.time for b in next(second).bars] == [3, 4]
+            assert [b.time for b in next(first).bars] == [4]
+            assert xtdata.subscribe_quote.call_count == 1
+            assert xtdata.get_market_data_ex.call_count == 1
+
+            other = servicer.SubscribeQuote(xtquant_pb2.SubscribeQuoteRequest(stock_code="600000.SH"), context)
+            with futures.ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(next, other)
+                deadline = time.time() + 2
+                while servicer._quote_hub.stats()["subscribers"] < 3 and time.time() < deadline:
+                    time.sleep(0.01)
+                assert xtdata.subscribe_quote.call_args.kwargs["period"] == "1d"
+                callbacks[1]({"600000.SH": {"time": 9}})
+                assert pending.result(timeout=2).period == "1d"
+
+            for stream in (first, second, other):
+                stream.close()
+            assert xtdata.unsubscribe_quote.call_count == 2
+
+
+    @pytest.mark.parametrize("period", ["1m", "tick"])
+    def test_first_subscriber_gets_history(self, period):
+        history = pd.DataFrame({"time": [1, 2, 3], "close": [1.1, 1.2, 1.3], "volume": 10.0})
+        with patch("server.market_data.xtdata") as xtdata:
+            # Nothing local until subscribe_quote supplements the history
+            xtdata.get_market_data_ex.side_effect = lambda fields, codes, **kw: (
+                {"600000.SH": history} if xtdata.subscribe_quote.called else {}
+            )
+            xtdata.subscribe_quote.return_value = 5
+            context = MagicMock()
+            context.is_active.return_value = True
+            stream = MarketDataServicer().SubscribeQuote(
+                xtquant_pb2.SubscribeQuoteRequest(stock_code="600000.SH", period=period, count=2), context,
+            )
+            with futures.ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(next, stream)
+                try:
+                    assert [b.time for b in pending.result(timeout=2).bars] == [2, 3]
+                finally:
+                    context.is_active.return_value = False
+            assert xtdata.subscribe_quote.call_args.kwargs["count"] == _QUOTE_BUFFER_BARS
+            stream.close()
+
+
+class TestSubscribeWholeQuoteHub:
+    """SubscribeWholeQuote streams sharing one xtdata subscription"""
+
+    def test_two_streams_one_upstream(self):
+        callbacks = []
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.subscribe_whole_quote.side_effect = lambda codes, callback: callbacks.append(callback) or 9
+            servicer = MarketDataServicer()
+            context = MagicMock()
+            context.is_active.return_value = True
+            request = xtquant_pb2.SubscribeWholeQuoteRequest(code_list=["SH"])
+            streams = [servicer.SubscribeWholeQuote(request, context) for _ in range(2)]
+
+            # Generators attach on their first next(); run both until they wait on their queues
+            with futures.ThreadPoolExecutor(max_workers=2) as pool:
+                pending = [pool.submit(next, stream) for stream in streams]
+                deadline = time.time() + 2
+                while servicer._whole_quote_hub.stats()["subscribers"] < 2 and time.time() < deadline:
+                    time.sleep(0.01)
+                assert xtdata.subscribe_whole_quote.call_count == 1
+                callbacks[0]({"600000.SH": {"lastPrice": 10.5}})
+                first, second = [future.result(timeout=2) for future in pending]
+            assert first is second, "converted once, shared by both streams"
+            assert first.last_price == 10.5
+
+            streams[0].close()
+            xtdata.unsubscribe_quote.assert_not_called()
+            streams[1].close()
+            xtdata.unsubscribe_quote.assert_called_once_with(9)
+
+    def test_empty_code_list(self):
+        context = MagicMock()
+        context.abort.side_effect = RuntimeError("aborted")
+        with pytest.raises(RuntimeError):
+            next(MarketDataServicer().SubscribeWholeQuote(xtquant_pb2.SubscribeWholeQuoteRequest(), context))
+
+
+class TestSlowConsumer:
+    """Bounded stream buffers behind the hubs"""
+
+    def open_stream(self, servicer, xtdata, callbacks, context):
+        """Start a SubscribeWholeQuote stream for SH and read its first tick."""
+        stream = servicer.SubscribeWholeQuote(xtquant_pb2.SubscribeWholeQuoteRequest(code_list=["SH"]), context)
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(next, stream)
+            deadline = time.time() + 2
+            while not callbacks and time.time() < deadline:
+                time.sleep(0.01)
+            callbacks[0]({"600000.SH": {"lastPrice": 10.0}})
+            assert first.result(timeout=2).last_price == 10.0
+        return stream
+
+    @pytest.fixture
+    def xtdata(self):
+        callbacks = []
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.subscribe_whole_quote.side_effect = lambda codes, callback: callbacks.append(callback) or 3
+            xtdata.callbacks = callbacks
+            yield xtdata
+
+    def test_conflate_reports_in_band(self, xtdata):
+        servicer = MarketDataServicer(stream_buffer=2, stream_overflow="conflate")
+        context = MagicMock()
+        context.is_active.return_value = True
+        stream = self.open_stream(servicer, xtdata, xtdata.callbacks, context)
+
+        # Client not reading: three updates of one code (the third conflated at the cap of 2),
+        # then two new codes that each drop the oldest pending tick
+        for price in (10.1, 10.2, 10.3):
+            xtdata.callbacks[0]({"600000.SH": {"lastPrice": price}})
+        xtdata.callbacks[0]({"600001.SH": {"lastPrice": 5.0}, "600002.SH": {"lastPrice": 6.0}})
+
+        ticks = [next(stream), next(stream)]
+        assert [t.stock_code for t in ticks] == ["600001.SH", "600002.SH"]
+        assert ticks[0].stream_stats.conflated == 1
+        assert ticks[0].stream_stats.dropped == 2
+        assert not ticks[1].HasField("stream_stats")
+
+        values = servicer.GetServerMetrics(xtquant_pb2.Empty(), context).values
+        assert values["stream.SubscribeWholeQuote.conflated"] == 1
+        assert values["stream.SubscribeWholeQuote.dropped"] == 2
+        stream.close()
+
+    def test_disconnect_policy(self, xtdata):
+        servicer = MarketDataServicer(stream_buffer=1, stream_overflow="disconnect")
+        context = MagicMock()
+        context.is_active.return_value = True
+        context.abort.side_effect = RuntimeError("aborted")
+        stream = self.open_stream(servicer, xtdata, xtdata.callbacks, context)
+
+        xtdata.callbacks[0]({"600000.SH": {"lastPrice": 10.1}, "600001.SH": {"lastPrice": 5.0}})
+        with pytest.raises(RuntimeError):
+            next(stream)
+        assert context.abort.call_args.args[0].name == "RESOURCE_EXHAUSTED"
+        xtdata.unsubscribe_quote.assert_called_once_with(3)
+        values = servicer.GetServerMetrics(xtquant_pb2.Empty(), context).values
+        assert values["stream.SubscribeWholeQuote.disconnected"] == 1
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            MarketDataServicer(stream_overflow="block")
+
+
+class TestSubscribeWholeQuoteBatch:
+    """SubscribeWholeQuoteBatch: one TickBatch message per push"""
+
+    @pytest.fixture
+    def xtdata(self):
+        callbacks = []
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.subscribe_whole_quote.side_effect = lambda codes, callback: callbacks.append(callback) or 5
+            xtdata.callbacks = callbacks
+            yield xtdata
+
+    def first_batch(self, servicer, xtdata, stream, *pushes):
+        """Read the first batch of a stream, pushing `pushes` once it is attached."""
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(next, stream)
+            deadline = time.time() + 2
+            while servicer._whole_quote_hub.stats()["subscribers"] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            for datas in pushes:
+                xtdata.callbacks[0](datas)
+            return pending.result(timeout=2)
+
+    def open_stream(self, servicer, **fields):
+        context = MagicMock()
+        context.is_active.return_value = True
+        request = xtquant_pb2.SubscribeWholeQuoteBatchRequest(code_list=["SH"], **fields)
+        return servicer.SubscribeWholeQuoteBatch(request, context)
+
+    def test_rows(self, xtdata):
+        servicer = MarketDataServicer()
+        stream = self.open_stream(servicer)
+        batch = self.first_batch(servicer, xtdata, stream, {"600000.SH": {"lastPrice": 10.0}, "600001.SH": {"lastPrice": 5.0}})
+        assert [t.stock_code for t in batch.ticks] == ["600000.SH", "600001.SH"]
+        assert batch.ticks[1].last_price == 5.0
+        assert not batch.HasField("columns")
+        stream.close()
+        xtdata.unsubscribe_quote.assert_called_once_with(5)
+
+    def test_columnar(self, xtdata):
+        servicer = MarketDataServicer()
+        stream = self.open_stream(servicer, encoding="columnar")
+        batch = self.first_batch(servicer, xtdata, stream, {"600000.SH": {"lastPrice": 10.0}, "600001.SH": [{"lastPrice": 5.0}]})
+        assert len(batch.ticks) == 0
+        assert list(batch.columns.stock_code) == ["600000.SH", "600001.SH"]
+        assert np.frombuffer(batch.columns.last_price, "<f8").tolist() == [10.0, 5.0]
+        assert (np.frombuffer(batch.columns.received_at, "<i8") > 0).all()
+        stream.close()
+
+    def test_max_batch_splits(self, xtdata):
+        servicer = MarketDataServicer()
+        stream = self.open_stream(servicer, max_batch=2)
+        datas = {f"60000{i}.SH": {"lastPrice": float(i)} for i in range(5)}
+        batches = [self.first_batch(servicer, xtdata, stream, datas), next(stream), next(stream)]
+        assert [len(b.ticks) for b in batches] == [2, 2, 1]
+        stream.close()
+
+    def test_max_latency_merges_pushes(self, xtdata):
+        servicer = MarketDataServicer()
+        stream = self.open_stream(servicer, max_latency_ms=300)
+        batch = self.first_batch(
+            servicer, xtdata, stream,
+            {"600000.SH": {"lastPrice": 10.0}},
+            {"600001.SH": {"lastPrice": 5.0}, "600000.SH": {"lastPrice": 10.1}},
+        )
+        # Both pushes in one message; below the buffer cap every tick is kept in order
+        assert [(t.stock_code, t.last_price) for t in batch.ticks] == [
+            ("600000.SH", 10.0), ("600001.SH", 5.0), ("600000.SH", 10.1),
+        ]
+        assert not batch.HasField("stream_stats")
+        stream.close()
+
+    def test_shares_upstream_with_per_code_stream(self, xtdata):
+        servicer = MarketDataServicer()
+        context = MagicMock()
+        context.is_active.return_value = True
+        streams = [
+            servicer.SubscribeWholeQuote(xtquant_pb2.SubscribeWholeQuoteRequest(code_list=["SH"]), context),
+            self.open_stream(servicer),
+        ]
+        with futures.ThreadPoolExecutor(max_workers=2) as pool:
+            pending = [pool.submit(next, stream) for stream in streams]
+            deadline = time.time() + 2
+            while servicer._whole_quote_hub.stats()["subscribers"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            xtdata.callbacks[0]({"600000.SH": {"lastPrice": 10.5}})
+            tick, batch = [future.result(timeout=2) for future in pending]
+        assert xtdata.subscribe_whole_quote.call_count == 1
+        assert batch.ticks[0] == tick
+        for stream in streams:
+            stream.close()
+
+    def test_bad_arguments(self):
+        context = MagicMock()
+        context.abort.side_effect = RuntimeError("aborted")
+        servicer = MarketDataServicer()
+        for request in (
+            xtquant_pb2.SubscribeWholeQuoteBatchRequest(),
+            xtquant_pb2.SubscribeWholeQuoteBatchRequest(code_list=["SH"], encoding="map"),
+            xtquant_pb2.SubscribeWholeQuoteBatchRequest(code_list=["SH"], max_batch=-1),
+        ):
+            with pytest.raises(RuntimeError):
+                next(servicer.SubscribeWholeQuoteBatch(request, context))
+            assert context.abort.call_args.args[0].name == "INVALID_ARGUMENT"
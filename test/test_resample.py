@@ -0,0 +1,135 @@
+"""Resampling tests — custom periods aggregated from native kline arrays
+
+Pure array checks, plus GetMarketData on a patched xtdata; no MiniQMT
+connection needed.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pb import xtquant_pb2
+from server.market_data import MarketDataServicer
+from server.periods import parse_time_ms
+from server.resample import resample, resample_plan
+
+
+def make_bars(times):
+    n = len(times)
+    close = np.arange(1, n + 1, dtype=float)
+    return {
+        "time": np.asarray(times, dtype=np.int64),
+        "open": close - 0.5,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.ones(n),
+        "amount": np.full(n, 10.0),
+        "pre_close": close - 1,
+        "suspend_flag": np.zeros(n, dtype=np.int32),
+        "settlement_price": np.zeros(n),
+        "open_interest": close * 100,
+    }
+
+
+def minute_bars(day, first, n):
+    start = parse_time_ms(day + first)
+    return [start + 60_000 * i for i in range(n)]
+
+
+class TestResamplePlan:
+    """resample_plan native period selection"""
+
+    @pytest.mark.parametrize("period,plan", [
+        ("1m", None), ("1d", None), ("tick", None),
+        ("3m", ("1m", 3)), ("10m", ("5m", 2)), ("45m", ("15m", 3)),
+        ("90m", ("30m", 3)), ("2h", ("1h", 2)), ("3d", ("1d", 3)),
+    ])
+    def test_plan(self, period, plan):
+        assert resample_plan(period) == plan
+
+    def test_unsupported(self):
+        with pytest.raises(ValueError):
+            resample_plan("2x")
+
+
+class TestResample:
+    """resample aggregation"""
+
+    def test_aggregates_ohlcv(self):
+        bars = make_bars(minute_bars("20240102", "0931", 6))
+        out = resample(bars, 3, minutes=1)
+        assert out["time"].tolist() == [bars["time"][2], bars["time"][5]]
+        assert out["open"].tolist() == [0.5, 3.5]
+        assert out["high"].tolist() == [4.0, 7.0]
+        assert out["low"].tolist() == [0.0, 3.0]
+        assert out["close"].tolist() == [3.0, 6.0]
+        assert out["volume"].tolist() == [3.0, 3.0]
+        assert out["pre_close"].tolist() == [0.0, 3.0]
+        assert out["open_interest"].tolist() == [300.0, 600.0]
+
+    def test_session_aligned_across_partial_day(self):
+        """A partially fetched first day lines up with the complete day's grid"""
+        times = minute_bars("20240102", "0932", 3) + minute_bars("20240103", "0931", 4)
+        out = resample(make_bars(times), 2, minutes=1)
+        # Minutes after 09:30: day 1 2,3,4 -> buckets [2], [3,4]; day 2 -> [1,2], [3,4]
+        assert out["volume"].tolist() == [1.0, 2.0, 2.0, 2.0]
+
+    def test_fixed_grid_whatever_the_first_bar(self):
+        """A count fetch starting mid-session keeps the 09:30 / 13:00-aligned grid"""
+        day = minute_bars("20240102", "1301", 120)
+        full = resample(make_bars(day), 3, minutes=1)
+        late = resample(make_bars(day[60:]), 3, minutes=1)  # first bar 14:01
+        assert late["time"].tolist() == full["time"][20:].tolist()
+        shifted = resample(make_bars(day[61:]), 3, minutes=1)  # first bucket partial
+        assert shifted["time"][1:].tolist() == full["time"][21:].tolist()
+
+    def test_buckets_stop_at_session_end(self):
+        """90m bars from 30m: 09:30-11:00, 11:00-11:30, then the afternoon"""
+        times = [parse_time_ms("20240102" + t) for t in ("1000", "1030", "1100", "1130", "1330", "1400")]
+        out = resample(make_bars(times), 3, minutes=30)
+        assert out["time"].tolist() == [times[2], times[3], times[5]]
+
+    def test_multi_day_fixed_weekday_grid(self):
+        """2d bars pair weekdays counted from a fixed Monday, not from the last bar"""
+        times = [parse_time_ms(d) for d in ["20240102", "20240103", "20240104", "20240105", "20240108"]]
+        out = resample(make_bars(times), 2, minutes=None)
+        assert out["volume"].tolist() == [2.0, 2.0, 1.0]
+        assert resample(make_bars(times[1:]), 2, minutes=None)["time"][1:].tolist() == out["time"][1:].tolist()
+
+
+class TestResampledCount:
+    """GetMarketData count on a custom period fetches enough native bars"""
+
+    @staticmethod
+    def a_share_minutes(days):
+        """241 1m bars per trading day: the 09:30 call-auction bar, then both sessions."""
+        times = []
+        for day in pd.bdate_range("2024-01-02", periods=days):
+            date = day.strftime("%Y%m%d")
+            times += minute_bars(date, "0930", 121) + minute_bars(date, "1301", 120)
+        return times
+
+    @pytest.mark.parametrize("count", [5, 320, 400, 800])
+    def test_multi_day_count(self, count):
+        times = self.a_share_minutes(15)
+        bars = make_bars(times)
+        frame = pd.DataFrame({
+            "time": bars["time"], "open": bars["open"], "high": bars["high"], "low": bars["low"],
+            "close": bars["close"], "volume": bars["volume"], "amount": bars["amount"],
+        })
+        expected = resample({name: bars[name] for name in ("time", "open", "volume")}, 3, minutes=1)
+
+        def get_market_data_ex(fields, codes, count=-1, **kwargs):
+            return {code: frame.iloc[-count:] if count > 0 else frame for code in codes}
+
+        with patch("server.market_data.xtdata") as xtdata:
+            xtdata.get_market_data_ex.side_effect = get_market_data_ex
+            resp = MarketDataServicer().GetMarketData(xtquant_pb2.GetMarketDataRequest(
+                stock_codes=["600000.SH"], period="3m", count=count, fields=["time", "open", "volume"],
+            ), MagicMock())
+        assert list(resp.time) == expected["time"][-count:].tolist()
+        assert list(resp.open) == expected["open"][-count:].tolist()
+        assert list(resp.volume) == expected["volume"][-count:].tolist()
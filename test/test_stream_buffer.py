@@ -0,0 +1,87 @@
+"""Stream buffer tests — bounded pending items and overflow policies
+
+Pure in-process checks; no MiniQMT connection needed.
+"""
+
+import threading
+
+import pytest
+
+from server.stream_buffer import StreamBuffer
+
+
+def code(item):
+    return item[0]
+
+
+class TestStreamBuffer:
+    """StreamBuffer overflow policies"""
+
+    def test_unbounded(self):
+        buffer = StreamBuffer()
+        buffer.put(range(5))
+        buffer.put([5])
+        assert buffer.get(0) == [0, 1, 2, 3, 4, 5]
+        assert buffer.get(0) == []
+        assert buffer.stats() == (0, 0)
+
+    def test_conflate_keeps_order_under_cap(self):
+        buffer = StreamBuffer(10, "conflate", key=code)
+        buffer.put([("A", 1), ("B", 1), ("A", 2)])
+        buffer.put([("A", 3)])
+        assert buffer.get(0) == [("A", 1), ("B", 1), ("A", 2), ("A", 3)]
+        assert buffer.stats() == (0, 0)
+
+    def test_conflate_latest_per_key_when_full(self):
+        buffer = StreamBuffer(2, "conflate", key=code)
+        buffer.put([("A", 1), ("B", 1), ("A", 2), ("B", 2)])
+        # A full buffer replaces the newest pending item of the same key in place
+        assert buffer.get(0) == [("A", 2), ("B", 2)]
+        assert buffer.stats() == (2, 0)
+
+    def test_conflate_drops_oldest_key_over_cap(self):
+        buffer = StreamBuffer(2, "conflate", key=code)
+        buffer.put([("A", 1), ("B", 1), ("C", 1)])
+        assert buffer.get(0) == [("B", 1), ("C", 1)]
+        assert buffer.stats() == (0, 1)
+
+    def test_drop_oldest(self):
+        buffer = StreamBuffer(3, "drop_oldest")
+        buffer.put(range(5))
+        assert len(buffer) == 3
+        assert buffer.get(0) == [2, 3, 4]
+        assert buffer.stats() == (0, 2)
+
+    def test_disconnect(self):
+        buffer = StreamBuffer(3, "disconnect")
+        buffer.put(range(3))
+        assert not buffer.overflowed
+        buffer.put([3])
+        assert buffer.overflowed
+        assert buffer.get(0) == []
+        buffer.put([4])
+        assert len(buffer) == 0
+
+    def test_get_waits_for_items(self):
+        buffer = StreamBuffer()
+        threading.Timer(0.05, buffer.put, args=([1],)).start()
+        assert buffer.get(2.0) == [1]
+
+    def test_linger_collects_later_items(self):
+        buffer = StreamBuffer()
+        buffer.put([1])
+        threading.Timer(0.05, buffer.put, args=([2],)).start()
+        assert buffer.get(0, linger=0.5, enough=2) == [1, 2]
+
+    def test_linger_ends_at_deadline(self):
+        buffer = StreamBuffer()
+        buffer.put([1])
+        assert buffer.get(0, linger=0.05, enough=10) == [1]
+        # Nothing pending: no linger
+        assert buffer.get(0, linger=5.0) == []
+
+    def test_bad_policy(self):
+        with pytest.raises(ValueError):
+            StreamBuffer(10, "block")
+        with pytest.raises(ValueError):
+            StreamBuffer(10, "conflate")
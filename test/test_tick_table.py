@@ -0,0 +1,243 @@
+"""Live tick table tests — GetFullTick answered from a whole-quote subscription
+
+Uses a patched xtdata module; no MiniQMT connection needed. The table
+attaches to a whole-quote hub; the hub's subscription callback is captured
+and driven by the tests.
+"""
+
+import time
+from concurrent import futures
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from pb import xtquant_pb2
+from server.market_data import MarketDataServicer, _tick_to_snapshot, _whole_quote_entries
+from server.quote_hub import QuoteHub
+from server.tick_table import TickTable
+
+
+def tick(price, time_ms=1_760_000_000_000):
+    return {"time": time_ms, "lastPrice": price, "bidPrice": [price - 0.01], "askPrice": [price + 0.01]}
+
+
+@pytest.fixture
+def xtdata():
+    with patch("server.tick_table.xtdata") as table_xtdata, patch("server.market_data.xtdata", table_xtdata):
+        table_xtdata.subscribe_whole_quote.return_value = 7
+        table_xtdata.get_full_tick.return_value = {}
+        yield table_xtdata
+
+
+def whole_quote_hub(xtdata):
+    """A hub wired like MarketDataServicer's, on the patched xtdata."""
+    return QuoteHub(
+        "whole_quote",
+        lambda code, callback: xtdata.subscribe_whole_quote([code], callback=callback),
+        xtdata.unsubscribe_quote,
+        _whole_quote_entries,
+    )
+
+
+def push(xtdata, datas):
+    """Invoke the captured subscribe_whole_quote callback of the market of the first code."""
+    market = next(iter(datas)).rsplit(".", 1)[-1]
+    for call in xtdata.subscribe_whole_quote.call_args_list:
+        if call.args[0] == [market]:
+            call.kwargs["callback"](datas)
+            return
+    raise AssertionError(f"{market} not subscribed")
+
+
+class TestTickTable:
+    """TickTable lookup and updates"""
+
+    def test_subscribe_and_stop(self, xtdata):
+        hub = whole_quote_hub(xtdata)
+        table = TickTable(["SH", "SZ"], _tick_to_snapshot)
+        table.start(hub)
+        assert [call.args[0] for call in xtdata.subscribe_whole_quote.call_args_list] == [["SH"], ["SZ"]]
+        assert hub.stats() == {"upstreams": 2, "subscribers": 1}
+        table.stop()
+        assert xtdata.unsubscribe_quote.call_count == 2
+
+    def test_failed_subscription(self, xtdata):
+        xtdata.subscribe_whole_quote.return_value = -1
+        with pytest.raises(RuntimeError):
+            TickTable(["SH"], _tick_to_snapshot).start(whole_quote_hub(xtdata))
+
+    def test_lookup_latest(self, xtdata):
+        table = TickTable(["SH"], _tick_to_snapshot)
+        table.start(whole_quote_hub(xtdata))
+        push(xtdata, {"600000.SH": tick(10.0), "600001.SH": [tick(5.0)]})
+        push(xtdata, {"600000.SH": tick(10.5)})
+
+        found, missing = table.lookup(["600000.SH", "600001.SH", "000001.SZ", "600002.SH"])
+        assert missing == ["000001.SZ", "600002.SH"]
+        assert table.size() == 2
+        snapshots = table.snapshots(found)
+        assert snapshots["600000.SH"].last_price == 10.5
+        assert snapshots["600001.SH"].last_price == 5.0
+        assert snapshots["600000.SH"].received_at == found["600000.SH"].received_at > 0
+        # Converted once, reused until the next tick
+        assert table.snapshots(found)["600000.SH"] is snapshots["600000.SH"]
+
+    def test_market_code_expands(self, xtdata):
+        """Seeded instruments that never ticked are part of the market"""
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(9.0), "600002.SH": tick(3.0)}
+        table = TickTable(["SH"], _tick_to_snapshot)
+        table.start(whole_quote_hub(xtdata))
+        xtdata.get_full_tick.assert_called_once_with(["SH"])
+        push(xtdata, {"600000.SH": tick(10.0), "600001.SH": tick(5.0)})
+        found, missing = table.lookup(["SH"])
+        assert sorted(found) == ["600000.SH", "600001.SH", "600002.SH"]
+        assert missing == []
+        assert table.snapshots(found)["600000.SH"].last_price == 10.0
+
+    def test_unseeded_market_is_missing(self, xtdata):
+        xtdata.get_full_tick.side_effect = RuntimeError("not connected")
+        table = TickTable(["SH"], _tick_to_snapshot)
+        table.start(whole_quote_hub(xtdata))
+        push(xtdata, {"600000.SH": tick(10.0)})
+        assert table.lookup(["SH"]) == ({}, ["SH"])
+        assert list(table.lookup(["600000.SH"])[0]) == ["600000.SH"]
+
+
+class TestGetFullTickFromTable:
+    """MarketDataServicer.GetFullTick in tick-table mode"""
+
+    def test_table_then_fallback(self, xtdata):
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        push(xtdata, {"600000.SH": tick(10.0)})
+        xtdata.get_full_tick.return_value = {"000001.SZ": tick(12.0)}
+
+        request = xtquant_pb2.GetFullTickRequest(stock_codes=["600000.SH", "000001.SZ"])
+        resp = servicer.GetFullTick(request, MagicMock())
+        # After the seed of SH, only the code outside the table is fetched
+        assert xtdata.get_full_tick.call_count == 2
+        xtdata.get_full_tick.assert_called_with(["000001.SZ"])
+        assert resp.ticks["600000.SH"].last_price == 10.0
+        assert resp.ticks["000001.SZ"].last_price == 12.0
+        assert resp.ticks["000001.SZ"].received_at > 0
+
+        values = servicer.GetServerMetrics(xtquant_pb2.Empty(), MagicMock()).values
+        assert values["tick_table.hits"] == 1
+        assert values["tick_table.misses"] == 1
+        assert values["tick_table.size"] == 1
+        servicer.close()
+        xtdata.unsubscribe_quote.assert_called_once_with(7)
+
+    def test_shares_upstream_with_streams(self, xtdata):
+        """The table and SubscribeWholeQuote streams use one upstream subscription"""
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        context = MagicMock()
+        context.is_active.return_value = True
+        stream = servicer.SubscribeWholeQuote(xtquant_pb2.SubscribeWholeQuoteRequest(code_list=["SH"]), context)
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(next, stream)
+            deadline = time.time() + 2
+            while servicer._whole_quote_hub.stats()["subscribers"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            push(xtdata, {"600000.SH": tick(10.0)})
+            assert pending.result(timeout=2).last_price == 10.0
+        xtdata.subscribe_whole_quote.assert_called_once()
+        found, _ = servicer._tick_table.lookup(["600000.SH"])
+        assert servicer._tick_table.snapshots(found)["600000.SH"].last_price == 10.0
+        stream.close()
+        xtdata.unsubscribe_quote.assert_not_called()
+        servicer.close()
+        xtdata.unsubscribe_quote.assert_called_once_with(7)
+
+    def test_columnar(self, xtdata):
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        push(xtdata, {"600000.SH": tick(10.0)})
+        xtdata.get_full_tick.return_value = {"000001.SZ": tick(12.0)}
+        resp = servicer.GetFullTick(xtquant_pb2.GetFullTickRequest(
+            stock_codes=["000001.SZ", "600000.SH"], encoding="columnar",
+        ), MagicMock())
+        assert len(resp.ticks) == 0
+        columns = resp.columns
+        assert list(columns.stock_code) == ["600000.SH", "000001.SZ"]
+        assert np.frombuffer(columns.last_price, "<f8").tolist() == [10.0, 12.0]
+        assert (np.frombuffer(columns.received_at, "<i8") > 0).all()
+
+    def test_all_from_table(self, xtdata):
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        push(xtdata, {"600000.SH": tick(10.0)})
+        resp = servicer.GetFullTick(xtquant_pb2.GetFullTickRequest(stock_codes=["600000.SH"]), MagicMock())
+        assert resp.ticks["600000.SH"].last_price == 10.0
+        xtdata.get_full_tick.assert_called_once_with(["SH"])
+
+
+class TestDeltaPolling:
+    """GetFullTick.since_version"""
+
+    def poll(self, servicer, codes, since=0):
+        return servicer.GetFullTick(xtquant_pb2.GetFullTickRequest(stock_codes=codes, since_version=since), MagicMock())
+
+    def test_polled_codes(self, xtdata):
+        """Without a tick table, changes are found by diffing consecutive polls"""
+        servicer = MarketDataServicer()
+        codes = ["600000.SH", "000001.SZ"]
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.0), "000001.SZ": tick(12.0)}
+        first = self.poll(servicer, codes)
+        assert sorted(first.ticks) == sorted(codes)
+        assert not first.unchanged
+
+        quiet = self.poll(servicer, codes, first.version)
+        assert quiet.unchanged
+        assert len(quiet.ticks) == 0
+        assert quiet.version == first.version
+
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.1), "000001.SZ": tick(12.0)}
+        delta = self.poll(servicer, codes, quiet.version)
+        assert list(delta.ticks) == ["600000.SH"]
+        assert delta.ticks["600000.SH"].last_price == 10.1
+        assert delta.version > quiet.version
+
+    def test_table_codes(self, xtdata):
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.0), "600001.SH": tick(5.0)}
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        first = self.poll(servicer, ["SH"])
+        assert len(first.ticks) == 2
+        assert self.poll(servicer, ["SH"], first.version).unchanged
+
+        push(xtdata, {"600001.SH": tick(5.1)})
+        delta = self.poll(servicer, ["SH"], first.version)
+        assert list(delta.ticks) == ["600001.SH"]
+        xtdata.get_full_tick.assert_called_once_with(["SH"])  # the seed only
+
+    def test_columnar_delta(self, xtdata):
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.0), "600001.SH": tick(5.0)}
+        servicer = MarketDataServicer(tick_table_markets=["SH"])
+        first = self.poll(servicer, ["SH"])
+        push(xtdata, {"600000.SH": tick(10.2)})
+        delta = servicer.GetFullTick(xtquant_pb2.GetFullTickRequest(
+            stock_codes=["SH"], since_version=first.version, encoding="columnar",
+        ), MagicMock())
+        assert list(delta.columns.stock_code) == ["600000.SH"]
+        assert np.frombuffer(delta.columns.last_price, "<f8").tolist() == [10.2]
+
+    def test_late_older_poll_ignored(self, xtdata):
+        """A concurrent poll that returns an older tick after a newer one does not win"""
+        table = TickTable([], _tick_to_snapshot)
+        newer = table.record({"600000.SH": tick(10.1, time_ms=2_000)}, 1)["600000.SH"]
+        kept = table.record({"600000.SH": tick(10.0, time_ms=1_000)}, 2)["600000.SH"]
+        assert kept is newer
+        assert table.version == newer.version
+
+    def test_unknown_version_is_full(self, xtdata):
+        """Tokens newer than the server's (e.g. from another server) are ignored"""
+        servicer = MarketDataServicer()
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.0)}
+        first = self.poll(servicer, ["600000.SH"])
+        resp = self.poll(servicer, ["600000.SH"], first.version + 1000)
+        assert list(resp.ticks) == ["600000.SH"]
+        assert not resp.unchanged
+
+    def test_token_from_earlier_table_is_full(self, xtdata):
+        xtdata.get_full_tick.return_value = {"600000.SH": tick(10.0)}
+        old = self.poll(MarketDataServicer(), ["600000.SH"])
+        resp = self.poll(MarketDataServicer(), ["600000.SH"], old.version)
+        assert list(resp.ticks) == ["600000.SH"]
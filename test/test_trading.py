@@ -632,3 +632,30 @@ class TestSubscribeTrading:
         assert len(received_b) >= 1
         assert received_b[0].order_update.order_id == 888
         print(f"\n  Event filtering: A got order 777, B got order 888")
+
+    def test_overflow_closes_stream(self, trading_grpc_server, monkeypatch):
+        """A client that stops reading gets a stream_overflow event instead of unbounded buffering."""
+        _, servicer = trading_grpc_server
+        monkeypatch.setattr(servicer, "_max_pending_events", 3)
+        context = MagicMock()
+        context.is_active.return_value = True
+        context.abort.side_effect = grpc.RpcError("aborted")
+        stream = servicer.SubscribeTrading(xtquant_pb2.AccountRequest(
+            account_id="SLOW_ACCOUNT", account_type="STOCK",
+        ), context)
+
+        # The generator registers its buffer on the first next(); deliver one event to it
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(next, stream)
+            time.sleep(0.3)
+            servicer._callback.on_stock_order(make_mock_order(account_id="SLOW_ACCOUNT", order_id=1))
+            assert first.result(timeout=5).order_update.order_id == 1
+
+        # Stream suspended (client not reading): more events than the cap arrive
+        for order_id in range(2, 7):
+            servicer._callback.on_stock_order(make_mock_order(account_id="SLOW_ACCOUNT", order_id=order_id))
+        assert next(stream).disconnected == "stream_overflow"
+        with pytest.raises(grpc.RpcError):
+            next(stream)
+        assert context.abort.call_args.args[0] == grpc.StatusCode.RESOURCE_EXHAUSTED
+        print(f"\n  Overflow: {context.abort.call_args.args[1]}")